@@ -7,6 +7,7 @@ para mantener un historial completo de modificaciones.
 
 from django.db import models
 from django.contrib.auth.models import User
+from django.contrib.postgres.indexes import BrinIndex, GinIndex
 from django.core.validators import RegexValidator
 from django.utils import timezone
 import logging
@@ -18,6 +19,10 @@ class AuditLog(models.Model):
     """
     Modelo que registra cambios y operaciones en el sistema.
     
+    En PostgreSQL la tabla está particionada por mes según ``timestamp``
+    (migración ``0010_auditlog_partitioning``); las particiones las
+    mantiene ``blog.services.audit_partitions``.
+    
     Attributes:
         timestamp (datetime): Marca de tiempo de la operación
         user (User): Usuario que realizó la operación (NULL si fue eliminado)
@@ -33,15 +38,20 @@ class AuditLog(models.Model):
         ('DELETE', 'Eliminación'),
     ]
     
+    # default en lugar de auto_now_add para que el modo write_behind
+    # conserve el momento del cambio al insertar los logs por lotes
     timestamp = models.DateTimeField(
-        auto_now_add=True,
+        default=timezone.now,
+        editable=False,
         help_text="Fecha y hora de la operación"
     )
+    # Sin índice propio: lo cubre blog_auditlog_user_ts_idx (user, -timestamp)
     user = models.ForeignKey(
         User, 
         on_delete=models.SET_NULL,
         null=True,
         blank=True,
+        db_index=False,
         help_text="Usuario que realizó la operación (NULL si el usuario fue eliminado)"
     )
     table_name = models.CharField(
@@ -75,9 +85,26 @@ class AuditLog(models.Model):
         verbose_name_plural = "Logs de Auditoría"
         ordering = ['-timestamp']
         indexes = [
-            models.Index(fields=['timestamp']),
-            models.Index(fields=['user']),
-            models.Index(fields=['table_name']),
+            # Rangos de fechas (resúmenes de 24 h / 7 días): la tabla solo
+            # recibe inserts en orden de timestamp, por lo que un BRIN ocupa
+            # unas pocas páginas frente al b-tree completo
+            BrinIndex(fields=['timestamp'], name='blog_auditlog_ts_brin'),
+            # Filtros tabla + tipo ordenados por fecha (listado, audit/logs/simple);
+            # también cubre el filtro y la agrupación solo por tabla
+            models.Index(
+                fields=['table_name', 'change_type', '-timestamp'],
+                name='blog_auditlog_tbl_type_ts_idx'
+            ),
+            # Logs de un usuario ordenados por fecha y la llave foránea
+            models.Index(fields=['user', '-timestamp'], name='blog_auditlog_user_ts_idx'),
+            # Paginación por keyset y orden por defecto sobre (timestamp, id)
+            models.Index(fields=['-timestamp', '-id'], name='blog_auditlog_ts_id_idx'),
+            # Filtro ``datos`` (contención @> sobre el JSON)
+            GinIndex(
+                fields=['modified_data'],
+                opclasses=['jsonb_path_ops'],
+                name='blog_auditlog_data_gin'
+            ),
         ]
 
     def __str__(self):
@@ -0,0 +1,69 @@
+"""
+Modelo de la bandeja de salida (outbox) de auditoría.
+
+En el modo de auditoría ``write_behind`` cada cambio se guarda aquí dentro
+de la misma transacción que lo produjo, y luego se mueve por lotes a
+``AuditLog`` (ver ``blog.services.audit_write_behind``). Si el proceso se
+detiene antes de mover los registros, siguen en esta tabla y los procesa
+la siguiente ejecución.
+"""
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+from django.utils import timezone
+
+
+class AuditOutbox(models.Model):
+    """
+    Cambio pendiente de registrar en ``AuditLog``.
+
+    La tabla solo tiene la llave primaria como índice y no tiene llaves
+    foráneas, para que escribir en ella sea lo más barato posible dentro
+    de la transacción del usuario.
+
+    Attributes:
+        created (datetime): Momento del cambio (será el timestamp del log)
+        user_id (int): Usuario responsable del cambio
+        table_name (str): Tabla afectada
+        change_type (str): Tipo de cambio (CREATE, UPDATE, DELETE)
+        affected_record_id (int): ID del registro afectado
+        modified_data (JSON): Datos del cambio
+    """
+
+    id = models.BigAutoField(primary_key=True)
+    created = models.DateTimeField(
+        default=timezone.now,
+        help_text="Momento en que se produjo el cambio"
+    )
+    user_id = models.IntegerField(
+        blank=True,
+        null=True,
+        help_text="ID del usuario que realizó la operación"
+    )
+    table_name = models.CharField(
+        max_length=255,
+        help_text="Nombre de la tabla de base de datos afectada"
+    )
+    change_type = models.CharField(
+        max_length=6,
+        help_text="Tipo de operación realizada"
+    )
+    affected_record_id = models.IntegerField(
+        blank=True,
+        null=True,
+        help_text="ID del registro afectado por la operación"
+    )
+    modified_data = models.JSONField(
+        blank=True,
+        null=True,
+        encoder=DjangoJSONEncoder,
+        help_text="Datos modificados en formato JSON"
+    )
+
+    class Meta:
+        verbose_name = "Cambio Pendiente de Auditoría"
+        verbose_name_plural = "Cambios Pendientes de Auditoría"
+
+    def __str__(self):
+        """Representación string del objeto."""
+        return f"{self.change_type} en {self.table_name} ({self.affected_record_id})"
@@ -0,0 +1,46 @@
+"""
+Modelo del resumen de ofertas de empleo por empresa.
+
+Tabla de agregados que evita un ``GROUP BY empresa`` sobre todas las
+ofertas en cada consulta de estadísticas. Se mantiene de forma
+incremental al crear, mover o eliminar ofertas y se recalcula
+periódicamente (ver ``blog.services.ofertas_estadisticas``).
+"""
+
+from django.db import models
+
+
+class EmpresaOfertasResumen(models.Model):
+    """
+    Número de ofertas publicadas por una empresa.
+
+    Attributes:
+        empresa (str): Nombre de la empresa (igual que en OfertasEmpleo)
+        total_ofertas (int): Ofertas de la empresa
+        actualizado (datetime): Última modificación de la fila
+    """
+
+    empresa = models.CharField(
+        max_length=230,
+        unique=True,
+        help_text="Nombre de la empresa"
+    )
+    total_ofertas = models.PositiveIntegerField(
+        default=0,
+        help_text="Número de ofertas de la empresa"
+    )
+    actualizado = models.DateTimeField(
+        auto_now=True,
+        help_text="Fecha y hora de la última actualización"
+    )
+
+    class Meta:
+        verbose_name = "Resumen de Ofertas por Empresa"
+        verbose_name_plural = "Resúmenes de Ofertas por Empresa"
+        indexes = [
+            models.Index(fields=['-total_ofertas', 'empresa'], name='blog_empresa_total_idx'),
+        ]
+
+    def __str__(self):
+        """Representación string del objeto."""
+        return f"{self.empresa}: {self.total_ofertas} ofertas"
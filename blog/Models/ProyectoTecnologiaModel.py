@@ -0,0 +1,50 @@
+"""
+Modelo del índice de tecnologías de los proyectos.
+
+Cada fila indica que la descripción de un proyecto menciona una
+tecnología conocida (ver ``blog.services.tecnologias``). El índice se
+mantiene al guardar el proyecto y permite agregar o filtrar por
+tecnología sin analizar las descripciones en cada solicitud.
+"""
+
+from django.db import models
+from blog.Models.ProyectosModel import Proyectos
+
+
+class ProyectoTecnologia(models.Model):
+    """
+    Etiqueta de tecnología extraída de la descripción de un proyecto.
+
+    Attributes:
+        proyecto (Proyectos): Proyecto que menciona la tecnología
+        tecnologia (str): Nombre normalizado (minúsculas) de la tecnología
+    """
+
+    proyecto = models.ForeignKey(
+        Proyectos,
+        on_delete=models.CASCADE,
+        related_name='tecnologias',
+        help_text="Proyecto que menciona la tecnología"
+    )
+    tecnologia = models.CharField(
+        max_length=40,
+        help_text="Tecnología mencionada en la descripción (en minúsculas)"
+    )
+
+    class Meta:
+        verbose_name = "Tecnología de Proyecto"
+        verbose_name_plural = "Tecnologías de Proyectos"
+        constraints = [
+            models.UniqueConstraint(
+                fields=['proyecto', 'tecnologia'],
+                name='blog_proyectotecnologia_unica'
+            ),
+        ]
+        indexes = [
+            # Cubre el GROUP BY por tecnología y el filtro ?tecnologia=
+            models.Index(fields=['tecnologia', 'proyecto'], name='blog_proytec_tec_proy_idx'),
+        ]
+
+    def __str__(self):
+        """Representación string del objeto."""
+        return f"{self.tecnologia} en proyecto {self.proyecto_id}"
@@ -83,7 +83,14 @@ class Proyectos(models.Model):
     
     @property
     def total_integrantes(self):
-        """Retorna el número total de integrantes en el proyecto."""
+        """
+        Retorna el número total de integrantes en el proyecto.
+        
+        Usa la anotación ``num_integrantes`` si el queryset la incluye
+        (ver ``ProyectosViewSet.get_queryset``) para evitar una query por fila.
+        """
+        if hasattr(self, 'num_integrantes'):
+            return self.num_integrantes
         return self.integrantes.count()
     
     @property
@@ -92,5 +99,12 @@ class Proyectos(models.Model):
         return (timezone.now() - self.fecha_proyecto).days <= 30
     
     def get_integrantes_activos(self):
-        """Retorna solo los integrantes activos del proyecto."""
+        """
+        Retorna solo los integrantes activos del proyecto.
+        
+        Si el queryset precargó ``integrantes_activos`` con un ``Prefetch``
+        se reutiliza esa lista en lugar de consultar la base de datos.
+        """
+        if hasattr(self, 'integrantes_activos'):
+            return self.integrantes_activos
         return self.integrantes.filter(estado=True)
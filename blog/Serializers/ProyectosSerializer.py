@@ -46,19 +46,20 @@ class ProyectosSerializer(serializers.ModelSerializer):
         ]
         
     def get_integrantes_info(self, obj):
-        """Obtener información básica de los integrantes del proyecto."""
-        try:
-            integrantes = obj.get_integrantes_activos()
-            return [
-                {
-                    'id': integrante.idintegrantes,
-                    'nombre_completo': f"{integrante.nombres} {integrante.apellidos}",
-                    'correo': integrante.correo
-                }
-                for integrante in integrantes
-            ]
-        except:
-            return []
+        """
+        Obtener información básica de los integrantes activos del proyecto.
+        
+        Consume el ``Prefetch`` de integrantes activos del ViewSet cuando
+        está disponible, por lo que no ejecuta queries por fila.
+        """
+        return [
+            {
+                'id': integrante.idintegrantes,
+                'nombre_completo': integrante.nombre_integrante,
+                'correo': integrante.correo
+            }
+            for integrante in obj.get_integrantes_activos()
+        ]
         
     def validate_nombre_proyecto(self, value):
         """Validar que el nombre del proyecto no esté vacío."""
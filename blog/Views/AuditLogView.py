@@ -8,21 +8,33 @@ con capacidades avanzadas de filtrado para monitoreo y análisis.
 from rest_framework import viewsets, status, permissions
 from rest_framework.decorators import action
 from rest_framework.response import Response
-from rest_framework.throttling import UserRateThrottle, AnonRateThrottle
+from blog.throttling import UserRateThrottle, AnonRateThrottle
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import SearchFilter, OrderingFilter
+from django.conf import settings
+from django.core.cache import caches
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Count, Max, Min, Q
+from django.http import StreamingHttpResponse
 from django.utils import timezone
+from collections import Counter
 from datetime import timedelta
+import csv
+import json
 import logging
 
 from blog.Models.AuditLogModel import AuditLog
 from blog.Serializers.AuditLogSerializer import AuditLogSerializer
-from blog.pagination import LargeResultsSetPagination
+from blog.filters import AuditLogFilter
+from blog.pagination import LargeResultsSetPagination, estimate_table_rows
+from blog.services import audit_partitions
+from blog.services.permissions_service import check_model_permission
+from blog.Views.BaseModelViewSet import ConditionalGetMixin, KeysetPaginationMixin
 
 logger = logging.getLogger(__name__)
 
 
-class AuditLogViewSet(viewsets.ReadOnlyModelViewSet):
+class AuditLogViewSet(ConditionalGetMixin, KeysetPaginationMixin, viewsets.ReadOnlyModelViewSet):
     """
     ViewSet para consultar logs de auditoría (solo lectura).
     
@@ -34,71 +46,155 @@ class AuditLogViewSet(viewsets.ReadOnlyModelViewSet):
     Solo usuarios staff pueden acceder a los logs de auditoría.
     
     **Filtros disponibles:**
-    - `accion`: Tipo de acción realizada
+    - `tabla`: Tabla afectada (por ejemplo blog_noticias)
+    - `tipo`: Tipo de cambio (CREATE, UPDATE, DELETE)
     - `usuario`: Usuario que realizó la acción
     - `fecha_desde`: Logs desde una fecha específica
     - `fecha_hasta`: Logs hasta una fecha específica
+    - `datos`: Logs cuyos datos contienen un JSON (por ejemplo `{"new_empresa": "ACME"}`)
     
     **Búsqueda:**
-    Usar el parámetro `search` para buscar en detalles y acciones.
+    Usar el parámetro `search` para buscar en tabla, tipo de cambio y usuario.
     
     **Ordenamiento:**
-    Usar `ordering` con campos: timestamp, accion, usuario
+    Usar `ordering` con campos: timestamp, table_name, change_type, user__username
+    
+    **Paginación por cursor:**
+    Usar `paginacion=cursor` para recorrer los logs por `(timestamp, id)`
+    sin `OFFSET` ni `COUNT(*)`; agregar `total=aprox` para un total estimado.
+    
+    **Exportación:**
+    `GET /api/auditlog/export/?formato=ndjson|csv` transmite todos los logs
+    que cumplen los filtros, sin paginación.
     """
     
     serializer_class = AuditLogSerializer
     queryset = AuditLog.objects.all()
     permission_classes = [permissions.DjangoModelPermissions]  # Permisos específicos del modelo
     filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
-    search_fields = ['accion', 'detalles', 'usuario__username']
-    ordering_fields = ['timestamp', 'accion', 'usuario__username']
+    filterset_class = AuditLogFilter
+    search_fields = ['table_name', 'change_type', 'user__username']
+    ordering_fields = ['timestamp', 'table_name', 'change_type', 'user__username']
     ordering = ['-timestamp']  # Ordenamiento por defecto
     throttle_classes = [UserRateThrottle, AnonRateThrottle]
     pagination_class = LargeResultsSetPagination
+    keyset_ordering = ('-timestamp', '-id')
+    # La versión se lee de la propia tabla (get_collection_version) y los
+    # logs no tienen campos que dependan del reloj
+    version_time_bucket = 0
+    
+    # Clave del resumen de actividad en la caché default
+    resumen_cache_key = 'blog:auditlog:resumen_actividad'
+    
+    # Filas leídas por cada viaje al cursor del servidor durante la exportación
+    export_chunk_size = 2000
+    export_fields = [
+        'id',
+        'timestamp',
+        'user_id',
+        'user__username',
+        'table_name',
+        'change_type',
+        'affected_record_id',
+        'modified_data',
+    ]
+    
+    def get_collection_version(self):
+        """
+        Versión de la colección de logs.
+        
+        Los logs los escriben triggers de la base de datos (sin señales de
+        Django) y nunca se modifican, así que basta con los extremos del id
+        (nuevos registros y depuración de antiguos) y el último timestamp;
+        las tres agregaciones se resuelven con los índices.
+        """
+        extremos = AuditLog.objects.aggregate(
+            primero=Min('id'), ultimo=Max('id'), fecha=Max('timestamp')
+        )
+        version = f"{extremos['primero']}-{extremos['ultimo']}"
+        fecha = extremos['fecha']
+        return version, fecha.timestamp() if fecha else None
+    
+    def get_object_version(self):
+        """Un log nunca cambia: su versión es su propio id."""
+        return str(self.kwargs[self.lookup_url_kwarg or self.lookup_field]), None
     
     @action(detail=False, methods=['get'])
     def resumen_actividad(self, request):
         """
         Endpoint para obtener un resumen de actividad del sistema.
         
+        Una sola consulta agrupa los logs de los últimos 7 días por tipo de
+        cambio y usuario, con un ``Count`` filtrado para las últimas 24
+        horas; de ese resultado se derivan los tres desgloses. El total de
+        logs es la estimación del planificador (o un ``COUNT(*)`` si no hay
+        estadísticas) y el resumen se guarda en caché durante
+        ``AUDIT_SUMMARY_CACHE_TIMEOUT`` segundos, ya que los paneles
+        consultan este endpoint de forma periódica.
+        
         Returns:
             Response: Estadísticas de actividad por periodo
         """
-        from django.db.models import Count
-        
-        # Actividad de las últimas 24 horas
-        hace_24h = timezone.now() - timedelta(hours=24)
-        actividad_24h = (self.get_queryset()
-                        .filter(timestamp__gte=hace_24h)
-                        .values('accion')
-                        .annotate(total=Count('id'))
-                        .order_by('-total'))
-        
-        # Actividad de la última semana
-        hace_7d = timezone.now() - timedelta(days=7)
-        actividad_7d = (self.get_queryset()
-                       .filter(timestamp__gte=hace_7d)
-                       .values('accion')
-                       .annotate(total=Count('id'))
-                       .order_by('-total'))
-        
-        # Usuarios más activos
-        usuarios_activos = (self.get_queryset()
-                           .filter(timestamp__gte=hace_7d)
-                           .values('usuario__username')
-                           .annotate(total=Count('id'))
-                           .order_by('-total')[:10])
-        
-        data = {
-            'actividad_24_horas': list(actividad_24h),
-            'actividad_7_dias': list(actividad_7d),
-            'usuarios_mas_activos': list(usuarios_activos),
-            'total_logs': self.get_queryset().count()
-        }
+        cache = caches['default']
+        data = cache.get(self.resumen_cache_key)
+        if data is None:
+            data = self._build_resumen_actividad()
+            cache.set(
+                self.resumen_cache_key,
+                data,
+                getattr(settings, 'AUDIT_SUMMARY_CACHE_TIMEOUT', 30)
+            )
         
         logger.info(f"Resumen de actividad solicitado por {request.user}")
         return Response(data, status=status.HTTP_200_OK)
     
+    def _build_resumen_actividad(self):
+        """Calcula el resumen de actividad (ver ``resumen_actividad``)."""
+        ahora = timezone.now()
+        hace_24h = ahora - timedelta(hours=24)
+        hace_7d = ahora - timedelta(days=7)
+        
+        filas = (AuditLog.objects
+                 .filter(timestamp__gte=hace_7d)
+                 .order_by()
+                 .values('change_type', 'user__username')
+                 .annotate(
+                     total_7d=Count('id'),
+                     total_24h=Count('id', filter=Q(timestamp__gte=hace_24h))
+                 ))
+        
+        actividad_24h = Counter()
+        actividad_7d = Counter()
+        usuarios = Counter()
+        for fila in filas:
+            actividad_7d[fila['change_type']] += fila['total_7d']
+            if fila['total_24h']:
+                actividad_24h[fila['change_type']] += fila['total_24h']
+            usuarios[fila['user__username']] += fila['total_7d']
+        
+        total = estimate_table_rows(AuditLog)
+        total_estimado = total is not None
+        if not total_estimado:
+            total = AuditLog.objects.count()
+        
+        return {
+            'actividad_24_horas': [
+                {'change_type': tipo, 'total': cantidad}
+                for tipo, cantidad in actividad_24h.most_common()
+            ],
+            'actividad_7_dias': [
+                {'change_type': tipo, 'total': cantidad}
+                for tipo, cantidad in actividad_7d.most_common()
+            ],
+            'usuarios_mas_activos': [
+                {'user__username': username, 'total': cantidad}
+                for username, cantidad in usuarios.most_common(10)
+            ],
+            'total_logs': total,
+            'total_logs_estimado': total_estimado,
+            'generado': ahora.isoformat()
+        }
+    
     @action(detail=False, methods=['get'])
     def errores_recientes(self, request):
         """
@@ -138,16 +234,103 @@ class AuditLogViewSet(viewsets.ReadOnlyModelViewSet):
                 status=status.HTTP_403_FORBIDDEN
             )
         
-        dias = request.data.get('dias', 90)  # Por defecto 90 días
+        try:
+            dias = int(request.data.get('dias', 90))  # Por defecto 90 días
+            if dias < 1:
+                raise ValueError
+        except (TypeError, ValueError):
+            return Response(
+                {'error': 'El parámetro dias debe ser un entero positivo'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
         fecha_limite = timezone.now() - timedelta(days=dias)
         
-        logs_antiguos = self.get_queryset().filter(timestamp__lt=fecha_limite)
-        count = logs_antiguos.count()
-        logs_antiguos.delete()
+        # Los meses completos se eliminan como particiones (sin DELETE);
+        # el resto es un único DELETE sobre la partición del límite
+        particiones = []
+        if audit_partitions.is_partitioned():
+            particiones = audit_partitions.drop_partitions_before(fecha_limite)
+        count, _ = self.get_queryset().filter(timestamp__lt=fecha_limite).delete()
         
-        logger.info(f"Superusuario {request.user} eliminó {count} logs antiguos")
+        logger.info(
+            f"Superusuario {request.user} eliminó {count} logs antiguos "
+            f"y {len(particiones)} particiones"
+        )
         return Response(
-            {'mensaje': f'Se eliminaron {count} logs antiguos'},
+            {
+                'mensaje': f'Se eliminaron {count} logs antiguos',
+                'particiones_eliminadas': particiones
+            },
             status=status.HTTP_200_OK
         )
-    
\ No newline at end of file
+    
+    @action(detail=False, methods=['get'])
+    def export(self, request):
+        """
+        Endpoint para exportar logs de auditoría en streaming.
+        
+        Acepta los mismos filtros, búsqueda y ordenamiento que el listado.
+        Las filas se leen con un cursor del servidor (``iterator``) y se
+        escriben a medida que llegan, por lo que la memoria se mantiene
+        constante sin importar cuántos logs se exporten.
+        
+        Query params:
+            - formato: ``ndjson`` (por defecto) o ``csv``
+        
+        Returns:
+            StreamingHttpResponse: Archivo NDJSON o CSV con los logs
+        """
+        if not check_model_permission(request.user, 'auditlog', 'view'):
+            return Response(
+                {'error': 'No tienes permiso para exportar logs de auditoría'},
+                status=status.HTTP_403_FORBIDDEN
+            )
+        
+        formato = request.query_params.get('formato', 'ndjson').lower()
+        if formato not in ('ndjson', 'csv'):
+            return Response(
+                {'error': 'Formato no soportado. Use ndjson o csv'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        rows = (self.filter_queryset(self.get_queryset())
+                .values_list(*self.export_fields)
+                .iterator(chunk_size=self.export_chunk_size))
+        
+        if formato == 'csv':
+            content = self._stream_csv(rows)
+            content_type = 'text/csv; charset=utf-8'
+        else:
+            content = self._stream_ndjson(rows)
+            content_type = 'application/x-ndjson'
+        
+        filename = f"auditlog_{timezone.now():%Y%m%d_%H%M%S}.{formato}"
+        response = StreamingHttpResponse(content, content_type=content_type)
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        
+        logger.info(f"Exportación de auditoría ({formato}) solicitada por {request.user}")
+        return response
+    
+    def _stream_ndjson(self, rows):
+        """Genera una línea JSON por cada log."""
+        encoder = DjangoJSONEncoder()
+        for row in rows:
+            yield encoder.encode(dict(zip(self.export_fields, row))) + '\n'
+    
+    def _stream_csv(self, rows):
+        """Genera el CSV línea por línea, con encabezado."""
+        writer = csv.writer(_EchoBuffer())
+        data_index = self.export_fields.index('modified_data')
+        yield writer.writerow(self.export_fields)
+        for row in rows:
+            row = list(row)
+            if row[data_index] is not None:
+                row[data_index] = json.dumps(row[data_index], cls=DjangoJSONEncoder)
+            yield writer.writerow(row)
+
+
+class _EchoBuffer:
+    """Pseudo-archivo que retorna lo escrito en lugar de almacenarlo."""
+    
+    def write(self, value):
+        return value
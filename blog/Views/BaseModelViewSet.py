@@ -3,27 +3,487 @@ ViewSet base con funcionalidad común para todos los modelos.
 
 Este módulo proporciona un ViewSet base que incluye:
 - Verificación de permisos
+- Optimización automática de querysets según el serializer
+- Caché opcional de respuestas de lectura
+- Solicitudes condicionales (ETag / Last-Modified)
+- Escrituras en una transacción
 - Logging de acciones
 - Manejo de errores común
 """
 
-from rest_framework import viewsets, status
+from rest_framework import viewsets, status, serializers
 from rest_framework.response import Response
-from rest_framework.permissions import IsAuthenticated
-from rest_framework.throttling import UserRateThrottle, AnonRateThrottle
+from rest_framework.permissions import IsAuthenticated, SAFE_METHODS
+from rest_framework.relations import ManyRelatedField
+from blog.throttling import UserRateThrottle, AnonRateThrottle
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import SearchFilter, OrderingFilter
+from django.core.exceptions import FieldDoesNotExist
+from django.db import transaction
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from django.utils.http import http_date, parse_etags, parse_http_date_safe, quote_etag
+from blog.pagination import KeysetPagination
 from blog.services.permissions_service import check_model_permission
-import logging  
+from blog.services import response_cache
+import hashlib
+import logging
+import time
 
 logger = logging.getLogger(__name__)
 
-class BaseModelViewSet(viewsets.ModelViewSet):
+
+class QueryPlan:
+    """
+    Plan de optimización derivado de un serializer.
+    
+    Attributes:
+        select_related (list): Relaciones FK/OneToOne a unir con JOIN
+        prefetch_related (list): Relaciones múltiples a precargar
+        only (list | None): Campos a cargar, o None si el serializer usa
+            propiedades o métodos que podrían leer cualquier campo
+    """
+    
+    def __init__(self):
+        self.select_related = []
+        self.prefetch_related = []
+        self.only = []
+    
+    def add(self, collection, path):
+        """Agrega una ruta a la colección indicada sin duplicados."""
+        if path not in collection:
+            collection.append(path)
+
+
+def build_query_plan(serializer_class):
+    """
+    Analiza los campos de un ModelSerializer y construye su plan de consultas.
+    
+    Recorre las rutas ``source`` de cada campo legible:
+    - ``creador.username`` genera ``select_related('creador')`` y
+      ``only('creador__username')``
+    - Campos relacionados múltiples (``many=True``) o relaciones inversas
+      generan ``prefetch_related``
+    - Un serializer anidado sobre una FK genera ``select_related``
+    - Fuentes que no son campos del modelo (propiedades, métodos,
+      ``SerializerMethodField``) desactivan ``only()``
+    
+    Args:
+        serializer_class: Clase del ModelSerializer
+        
+    Returns:
+        QueryPlan: Plan de optimización
+    """
+    plan = QueryPlan()
+    model = serializer_class.Meta.model
+    
+    for field in serializer_class().fields.values():
+        if field.write_only:
+            continue
+        if field.source == '*':
+            plan.only = None
+            continue
+        
+        many = isinstance(field, (ManyRelatedField, serializers.ListSerializer))
+        nested = isinstance(field, serializers.BaseSerializer)
+        current = model
+        path = []
+        
+        for index, attr in enumerate(field.source_attrs):
+            try:
+                model_field = current._meta.get_field(attr)
+            except FieldDoesNotExist:
+                plan.only = None
+                break
+            
+            path.append(attr)
+            lookup = '__'.join(path)
+            is_last = index == len(field.source_attrs) - 1
+            
+            if model_field.many_to_many or model_field.one_to_many or many and is_last:
+                plan.add(plan.prefetch_related, lookup)
+                break
+            
+            if model_field.is_relation and (not is_last or nested):
+                plan.add(plan.select_related, lookup)
+                if nested:
+                    # El serializer anidado puede leer cualquier campo
+                    plan.only = None
+                    break
+                current = model_field.related_model
+                continue
+            
+            if plan.only is not None:
+                plan.add(plan.only, lookup)
+    
+    return plan
+
+
+class QuerysetOptimizerMixin:
+    """
+    Mixin que optimiza ``get_queryset`` a partir del serializer del ViewSet.
+    
+    Aplica ``select_related``, ``prefetch_related`` y, en solicitudes de
+    lectura, ``only()`` según las rutas ``source`` del serializer, de modo
+    que campos como ``creador_username`` no generen una query por fila.
+    
+    Los ViewSets pueden desactivarlo con ``optimize_queryset = False``.
+    """
+    
+    optimize_queryset = True
+    
+    # Planes calculados por clase de serializer
+    _query_plans = {}
+    
+    def get_query_plan(self):
+        """Obtiene (y memoriza) el plan de consultas del serializer actual."""
+        serializer_class = self.get_serializer_class()
+        plan = self._query_plans.get(serializer_class)
+        if plan is None:
+            plan = build_query_plan(serializer_class)
+            self._query_plans[serializer_class] = plan
+        return plan
+    
+    def get_queryset(self):
+        """Retorna el queryset con las optimizaciones del plan aplicadas."""
+        queryset = super().get_queryset()
+        if not self.optimize_queryset:
+            return queryset
+        
+        plan = self.get_query_plan()
+        if plan.select_related:
+            queryset = queryset.select_related(*plan.select_related)
+        if plan.prefetch_related:
+            queryset = queryset.prefetch_related(*plan.prefetch_related)
+        request = getattr(self, 'request', None)
+        if plan.only and request is not None and request.method in SAFE_METHODS:
+            queryset = queryset.only(*plan.only)
+        return queryset
+
+
+class KeysetPaginationMixin:
+    """
+    Mixin que permite elegir paginación por keyset (cursor) por solicitud.
+    
+    En las acciones listadas en ``keyset_pagination_actions`` el cliente
+    puede pedir ``?paginacion=cursor`` (o enviar directamente ``?cursor=``)
+    para usar ``KeysetPagination`` con el orden ``keyset_ordering`` en lugar
+    de la paginación por número de página configurada en el ViewSet.
+    """
+    
+    keyset_pagination_class = KeysetPagination
+    keyset_pagination_actions = ('list',)
+    keyset_ordering = None
+    
+    def wants_keyset_pagination(self):
+        """Indica si la solicitud actual pidió paginación por cursor."""
+        params = self.request.query_params
+        return (
+            self.action in self.keyset_pagination_actions
+            and (params.get('paginacion') == 'cursor' or 'cursor' in params)
+        )
+    
+    @property
+    def paginator(self):
+        """Paginador de la solicitud: keyset si se pidió, el por defecto si no."""
+        if not hasattr(self, '_paginator'):
+            request = getattr(self, 'request', None)
+            if request is not None and self.wants_keyset_pagination():
+                self._paginator = self.keyset_pagination_class(ordering=self.keyset_ordering)
+            else:
+                return super().paginator
+        return self._paginator
+
+
+class ConditionalGetMixin:
+    """
+    Mixin que responde ``304 Not Modified`` a solicitudes condicionales.
+    
+    Para las acciones de ``conditional_actions`` calcula, antes de consultar
+    la base de datos o serializar, una versión barata del recurso:
+    
+    - Listas: la versión de la tabla (y de ``cache_dependencies``), que las
+      señales ``post_save``/``post_delete`` actualizan con cada escritura
+    - Detalle: la versión del objeto más la de las dependencias
+    
+    Con ella se generan ``ETag`` y ``Last-Modified``. Si el cliente envía un
+    ``If-None-Match`` que coincide (o, sin él, un ``If-Modified-Since``
+    igual o posterior) se responde 304 sin ejecutar la acción.
+    
+    La versión incluye además un intervalo de tiempo de
+    ``version_time_bucket`` segundos (por defecto
+    ``RESPONSE_CACHE_TIMEOUT``), y ``Last-Modified`` nunca es anterior al
+    inicio del intervalo actual. Así las respuestas con campos que cambian
+    con el reloj (``is_expired``, ``is_recent``...) y las escrituras que no
+    emiten señales (``QuerySet.update``, SQL directo) se recalculan como
+    máximo un intervalo después. Con ``version_time_bucket = 0`` la
+    versión depende solo de las señales.
+    
+    Los ViewSets cuyos datos no se escriben desde Django (por ejemplo los
+    generados por triggers) pueden sobrescribir ``get_collection_version`` y
+    ``get_object_version``.
+    """
+    
+    conditional_actions = ('list', 'retrieve')
+    version_time_bucket = None
+    
+    def get_version_time_bucket(self):
+        """Duración (segundos) del intervalo de tiempo de la versión."""
+        if self.version_time_bucket is not None:
+            return self.version_time_bucket
+        return response_cache.get_default_timeout()
+    
+    def get_version_dependencies(self):
+        """Etiquetas de los modelos (además del propio) de los que depende la respuesta."""
+        own = response_cache.model_label(self.get_queryset().model)
+        labels = {response_cache.model_label(model) for model in getattr(self, 'cache_dependencies', ())}
+        labels.discard(own)
+        return own, sorted(labels)
+    
+    def get_collection_version(self):
+        """
+        Versión de la colección del ViewSet.
+        
+        Returns:
+            tuple (version, last_modified): ``version`` es un str y
+            ``last_modified`` un timestamp en segundos o None
+        """
+        own, dependencies = self.get_version_dependencies()
+        versions = response_cache.get_model_versions([own, *dependencies])
+        return ':'.join(map(str, versions)), max(versions) / 1e6
+    
+    def get_object_version(self):
+        """
+        Versión del objeto solicitado en una acción de detalle.
+        
+        Returns:
+            tuple (version, last_modified) como ``get_collection_version``
+        """
+        own, dependencies = self.get_version_dependencies()
+        lookup = self.kwargs[self.lookup_url_kwarg or self.lookup_field]
+        versions = response_cache.get_model_versions(
+            [response_cache.object_scope(own, lookup), *dependencies]
+        )
+        return ':'.join(map(str, versions)), max(versions) / 1e6
+    
+    def get_conditional_state(self, request):
+        """
+        Calcula el ETag y el Last-Modified de la solicitud actual.
+        
+        El ETag incluye path, query string normalizada, formato de respuesta
+        y rasgos de permisos del usuario, de modo que dos usuarios solo
+        comparten ETag si verían la misma respuesta.
+        
+        Returns:
+            tuple (etag, last_modified)
+        """
+        if self.detail:
+            version, last_modified = self.get_object_version()
+        else:
+            version, last_modified = self.get_collection_version()
+        
+        bucket_size = self.get_version_time_bucket()
+        if bucket_size:
+            bucket = int(time.time() // bucket_size)
+            version = f'{version}:t{bucket}'
+            bucket_start = bucket * bucket_size
+            last_modified = bucket_start if last_modified is None else max(last_modified, bucket_start)
+        
+        raw = '|'.join([
+            request.path,
+            response_cache.normalize_query(request.query_params),
+            request.accepted_media_type or '',
+            response_cache.user_traits(getattr(request, 'user', None)),
+            version,
+        ])
+        etag = hashlib.md5(raw.encode('utf-8'), usedforsecurity=False).hexdigest()
+        return quote_etag(etag), last_modified
+    
+    def is_not_modified(self, request, etag, last_modified):
+        """Evalúa ``If-None-Match`` / ``If-Modified-Since`` (RFC 9110)."""
+        if_none_match = request.META.get('HTTP_IF_NONE_MATCH')
+        if if_none_match:
+            return etag in parse_etags(if_none_match) or if_none_match.strip() == '*'
+        
+        if_modified_since = parse_http_date_safe(request.META.get('HTTP_IF_MODIFIED_SINCE', ''))
+        if if_modified_since is None or last_modified is None:
+            return False
+        return int(last_modified) <= if_modified_since
+    
+    def initial(self, request, *args, **kwargs):
+        """
+        Tras las verificaciones de DRF envuelve el handler con la validación
+        condicional.
+        
+        En las acciones de detalle el objeto se obtiene antes con
+        ``get_object()``: un 304 solo se responde si el objeto existe y el
+        usuario pasa ``check_object_permissions`` (si no, 404 o 403).
+        """
+        super().initial(request, *args, **kwargs)
+        
+        self.conditional_etag = None
+        if request.method in ('GET', 'HEAD') and self.action in self.conditional_actions:
+            if self.detail:
+                self.get_object()
+            self.conditional_etag, last_modified = self.get_conditional_state(request)
+            method = request.method.lower()
+            handler = getattr(self, method)
+            setattr(self, method, self._wrap_conditional(handler, last_modified))
+    
+    def _wrap_conditional(self, handler, last_modified):
+        """Responde 304 si el cliente tiene la versión vigente; si no, ejecuta la acción."""
+        etag = self.conditional_etag
+        
+        def conditional_handler(request, *args, **kwargs):
+            if self.is_not_modified(request, etag, last_modified):
+                response = Response(status=status.HTTP_304_NOT_MODIFIED)
+            else:
+                response = handler(request, *args, **kwargs)
+                if response.status_code != status.HTTP_200_OK:
+                    return response
+            
+            response['ETag'] = etag
+            if last_modified is not None:
+                response['Last-Modified'] = http_date(last_modified)
+            if self.action in getattr(self, 'cache_response_actions', ()):
+                # Misma política que las respuestas de ResponseCacheMixin
+                patch_cache_control(response, **self.get_cache_control(request))
+            else:
+                # Guardar la copia pero revalidarla siempre
+                patch_cache_control(response, private=True, no_cache=True)
+            patch_vary_headers(response, ('Accept', 'Authorization', 'Cookie'))
+            return response
+        
+        return conditional_handler
+
+
+class ResponseCacheMixin:
+    """
+    Mixin que guarda en caché las respuestas de acciones de lectura.
+    
+    Es opcional por ViewSet: solo se cachean las acciones listadas en
+    ``cache_response_actions``. La clave combina path, query string
+    normalizada, rasgos de permisos del usuario y la versión de los
+    modelos de ``cache_dependencies`` (por defecto el modelo del
+    queryset), que se invalida con ``post_save``/``post_delete``.
+    
+    La caché se consulta después de autenticación, permisos y throttling.
+    Las respuestas cacheables incluyen ``ETag`` y ``Cache-Control``
+    (``public`` para anónimos, ``private`` para usuarios autenticados, y
+    siempre ``no-cache``) y responden ``304`` a ``If-None-Match``.
+    """
+    
+    cache_response_actions = ()
+    cache_response_timeout = None
+    cache_dependencies = ()
+    
+    def get_cache_dependencies(self):
+        """Etiquetas de los modelos de los que depende la respuesta."""
+        models = [self.get_queryset().model, *self.cache_dependencies]
+        return sorted({response_cache.model_label(model) for model in models})
+    
+    def get_cache_response_timeout(self):
+        """TTL (segundos) de las respuestas de este ViewSet."""
+        if self.cache_response_timeout is not None:
+            return self.cache_response_timeout
+        return response_cache.get_default_timeout()
+    
+    def get_cache_control(self, request):
+        """
+        Directivas ``Cache-Control``: públicas solo para anónimos.
+        
+        Se usa ``no-cache`` en lugar de ``max-age``: el navegador guarda la
+        respuesta pero la revalida con su ETag en cada uso, de modo que ve
+        sus propios cambios de inmediato. El ahorro lo dan la caché del
+        servidor y las respuestas 304.
+        """
+        if request.user and request.user.is_authenticated:
+            return {'private': True, 'no_cache': True}
+        return {'public': True, 'no_cache': True}
+    
+    def should_cache_response(self, request):
+        """Indica si la solicitud actual es cacheable."""
+        return request.method in ('GET', 'HEAD') and self.action in self.cache_response_actions
+    
+    def initial(self, request, *args, **kwargs):
+        """Tras las verificaciones de DRF envuelve el handler con la caché."""
+        super().initial(request, *args, **kwargs)
+        
+        if self.should_cache_response(request):
+            method = request.method.lower()
+            handler = getattr(self, method)
+            setattr(self, method, self._wrap_with_cache(handler))
+    
+    def _wrap_with_cache(self, handler):
+        """Sirve la respuesta desde la caché o la genera y la guarda."""
+        
+        def cached_handler(request, *args, **kwargs):
+            key = response_cache.build_cache_key(request, self.get_cache_dependencies())
+            cached = response_cache.get_cached(key)
+            
+            if cached is not None:
+                data, etag = cached
+                response = Response(data)
+                response['X-Cache'] = 'HIT'
+            else:
+                response = handler(request, *args, **kwargs)
+                if response.status_code != status.HTTP_200_OK:
+                    return response
+                etag = response_cache.compute_etag(response.data)
+                response_cache.set_cached(
+                    key, response.data, etag, self.get_cache_response_timeout()
+                )
+                response['X-Cache'] = 'MISS'
+            
+            # Con ConditionalGetMixin el ETag es la versión del recurso
+            etag = getattr(self, 'conditional_etag', None) or quote_etag(etag)
+            return self._apply_cache_headers(request, response, etag)
+        
+        return cached_handler
+    
+    def _apply_cache_headers(self, request, response, etag):
+        """Agrega ETag, Cache-Control y Vary; responde 304 si el ETag coincide."""
+        if etag in parse_etags(request.META.get('HTTP_IF_NONE_MATCH', '')):
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        
+        response['ETag'] = etag
+        patch_cache_control(response, **self.get_cache_control(request))
+        patch_vary_headers(response, ('Accept', 'Authorization', 'Cookie'))
+        return response
+
+
+class AtomicWriteMixin:
+    """
+    Mixin que ejecuta las acciones de escritura (``create``, ``update``,
+    ``partial_update`` y ``destroy``) dentro de ``transaction.atomic()``.
+    
+    Así los cambios del modelo y lo que escriben sus señales (por ejemplo
+    el outbox de auditoría en ``AUDIT_MODE = 'write_behind'``) se
+    confirman o se revierten juntos.
+    """
+    
+    def create(self, request, *args, **kwargs):
+        with transaction.atomic():
+            return super().create(request, *args, **kwargs)
+    
+    def update(self, request, *args, **kwargs):
+        # partial_update delega en update
+        with transaction.atomic():
+            return super().update(request, *args, **kwargs)
+    
+    def destroy(self, request, *args, **kwargs):
+        with transaction.atomic():
+            return super().destroy(request, *args, **kwargs)
+
+
+class BaseModelViewSet(AtomicWriteMixin, ConditionalGetMixin, QuerysetOptimizerMixin,
+                       viewsets.ModelViewSet):
     """
     ViewSet base con funcionalidad común para todos los modelos.
     
     Incluye:
     - Verificación automática de permisos
+    - Optimización de querysets según el serializer
+    - Solicitudes condicionales (ETag / Last-Modified)
     - Configuración estándar de filtros y paginación
     - Manejo de errores común
     - Logging de acciones
@@ -33,6 +493,16 @@ class BaseModelViewSet(viewsets.ModelViewSet):
     filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
     throttle_classes = [UserRateThrottle, AnonRateThrottle]
     
+    # Permiso del modelo que requiere cada acción
+    action_permissions = {
+        'list': 'view',
+        'retrieve': 'view',
+        'create': 'add',
+        'update': 'change',
+        'partial_update': 'change',
+        'destroy': 'delete',
+    }
+    
     def get_model_name(self):
         """Obtiene el nombre del modelo en minúsculas."""
         if self.queryset is not None:
@@ -76,35 +546,18 @@ class BaseModelViewSet(viewsets.ModelViewSet):
                 message=f'No tienes permiso para {action} {model_name}'
             )
     
-    def list(self, request, *args, **kwargs):
-        """Lista objetos verificando permisos."""
-        self.check_action_permission(request, 'view')
-        return super().list(request, *args, **kwargs)
-    
-    def create(self, request, *args, **kwargs):
-        """Crea un objeto verificando permisos."""
-        self.check_action_permission(request, 'add')
-        return super().create(request, *args, **kwargs)
-    
-    def retrieve(self, request, *args, **kwargs):
-        """Obtiene un objeto verificando permisos."""
-        self.check_action_permission(request, 'view')
-        return super().retrieve(request, *args, **kwargs)
-    
-    def update(self, request, *args, **kwargs):
-        """Actualiza un objeto verificando permisos."""
-        self.check_action_permission(request, 'change')
-        return super().update(request, *args, **kwargs)
-    
-    def partial_update(self, request, *args, **kwargs):
-        """Actualiza parcialmente un objeto verificando permisos."""
-        self.check_action_permission(request, 'change')
-        return super().partial_update(request, *args, **kwargs)
-    
-    def destroy(self, request, *args, **kwargs):
-        """Elimina un objeto verificando permisos."""
-        self.check_action_permission(request, 'delete')
-        return super().destroy(request, *args, **kwargs)
+    def check_permissions(self, request):
+        """
+        Verifica los permisos de DRF y el permiso del modelo para la acción.
+        
+        Se ejecuta en ``initial()``, antes de la caché de respuestas y de
+        las solicitudes condicionales, de modo que un 304 o una respuesta
+        cacheada nunca se sirven a un usuario sin permiso.
+        """
+        super().check_permissions(request)
+        action = self.action_permissions.get(self.action)
+        if action:
+            self.check_action_permission(request, action)
     
     def perform_create(self, serializer):
         """
@@ -9,7 +9,7 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import SearchFilter, OrderingFilter
-from rest_framework.throttling import UserRateThrottle, AnonRateThrottle
+from blog.throttling import UserRateThrottle, AnonRateThrottle
 import logging
 from django.utils import timezone
 
@@ -17,11 +17,11 @@ from blog.Models.ConferenciasModel import Conferencias
 from blog.Serializers.ConferenciasSerializer import ConferenciasSerializer
 from blog.pagination import StandardResultsSetPagination
 from blog.filters import ConferenciasFilter
-from blog.Views.BaseModelViewSet import BaseModelViewSet
+from blog.Views.BaseModelViewSet import BaseModelViewSet, KeysetPaginationMixin, ResponseCacheMixin
 
 logger = logging.getLogger(__name__)
 
-class ConferenciasViewSet(BaseModelViewSet):
+class ConferenciasViewSet(ResponseCacheMixin, KeysetPaginationMixin, BaseModelViewSet):
     """
     ViewSet para gestionar conferencias.
     
@@ -54,11 +54,21 @@ class ConferenciasViewSet(BaseModelViewSet):
     ordering_fields = ['fecha_conferencia', 'nombre_conferencia', 'ponente_conferencia']
     ordering = ['-fecha_conferencia']  # Ordenamiento por defecto
     
+    # `proximas` admite paginación por cursor con ?paginacion=cursor
+    keyset_pagination_actions = ('proximas',)
+    keyset_ordering = ('fecha_conferencia', 'idconferencia')
+    
+    # Respuestas en caché (ver ResponseCacheMixin)
+    cache_response_actions = ('list', 'proximas')
+    
     @action(detail=False, methods=['get'])
     def proximas(self, request):
         """
         Endpoint para obtener solo conferencias futuras.
         
+        Admite paginación por cursor con ``?paginacion=cursor``, ordenada de
+        la más cercana a la más lejana.
+        
         Returns:
             Response: Lista de conferencias futuras
         """
@@ -8,7 +8,7 @@ con capacidades avanzadas de filtrado y búsqueda.
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
-from rest_framework.throttling import UserRateThrottle, AnonRateThrottle
+from blog.throttling import UserRateThrottle, AnonRateThrottle
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import SearchFilter, OrderingFilter
 import logging
@@ -16,11 +16,18 @@ import logging
 from blog.Models.CursosModel import Cursos
 from blog.Serializers.CursosSerializer import CursosSerializer
 from blog.filters import CursosFilter
+from blog.Views.BaseModelViewSet import (
+    AtomicWriteMixin,
+    ConditionalGetMixin,
+    QuerysetOptimizerMixin,
+    ResponseCacheMixin
+)
 
 logger = logging.getLogger(__name__)
 
 
-class CursosViewSet(viewsets.ModelViewSet):
+class CursosViewSet(AtomicWriteMixin, ConditionalGetMixin, ResponseCacheMixin,
+                    QuerysetOptimizerMixin, viewsets.ModelViewSet):
     """
     ViewSet para gestionar cursos.
     
@@ -50,6 +57,9 @@ class CursosViewSet(viewsets.ModelViewSet):
     ordering = ['-fechainicial_curso']  # Ordenamiento por defecto
     throttle_classes = [UserRateThrottle, AnonRateThrottle]
     
+    # Respuestas en caché (ver ResponseCacheMixin)
+    cache_response_actions = ('list', 'activos')
+    
     def perform_create(self, serializer):
         """
         Crear un nuevo curso asignando el usuario actual como creador.
@@ -9,7 +9,7 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import SearchFilter, OrderingFilter
-from rest_framework.throttling import UserRateThrottle, AnonRateThrottle
+from blog.throttling import UserRateThrottle, AnonRateThrottle
 import logging
 
 from blog.Models.IntegrantesModel import Integrantes
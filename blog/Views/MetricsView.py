@@ -0,0 +1,48 @@
+"""
+Endpoint de métricas de la API en formato Prometheus.
+
+Expone los contadores e histogramas de latencia agregados por
+``blog.services.api_metrics``.
+"""
+
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseForbidden
+from django.utils.crypto import constant_time_compare
+from django.views.decorators.http import require_GET
+
+from blog.services.api_metrics import render_prometheus
+
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+def _is_authorized(request) -> bool:
+    """
+    Verifica el acceso al endpoint de métricas.
+
+    Si ``API_METRICS_TOKEN`` está configurado se exige
+    ``Authorization: Bearer <token>`` (pensado para el scraper de
+    Prometheus); en caso contrario solo el personal (staff) autenticado.
+    """
+    token = getattr(settings, 'API_METRICS_TOKEN', '')
+    if token:
+        header = request.META.get('HTTP_AUTHORIZATION', '')
+        return constant_time_compare(header, f'Bearer {token}')
+    user = getattr(request, 'user', None)
+    return bool(user and user.is_authenticated and user.is_staff)
+
+
+@require_GET
+def api_metrics(request) -> HttpResponse:
+    """
+    Exposición de métricas en el formato de texto de Prometheus.
+
+    Returns:
+        HttpResponse con ``blog_http_requests_total`` y
+        ``blog_http_request_duration_seconds``
+    """
+    if not _is_authorized(request):
+        return HttpResponseForbidden('No tienes permisos para ver las métricas')
+
+    response = HttpResponse(render_prometheus(), content_type=PROMETHEUS_CONTENT_TYPE)
+    response['Cache-Control'] = 'no-store'
+    return response
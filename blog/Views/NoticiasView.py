@@ -8,7 +8,7 @@ con capacidades avanzadas de filtrado y búsqueda.
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
-from rest_framework.throttling import UserRateThrottle, AnonRateThrottle
+from blog.throttling import UserRateThrottle, AnonRateThrottle
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import SearchFilter, OrderingFilter
 from django.utils import timezone
@@ -17,11 +17,19 @@ import logging
 from blog.Models.NoticiasModel import Noticias
 from blog.Serializers.NoticiasSerializer import NoticiasSerializer
 from blog.filters import NoticiasFilter
+from blog.Views.BaseModelViewSet import (
+    AtomicWriteMixin,
+    ConditionalGetMixin,
+    KeysetPaginationMixin,
+    QuerysetOptimizerMixin,
+    ResponseCacheMixin
+)
 
 logger = logging.getLogger(__name__)
 
 
-class NoticiasViewSet(viewsets.ModelViewSet):
+class NoticiasViewSet(AtomicWriteMixin, ConditionalGetMixin, ResponseCacheMixin,
+                      KeysetPaginationMixin, QuerysetOptimizerMixin, viewsets.ModelViewSet):
     """
     ViewSet para gestionar noticias.
     
@@ -51,6 +59,13 @@ class NoticiasViewSet(viewsets.ModelViewSet):
     ordering = ['-fecha_noticia']  # Ordenamiento por defecto
     throttle_classes = [UserRateThrottle, AnonRateThrottle]
     
+    # `recientes` admite paginación por cursor con ?paginacion=cursor
+    keyset_pagination_actions = ('recientes',)
+    keyset_ordering = ('-fecha_noticia', '-idnoticia')
+    
+    # Respuestas en caché (ver ResponseCacheMixin)
+    cache_response_actions = ('list', 'recientes')
+    
     def perform_create(self, serializer):
         """
         Crear una nueva noticia asignando el usuario actual como creador.
@@ -76,6 +91,8 @@ class NoticiasViewSet(viewsets.ModelViewSet):
         """
         Endpoint para obtener las noticias más recientes.
         
+        Admite paginación por cursor con ``?paginacion=cursor``.
+        
         Returns:
             Response: Lista de las últimas 10 noticias
         """
@@ -8,20 +8,28 @@ con filtros avanzados, búsqueda y gestión de expiración automática.
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
-from rest_framework.throttling import UserRateThrottle, AnonRateThrottle
+from blog.throttling import UserRateThrottle, AnonRateThrottle
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import SearchFilter, OrderingFilter
 from django.utils import timezone
+from datetime import datetime, timezone as dt_timezone
 import logging
 
 from blog.Models.OfertasEmpleoModel import OfertasEmpleo
 from blog.Serializers.OfertasSerializer import OfertasEmpleoSerializer
 from blog.filters import OfertasEmpleoFilter
+from blog.services import ofertas_estadisticas
+from blog.Views.BaseModelViewSet import (
+    AtomicWriteMixin,
+    ConditionalGetMixin,
+    QuerysetOptimizerMixin,
+)
 
 logger = logging.getLogger(__name__)
 
 
-class OfertasEmpleoViewSet(viewsets.ModelViewSet):
+class OfertasEmpleoViewSet(AtomicWriteMixin, ConditionalGetMixin, QuerysetOptimizerMixin,
+                           viewsets.ModelViewSet):
     """
     ViewSet para gestionar ofertas de empleo.
     
@@ -143,26 +151,25 @@ class OfertasEmpleoViewSet(viewsets.ModelViewSet):
         """
         Endpoint para obtener estadísticas de ofertas de empleo.
         
+        Los totales salen de una sola consulta de agregación condicional y
+        las empresas más activas del resumen ``EmpresaOfertasResumen``; si
+        supera ``OFERTAS_RESUMEN_MAX_STALENESS`` se encola su recálculo.
+        
         Returns:
             Response: Estadísticas básicas sobre las ofertas
         """
-        total = self.get_queryset().count()
-        vigentes = self.get_queryset().filter(fecha_expiracion__gte=timezone.now()).count()
-        expiradas = total - vigentes
-        
-        # Empresas más activas
-        from django.db.models import Count
-        empresas_activas = (self.get_queryset()
-                           .values('empresa')
-                           .annotate(total=Count('idoferta'))
-                           .order_by('-total')[:5])
+        conteos = ofertas_estadisticas.get_conteos(self.get_queryset())
+        refrescado = ofertas_estadisticas.request_refresh_if_stale()
         
         data = {
-            'total_ofertas': total,
-            'ofertas_vigentes': vigentes,
-            'ofertas_expiradas': expiradas,
-            'empresas_mas_activas': list(empresas_activas)
+            'total_ofertas': conteos['total'],
+            'ofertas_vigentes': conteos['vigentes'],
+            'ofertas_expiradas': conteos['expiradas'],
+            'empresas_mas_activas': ofertas_estadisticas.get_empresas_activas(5),
+            'resumen_empresas_recalculado': datetime.fromtimestamp(
+                refrescado, tz=dt_timezone.utc
+            ).isoformat() if refrescado is not None else None
         }
         
         logger.info(f"Estadísticas de ofertas solicitadas por {request.user}")
-        return Response(data, status=status.HTTP_200_OK)
\ No newline at end of file
+        return Response(data, status=status.HTTP_200_OK)
@@ -10,6 +10,9 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import status
 from django.contrib.auth.models import User
+from django.utils.http import parse_etags, quote_etag
+import hashlib
+import json
 import logging
 
 from blog.services.permissions_service import (
@@ -28,6 +31,9 @@ def get_my_permissions(request):
     """
     Endpoint para obtener todos los permisos del usuario autenticado.
     
+    Incluye un header ``ETag`` calculado sobre el contenido; si el cliente
+    envía ``If-None-Match`` con el mismo valor se responde 304 sin cuerpo.
+    
     Returns:
         Response con permisos y grupos del usuario
     """
@@ -35,12 +41,22 @@ def get_my_permissions(request):
         user_perms = get_user_permissions(request.user)
         user_groups = get_user_groups(request.user)
         
-        return Response({
+        data = {
             'permissions': user_perms,
             'groups': user_groups,
             'is_staff': request.user.is_staff,
             'is_superuser': request.user.is_superuser
-        }, status=status.HTTP_200_OK)
+        }
+        etag = quote_etag(_compute_etag(data))
+        
+        if etag in parse_etags(request.META.get('HTTP_IF_NONE_MATCH', '')):
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            response = Response(data, status=status.HTTP_200_OK)
+        
+        response['ETag'] = etag
+        response['Cache-Control'] = 'private, no-cache'
+        return response
         
     except Exception as e:
         logger.error(f"Error al obtener permisos: {str(e)}")
@@ -49,6 +65,19 @@ def get_my_permissions(request):
             status=status.HTTP_500_INTERNAL_SERVER_ERROR
         )
 
+def _compute_etag(data) -> str:
+    """
+    Calcula un ETag estable para una respuesta.
+    
+    Args:
+        data: Datos serializables a JSON
+        
+    Returns:
+        str con el hash del contenido (sin comillas)
+    """
+    payload = json.dumps(data, sort_keys=True, separators=(',', ':'))
+    return hashlib.md5(payload.encode('utf-8'), usedforsecurity=False).hexdigest()
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def check_permission(request):
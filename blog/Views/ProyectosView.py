@@ -8,19 +8,29 @@ con capacidades avanzadas de filtrado y búsqueda.
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
-from rest_framework.throttling import UserRateThrottle, AnonRateThrottle
+from blog.throttling import UserRateThrottle, AnonRateThrottle
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import SearchFilter, OrderingFilter
+from django.db.models import Count, Prefetch
 import logging
 
+from blog.Models.IntegrantesModel import Integrantes
 from blog.Models.ProyectosModel import Proyectos
+from blog.Models.ProyectoTecnologiaModel import ProyectoTecnologia
 from blog.Serializers.ProyectosSerializer import ProyectosSerializer
 from blog.filters import ProyectosFilter
+from blog.Views.BaseModelViewSet import (
+    AtomicWriteMixin,
+    ConditionalGetMixin,
+    QuerysetOptimizerMixin,
+    ResponseCacheMixin
+)
 
 logger = logging.getLogger(__name__)
 
 
-class ProyectosViewSet(viewsets.ModelViewSet):
+class ProyectosViewSet(AtomicWriteMixin, ConditionalGetMixin, ResponseCacheMixin,
+                       QuerysetOptimizerMixin, viewsets.ModelViewSet):
     """
     ViewSet para gestionar proyectos.
     
@@ -33,7 +43,7 @@ class ProyectosViewSet(viewsets.ModelViewSet):
     
     **Filtros disponibles:**
     - `nombre`: Buscar por nombre del proyecto
-    - `tecnologia`: Buscar por tecnología en la descripción
+    - `tecnologia`: Buscar por tecnología (usa el índice de tecnologías)
     
     **Búsqueda:**
     Usar el parámetro `search` para buscar en nombre y descripción.
@@ -46,11 +56,45 @@ class ProyectosViewSet(viewsets.ModelViewSet):
     queryset = Proyectos.objects.all()
     filterset_class = ProyectosFilter
     filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
-    search_fields = ['nombre_proyecto', 'descripcion_proyecto']
+    search_fields = ['nombre_proyecto', 'description_proyecto']
     ordering_fields = ['nombre_proyecto', 'fecha_proyecto']
     ordering = ['-fecha_proyecto']  # Ordenamiento por defecto
     throttle_classes = [UserRateThrottle, AnonRateThrottle]
     
+    # Presupuesto de queries por solicitud (ver QueryCountMiddleware)
+    query_budget = {
+        'list': 10,
+        'retrieve': 8,
+        'default': 12,
+    }
+    
+    # Respuestas en caché; integrantes_info depende también de Integrantes.
+    # El índice de tecnologías solo cambia al guardar un proyecto.
+    cache_response_actions = ('list', 'tecnologias_populares')
+    cache_dependencies = (Integrantes,)
+    
+    def get_queryset(self):
+        """
+        Queryset optimizado para la serialización de proyectos.
+        
+        ``QuerysetOptimizerMixin`` ya aplica ``select_related('creador')`` y
+        la precarga de ``integrantes``; aquí se agregan:
+        - Anotación ``num_integrantes`` para ``total_integrantes``
+        - ``Prefetch`` de los integrantes activos para ``integrantes_info``
+        
+        Así el número de queries de un listado es constante sin importar
+        el tamaño de la página.
+        """
+        return (super().get_queryset()
+                .annotate(num_integrantes=Count('integrantes'))
+                .prefetch_related(
+                    Prefetch(
+                        'integrantes',
+                        queryset=Integrantes.objects.filter(estado=True),
+                        to_attr='integrantes_activos'
+                    )
+                ))
+    
     def perform_create(self, serializer):
         """
         Crear un nuevo proyecto asignando el usuario actual como creador.
@@ -60,6 +104,7 @@ class ProyectosViewSet(viewsets.ModelViewSet):
         """
         logger.info(f"Usuario {self.request.user} creando nuevo proyecto")
         serializer.save(creador=self.request.user)
+        self._reload_instance(serializer)
     
     def perform_update(self, serializer):
         """
@@ -70,42 +115,36 @@ class ProyectosViewSet(viewsets.ModelViewSet):
         """
         logger.info(f"Usuario {self.request.user} actualizando proyecto {serializer.instance.pk}")
         serializer.save()
+        self._reload_instance(serializer)
+    
+    def _reload_instance(self, serializer):
+        """
+        Vuelve a cargar el proyecto guardado con ``get_queryset()``.
+        
+        La anotación ``num_integrantes`` y la lista ``integrantes_activos``
+        de la instancia son las de antes de guardar (DRF solo limpia
+        ``_prefetched_objects_cache``); la respuesta se arma con los
+        valores actualizados.
+        """
+        serializer.instance = self.get_queryset().get(pk=serializer.instance.pk)
     
     @action(detail=False, methods=['get'])
     def tecnologias_populares(self, request):
         """
         Endpoint para obtener las tecnologías más populares en proyectos.
         
+        Agrega el índice ``ProyectoTecnologia`` (mantenido al guardar cada
+        proyecto) con un único ``GROUP BY`` en la base de datos.
+        
         Returns:
             Response: Lista de tecnologías mencionadas con frecuencia
         """
-        # Análisis simple de palabras clave en descripciones
-        tecnologias_comunes = [
-            'python', 'django', 'javascript', 'react', 'vue', 'angular',
-            'nodejs', 'java', 'spring', 'docker', 'kubernetes', 'aws',
-            'postgresql', 'mysql', 'mongodb', 'redis', 'git'
-        ]
-        
-        from django.db.models import Q
-        import re
-        
-        tecnologias_encontradas = {}
-        
-        proyectos = self.get_queryset()
-        for proyecto in proyectos:
-            texto = (proyecto.descripcion_proyecto or '').lower()
-            for tech in tecnologias_comunes:
-                if re.search(r'\b' + tech + r'\b', texto):
-                    tecnologias_encontradas[tech] = tecnologias_encontradas.get(tech, 0) + 1
-        
-        # Ordenar por frecuencia
-        tecnologias_ordenadas = sorted(
-            tecnologias_encontradas.items(),
-            key=lambda x: x[1],
-            reverse=True
-        )[:10]
-        
-        resultado = [{'tecnologia': tech, 'proyectos': count} for tech, count in tecnologias_ordenadas]
+        resultado = list(
+            ProyectoTecnologia.objects
+            .values('tecnologia')
+            .annotate(proyectos=Count('proyecto_id'))
+            .order_by('-proyectos', 'tecnologia')[:10]
+        )
         
         logger.info(f"Tecnologías populares solicitadas por {request.user}")
-        return Response(resultado, status=status.HTTP_200_OK)
\ No newline at end of file
+        return Response(resultado, status=status.HTTP_200_OK)
@@ -1,5 +1,5 @@
 from django.apps import AppConfig
-from django.db.models.signals import post_migrate
+from django.db.models.signals import post_migrate, post_init, post_save, post_delete, m2m_changed
 from django.core.management import call_command
 
 class BlogConfig(AppConfig):
@@ -10,6 +10,68 @@ class BlogConfig(AppConfig):
         # Conectar la señal post_migrate para ejecutar código después de las migraciones
         post_migrate.connect(blog_callback, sender=self)
 
+        # Invalidar la caché de permisos cuando cambian grupos o asignaciones
+        from django.contrib.auth.models import User, Group, Permission
+        from blog.services import permissions_cache
+        from blog.services.permissions_service import clear_permission_catalog
+
+        # El catálogo de permisos cambia al migrar; los cambios de Permission
+        # ya incrementan la versión global en on_group_or_permission_changed
+        post_migrate.connect(clear_permission_catalog)
+
+        for model in (Group, Permission):
+            post_save.connect(permissions_cache.on_group_or_permission_changed, sender=model)
+            post_delete.connect(permissions_cache.on_group_or_permission_changed, sender=model)
+        m2m_changed.connect(
+            permissions_cache.on_group_permissions_changed,
+            sender=Group.permissions.through
+        )
+        m2m_changed.connect(
+            permissions_cache.on_user_relations_changed,
+            sender=User.groups.through
+        )
+        m2m_changed.connect(
+            permissions_cache.on_user_relations_changed,
+            sender=User.user_permissions.through
+        )
+
+        # Versiones de modelos y objetos: invalidan las respuestas en caché
+        # y alimentan los ETag de las solicitudes condicionales
+        from blog.services import response_cache
+        from blog.Models.ConferenciasModel import Conferencias
+        from blog.Models.CursosModel import Cursos
+        from blog.Models.IntegrantesModel import Integrantes
+        from blog.Models.NoticiasModel import Noticias
+        from blog.Models.OfertasEmpleoModel import OfertasEmpleo
+        from blog.Models.ProyectosModel import Proyectos
+
+        for model in (Conferencias, Cursos, Integrantes, Noticias, OfertasEmpleo, Proyectos):
+            post_save.connect(response_cache.on_model_changed, sender=model)
+            post_delete.connect(response_cache.on_model_changed, sender=model)
+        m2m_changed.connect(
+            response_cache.on_model_changed,
+            sender=Proyectos.integrantes.through
+        )
+
+        # Índice de tecnologías mencionadas en las descripciones
+        from blog.services import tecnologias
+        post_save.connect(tecnologias.on_proyecto_saved, sender=Proyectos)
+
+        # Resumen incremental de ofertas por empresa
+        from blog.services import ofertas_estadisticas
+        post_init.connect(ofertas_estadisticas.on_oferta_init, sender=OfertasEmpleo)
+        post_save.connect(ofertas_estadisticas.on_oferta_saved, sender=OfertasEmpleo)
+        post_delete.connect(ofertas_estadisticas.on_oferta_deleted, sender=OfertasEmpleo)
+
+        # Auditoría en la capa de aplicación (AUDIT_MODE = 'write_behind');
+        # en el modo trigger los logs los escribe la base de datos
+        from blog.services import audit_triggers, audit_write_behind
+        if audit_write_behind.is_write_behind():
+            for model in audit_triggers.get_audited_models():
+                post_init.connect(audit_write_behind.on_audited_init, sender=model)
+                post_save.connect(audit_write_behind.on_audited_saved, sender=model)
+                post_delete.connect(audit_write_behind.on_audited_deleted, sender=model)
+
 def blog_callback(sender, **kwargs):
     # Ejecutar el comando setup_groups después de las migraciones
-    call_command('setup_groups')
\ No newline at end of file
+    call_command('setup_groups')
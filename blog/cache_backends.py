@@ -0,0 +1,76 @@
+"""
+Backends de caché del blog.
+
+``FailOpenRedisCache`` es el ``RedisCache`` de Django con tolerancia a
+fallos: si Redis no responde, las lecturas se comportan como un fallo de
+caché y las escrituras se descartan (con un aviso en el log), de modo que
+una caída de Redis hace las solicitudes más lentas pero no las rompe.
+
+``incr``/``decr`` siguen propagando el error porque no tienen un valor
+seguro por defecto; sus usos (throttling y versión de permisos) lo
+manejan por su cuenta.
+"""
+
+from django.core.cache.backends.redis import RedisCache
+from redis.exceptions import RedisError
+import functools
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def _fail_open(default):
+    """Decora una operación para que retorne ``default`` si Redis falla."""
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            try:
+                return method(self, *args, **kwargs)
+            except RedisError as e:
+                logger.warning(f"Caché Redis no disponible en {method.__name__}: {str(e)}")
+                return default
+        return wrapper
+    return decorator
+
+
+class FailOpenRedisCache(RedisCache):
+    """RedisCache que trata los errores de Redis como fallos de caché."""
+
+    def get(self, key, default=None, version=None):
+        try:
+            return super().get(key, default, version)
+        except RedisError as e:
+            logger.warning(f"Caché Redis no disponible en get: {str(e)}")
+            return default
+
+    @_fail_open({})
+    def get_many(self, keys, version=None):
+        return super().get_many(keys, version)
+
+    @_fail_open(False)
+    def add(self, key, value, timeout=None, version=None):
+        return super().add(key, value, timeout, version)
+
+    @_fail_open(None)
+    def set(self, key, value, timeout=None, version=None):
+        return super().set(key, value, timeout, version)
+
+    @_fail_open([])
+    def set_many(self, data, timeout=None, version=None):
+        return super().set_many(data, timeout, version)
+
+    @_fail_open(False)
+    def touch(self, key, timeout=None, version=None):
+        return super().touch(key, timeout, version)
+
+    @_fail_open(False)
+    def delete(self, key, version=None):
+        return super().delete(key, version)
+
+    @_fail_open(None)
+    def delete_many(self, keys, version=None):
+        return super().delete_many(keys, version)
+
+    @_fail_open(False)
+    def has_key(self, key, version=None):
+        return super().has_key(key, version)
@@ -6,6 +6,7 @@ de búsqueda y filtrado de las diferentes entidades.
 """
 
 import django_filters
+from django import forms
 from django.db import models
 from django.utils import timezone
 from .Models.ConferenciasModel import Conferencias
@@ -14,6 +15,7 @@ from .Models.OfertasEmpleoModel import OfertasEmpleo
 from .Models.NoticiasModel import Noticias
 from .Models.CursosModel import Cursos
 from .Models.ProyectosModel import Proyectos
+from .Models.AuditLogModel import AuditLog
 
 
 class ConferenciasFilter(django_filters.FilterSet):
@@ -219,11 +221,81 @@ class ProyectosFilter(django_filters.FilterSet):
     )
     
     tecnologia = django_filters.CharFilter(
-        field_name='descripcion_proyecto',
-        lookup_expr='icontains',
+        method='filter_tecnologia',
         help_text="Buscar por tecnología en la descripción"
     )
 
     class Meta:
         model = Proyectos
         fields = ['nombre', 'tecnologia']
+    
+    def filter_tecnologia(self, queryset, name, value):
+        """
+        Filtra por tecnología.
+        
+        Las tecnologías conocidas se buscan en el índice
+        ``ProyectoTecnologia``; cualquier otro texto se busca en la
+        descripción.
+        """
+        from blog.services.tecnologias import TECNOLOGIAS
+        
+        tecnologia = value.strip().lower()
+        if tecnologia in TECNOLOGIAS:
+            return queryset.filter(tecnologias__tecnologia=tecnologia)
+        return queryset.filter(description_proyecto__icontains=value)
+
+
+class JSONFilter(django_filters.Filter):
+    """Filtro cuyo valor es un documento JSON (400 si no es válido)."""
+    
+    field_class = forms.JSONField
+
+
+class AuditLogFilter(django_filters.FilterSet):
+    """
+    Filtro personalizado para logs de auditoría.
+    
+    Permite filtrar por tabla, tipo de cambio, usuario, rango de fechas y
+    contenido de los datos modificados.
+    """
+    
+    tabla = django_filters.CharFilter(
+        field_name='table_name',
+        lookup_expr='exact',
+        help_text="Filtrar por nombre de tabla (por ejemplo blog_noticias)"
+    )
+    
+    tipo = django_filters.ChoiceFilter(
+        field_name='change_type',
+        choices=AuditLog.CHANGE_TYPES,
+        help_text="Filtrar por tipo de cambio (CREATE, UPDATE, DELETE)"
+    )
+    
+    usuario = django_filters.CharFilter(
+        field_name='user__username',
+        lookup_expr='exact',
+        help_text="Filtrar por nombre de usuario"
+    )
+    
+    fecha_desde = django_filters.DateTimeFilter(
+        field_name='timestamp',
+        lookup_expr='gte',
+        help_text="Logs desde esta fecha"
+    )
+    
+    fecha_hasta = django_filters.DateTimeFilter(
+        field_name='timestamp',
+        lookup_expr='lt',
+        help_text="Logs anteriores a esta fecha"
+    )
+    
+    # Contención jsonb (@>), resuelta con el índice GIN jsonb_path_ops
+    datos = JSONFilter(
+        field_name='modified_data',
+        lookup_expr='contains',
+        help_text='Logs cuyos datos contienen el JSON indicado, por ejemplo {"new_empresa": "ACME"}'
+    )
+
+    class Meta:
+        model = AuditLog
+        fields = ['tabla', 'tipo', 'usuario', 'fecha_desde', 'fecha_hasta', 'datos']
@@ -0,0 +1,140 @@
+"""
+Comando de gestión para los triggers de auditoría generados.
+
+Permite revisar qué triggers tiene cada tabla auditada, ver el SQL que se
+genera a partir de los modelos e instalarlo o eliminarlo sin esperar a una
+migración (por ejemplo en una base restaurada desde un respaldo).
+"""
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+import json
+
+from blog.services import audit_triggers
+
+
+class Command(BaseCommand):
+    """
+    Comando para administrar los triggers de auditoría de ``blog``.
+
+    Uso:
+        python manage.py audit_triggers
+        python manage.py audit_triggers --sql
+        python manage.py audit_triggers --instalar
+        python manage.py audit_triggers --desinstalar
+        python manage.py audit_triggers --aplicar-modo
+        python manage.py audit_triggers --formato json
+    """
+
+    help = 'Revisa, genera, instala o elimina los triggers de auditoría'
+
+    def add_arguments(self, parser):
+        """
+        Agrega argumentos al comando.
+
+        Args:
+            parser: ArgumentParser de Django
+        """
+        accion = parser.add_mutually_exclusive_group()
+        accion.add_argument(
+            '--sql',
+            action='store_true',
+            help='Muestra el SQL de instalación sin ejecutarlo'
+        )
+        accion.add_argument(
+            '--instalar',
+            action='store_true',
+            help='Instala o actualiza los triggers en la base de datos'
+        )
+        accion.add_argument(
+            '--desinstalar',
+            action='store_true',
+            help='Elimina los triggers generados y su función'
+        )
+        accion.add_argument(
+            '--aplicar-modo',
+            action='store_true',
+            help='Instala o elimina los triggers según AUDIT_MODE'
+        )
+
+        parser.add_argument(
+            '--formato',
+            type=str,
+            default='texto',
+            choices=['texto', 'json'],
+            help='Formato de salida del estado (texto o json)'
+        )
+
+        parser.add_argument(
+            '--database',
+            type=str,
+            default='default',
+            help='Alias de la base de datos (default: default)'
+        )
+
+    def handle(self, *args, **options):
+        """
+        Ejecuta el comando principal.
+
+        Args:
+            *args: Argumentos posicionales
+            **options: Opciones del comando
+        """
+        connection = connections[options['database']]
+        models = audit_triggers.get_audited_models()
+
+        if options['sql']:
+            for statement in audit_triggers.build_install_sql(models, connection.ops.quote_name):
+                self.stdout.write(statement.strip())
+            return
+
+        cambia_triggers = options['instalar'] or options['desinstalar'] or options['aplicar_modo']
+        if cambia_triggers and connection.vendor != 'postgresql':
+            raise CommandError('Los triggers de auditoría requieren PostgreSQL')
+
+        if options['aplicar_modo']:
+            modo = getattr(settings, 'AUDIT_MODE', 'trigger')
+            options['instalar'] = modo == 'trigger'
+            options['desinstalar'] = not options['instalar']
+            self.stdout.write(f'Modo de auditoría: {modo}')
+
+        if options['instalar']:
+            total = audit_triggers.install(models, connection)
+            self.stdout.write(self.style.SUCCESS(
+                f'Triggers v{audit_triggers.AUDIT_TRIGGER_VERSION} instalados en {total} tablas'
+            ))
+            return
+
+        if options['desinstalar']:
+            audit_triggers.uninstall(models, connection)
+            self.stdout.write(self.style.SUCCESS('Triggers de auditoría eliminados'))
+            return
+
+        estado = audit_triggers.get_status(connection)
+        estado['modo'] = getattr(settings, 'AUDIT_MODE', 'trigger')
+        if options['formato'] == 'json':
+            self.stdout.write(json.dumps(estado, indent=2))
+            return
+
+        self.stdout.write(self.style.SUCCESS('=== TRIGGERS DE AUDITORÍA ==='))
+        self.stdout.write(
+            f"Versión esperada: {estado['version_esperada']} | "
+            f"instalada: {estado['version_instalada'] or 'ninguna'} | "
+            f"modo: {estado['modo']}\n"
+        )
+        if estado['modo'] != 'trigger' and (estado['version_instalada'] or estado['heredados']):
+            self.stdout.write(self.style.WARNING(
+                'Los triggers están instalados pero AUDIT_MODE no es trigger: '
+                'los cambios se auditarán dos veces (usar --aplicar-modo)\n'
+            ))
+        esperados = {audit_triggers.trigger_name(op) for op in audit_triggers.OPERATIONS}
+        for tabla, triggers in estado['tablas'].items():
+            faltantes = esperados - set(triggers)
+            heredados = [t for t in triggers if t.startswith(audit_triggers.LEGACY_TRIGGER_PREFIX)]
+            linea = f"  {tabla}: {', '.join(triggers) or 'sin triggers'}"
+            if faltantes:
+                linea += self.style.WARNING(f"  (faltan: {', '.join(sorted(faltantes))})")
+            if heredados:
+                linea += self.style.WARNING('  (triggers por fila heredados)')
+            self.stdout.write(linea)
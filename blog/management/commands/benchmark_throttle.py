@@ -0,0 +1,166 @@
+"""
+Comando de gestión para comparar el costo de las clases de throttling.
+
+Mide el tiempo por solicitud y el tamaño guardado en caché del
+``AnonRateThrottle`` de DRF (historial de timestamps) frente al de
+``blog.throttling`` (ventana deslizante de dos buckets), usando la caché
+de throttling configurada.
+"""
+
+from django.contrib.auth.models import AnonymousUser
+from django.core.management.base import BaseCommand
+from rest_framework import throttling as drf_throttling
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+import json
+import pickle
+import time
+
+from blog import throttling
+
+
+class Command(BaseCommand):
+    """
+    Comando para comparar el throttling de DRF con el de ventana deslizante.
+
+    Cada cliente simulado hace ``--solicitudes`` llamadas a
+    ``allow_request`` con la tasa indicada. Para que el historial de DRF
+    crezca como en producción conviene usar una tasa mayor o igual al
+    número de solicitudes.
+
+    Uso:
+        python manage.py benchmark_throttle
+        python manage.py benchmark_throttle --tasa 1000/hour --solicitudes 1000
+        python manage.py benchmark_throttle --formato json
+    """
+
+    help = 'Compara el throttling de DRF con el de ventana deslizante del blog'
+
+    def add_arguments(self, parser):
+        """
+        Agrega argumentos al comando.
+
+        Args:
+            parser: ArgumentParser de Django
+        """
+        parser.add_argument(
+            '--tasa',
+            type=str,
+            default='1000/hour',
+            help='Tasa a simular (default: 1000/hour)'
+        )
+
+        parser.add_argument(
+            '--solicitudes',
+            type=int,
+            default=1000,
+            help='Solicitudes por cliente (default: 1000)'
+        )
+
+        parser.add_argument(
+            '--clientes',
+            type=int,
+            default=5,
+            help='Número de clientes (IPs) simulados (default: 5)'
+        )
+
+        parser.add_argument(
+            '--formato',
+            type=str,
+            default='texto',
+            choices=['texto', 'json'],
+            help='Formato de salida del reporte (texto o json)'
+        )
+
+    def handle(self, *args, **options):
+        """
+        Ejecuta el comando principal.
+
+        Args:
+            *args: Argumentos posicionales
+            **options: Opciones del comando
+        """
+        resultados = [
+            self.medir(nombre, clase, options)
+            for nombre, clase in (
+                ('drf', self.build_class(drf_throttling.AnonRateThrottle, options['tasa'])),
+                ('ventana_deslizante', self.build_class(throttling.AnonRateThrottle, options['tasa'])),
+            )
+        ]
+
+        if options['formato'] == 'json':
+            self.stdout.write(json.dumps(resultados, indent=2))
+            return
+
+        self.stdout.write(self.style.SUCCESS('=== BENCHMARK DE THROTTLING ==='))
+        self.stdout.write(
+            f"Tasa: {options['tasa']} | Clientes: {options['clientes']} | "
+            f"Solicitudes por cliente: {options['solicitudes']}\n"
+        )
+        for resultado in resultados:
+            self.stdout.write(
+                f"{resultado['clase']:<20} "
+                f"{resultado['us_por_solicitud']:>10.1f} µs/solicitud  "
+                f"{resultado['bytes_en_cache']:>8} bytes/cliente  "
+                f"permitidas: {resultado['permitidas']}"
+            )
+
+    def build_class(self, base, tasa):
+        """
+        Crea una subclase de throttling que usa la caché de throttling y
+        una tasa fija.
+
+        Args:
+            base: Clase de throttling a medir
+            tasa: Tasa en formato de DRF (por ejemplo ``1000/hour``)
+        """
+        bases = (base,)
+        if not issubclass(base, throttling.SharedCacheThrottleMixin):
+            bases = (throttling.SharedCacheThrottleMixin, base)
+        return type(base.__name__, bases, {
+            'scope': 'benchmark',
+            'THROTTLE_RATES': {'benchmark': tasa},
+        })
+
+    def medir(self, nombre, clase, options):
+        """
+        Ejecuta las solicitudes simuladas de una clase de throttling.
+
+        Returns:
+            dict: Tiempo por solicitud, tamaño en caché y solicitudes permitidas
+        """
+        factory = APIRequestFactory()
+        requests = []
+        for cliente in range(options['clientes']):
+            request = Request(factory.get('/', REMOTE_ADDR=f'10.99.0.{cliente + 1}'))
+            request.user = AnonymousUser()
+            requests.append(request)
+
+        # Prefijo propio para no mezclar contadores con los reales
+        prefijo = f'benchmark:{nombre}:{time.time_ns()}'
+        clase.cache_format = f'{prefijo}:%(scope)s_%(ident)s'
+
+        permitidas = 0
+        inicio = time.perf_counter()
+        for _ in range(options['solicitudes']):
+            for request in requests:
+                throttle = clase()
+                permitidas += throttle.allow_request(request, None)
+        total = time.perf_counter() - inicio
+
+        # Tamaño serializado de lo guardado para el último cliente
+        throttle = clase()
+        throttle.key = throttle.get_cache_key(requests[-1], None)
+        if nombre == 'drf':
+            guardado = [throttle.cache.get(throttle.key)]
+        else:
+            actual, anterior, _ = throttle.get_bucket_keys(throttle.timer())
+            guardado = [throttle.cache.get(actual), throttle.cache.get(anterior)]
+        bytes_en_cache = sum(len(pickle.dumps(valor)) for valor in guardado if valor is not None)
+
+        return {
+            'clase': nombre,
+            'us_por_solicitud': total / (options['solicitudes'] * options['clientes']) * 1e6,
+            'bytes_en_cache': bytes_en_cache,
+            'permitidas': permitidas,
+        }
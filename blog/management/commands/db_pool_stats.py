@@ -0,0 +1,187 @@
+"""
+Comando de gestión para revisar las conexiones a la base de datos.
+
+Muestra la configuración efectiva de conexiones (persistentes o pool), las
+estadísticas del pool de psycopg 3 y el uso de conexiones en el servidor
+PostgreSQL.
+"""
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+import json
+
+
+class Command(BaseCommand):
+    """
+    Comando para reportar el estado de las conexiones a la base de datos.
+
+    Las estadísticas del pool son las del proceso que ejecuta el comando;
+    las de ``pg_stat_activity`` reflejan todas las conexiones (workers de
+    gunicorn, Celery, etc.).
+
+    Uso:
+        python manage.py db_pool_stats
+        python manage.py db_pool_stats --formato json
+        python manage.py db_pool_stats --database default
+    """
+
+    help = 'Reporta la configuración y el uso de las conexiones a la base de datos'
+
+    def add_arguments(self, parser):
+        """
+        Agrega argumentos al comando.
+
+        Args:
+            parser: ArgumentParser de Django
+        """
+        parser.add_argument(
+            '--formato',
+            type=str,
+            default='texto',
+            choices=['texto', 'json'],
+            help='Formato de salida del reporte (texto o json)'
+        )
+
+        parser.add_argument(
+            '--database',
+            type=str,
+            default='default',
+            help='Alias de la base de datos (default: default)'
+        )
+
+    def handle(self, *args, **options):
+        """
+        Ejecuta el comando principal.
+
+        Args:
+            *args: Argumentos posicionales
+            **options: Opciones del comando
+        """
+        alias = options['database']
+        if alias not in settings.DATABASES:
+            raise CommandError(f'La base de datos "{alias}" no está configurada')
+
+        connection = connections[alias]
+        reporte = {
+            'configuracion': self.get_configuracion(connection),
+            'pool': self.get_pool_stats(connection),
+            'servidor': self.get_server_stats(connection),
+        }
+
+        if options['formato'] == 'json':
+            self.stdout.write(json.dumps(reporte, indent=2, default=str))
+        else:
+            self.write_texto(reporte)
+
+    def get_configuracion(self, connection):
+        """
+        Configuración efectiva de conexiones.
+
+        Args:
+            connection: Conexión de Django
+
+        Returns:
+            dict: Motor, persistencia, health checks y opciones del pool
+        """
+        pool_options = connection.settings_dict.get('OPTIONS', {}).get('pool')
+        if isinstance(pool_options, dict):
+            pool_options = {
+                key: value for key, value in pool_options.items() if key != 'check'
+            }
+
+        return {
+            'motor': connection.vendor,
+            'conn_max_age': connection.settings_dict.get('CONN_MAX_AGE'),
+            'conn_health_checks': connection.settings_dict.get('CONN_HEALTH_CHECKS'),
+            'pool': pool_options or False,
+            'workers_gunicorn': getattr(settings, 'GUNICORN_WORKERS', None),
+            'hilos_por_worker': getattr(settings, 'GUNICORN_THREADS', None),
+            'presupuesto_conexiones': getattr(settings, 'DB_MAX_CONNECTIONS', None),
+        }
+
+    def get_pool_stats(self, connection):
+        """
+        Estadísticas del pool de psycopg 3 de este proceso.
+
+        Args:
+            connection: Conexión de Django
+
+        Returns:
+            dict | None: Resultado de ``ConnectionPool.get_stats()`` o None
+            si no hay pool configurado
+        """
+        pool = getattr(connection, 'pool', None)
+        if pool is None:
+            return None
+
+        # Forzar la apertura del pool y una conexión para que haya datos
+        connection.ensure_connection()
+        return pool.get_stats()
+
+    def get_server_stats(self, connection):
+        """
+        Uso de conexiones según PostgreSQL.
+
+        Args:
+            connection: Conexión de Django
+
+        Returns:
+            dict | None: Límite del servidor y conexiones por estado, o None
+            si el motor no es PostgreSQL
+        """
+        if connection.vendor != 'postgresql':
+            return None
+
+        with connection.cursor() as cursor:
+            cursor.execute('SHOW max_connections')
+            max_connections = int(cursor.fetchone()[0])
+            cursor.execute(
+                """
+                SELECT COALESCE(state, 'desconocido'), COUNT(*)
+                FROM pg_stat_activity
+                WHERE datname = current_database()
+                GROUP BY 1
+                ORDER BY 2 DESC
+                """
+            )
+            por_estado = dict(cursor.fetchall())
+
+        return {
+            'max_connections': max_connections,
+            'conexiones_bd_actual': sum(por_estado.values()),
+            'por_estado': por_estado,
+        }
+
+    def write_texto(self, reporte):
+        """
+        Escribe el reporte en formato texto.
+
+        Args:
+            reporte: Diccionario con las secciones del reporte
+        """
+        self.stdout.write(self.style.SUCCESS('=== CONEXIONES A LA BASE DE DATOS ==='))
+
+        self.stdout.write('\nConfiguración:')
+        for clave, valor in reporte['configuracion'].items():
+            self.stdout.write(f'  {clave}: {valor}')
+
+        self.stdout.write('\nPool (este proceso):')
+        if reporte['pool'] is None:
+            self.stdout.write('  Sin pool configurado')
+        else:
+            for clave, valor in sorted(reporte['pool'].items()):
+                self.stdout.write(f'  {clave}: {valor}')
+
+        self.stdout.write('\nServidor:')
+        servidor = reporte['servidor']
+        if servidor is None:
+            self.stdout.write('  No disponible (el motor no es PostgreSQL)')
+            return
+
+        self.stdout.write(
+            f"  Conexiones a esta base: {servidor['conexiones_bd_actual']} "
+            f"de {servidor['max_connections']} permitidas por el servidor"
+        )
+        for estado, total in servidor['por_estado'].items():
+            self.stdout.write(f'    {estado}: {total}')
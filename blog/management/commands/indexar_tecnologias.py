@@ -0,0 +1,73 @@
+"""
+Comando de gestión para reconstruir el índice de tecnologías de proyectos.
+
+El índice se mantiene al guardar cada proyecto; este comando llena las
+filas existentes (por ejemplo después de migrar) o corrige cambios hechos
+sin pasar por ``save()`` (``QuerySet.update``, SQL directo).
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from blog.Models.ProyectosModel import Proyectos
+from blog.services.tecnologias import rebuild_tecnologias
+
+
+class Command(BaseCommand):
+    """
+    Comando para reconstruir ``ProyectoTecnologia`` a partir de las
+    descripciones de los proyectos.
+
+    Uso:
+        python manage.py indexar_tecnologias
+        python manage.py indexar_tecnologias --lote 1000
+    """
+
+    help = 'Reconstruye el índice de tecnologías de los proyectos existentes'
+
+    def add_arguments(self, parser):
+        """
+        Agrega argumentos al comando.
+
+        Args:
+            parser: ArgumentParser de Django
+        """
+        parser.add_argument(
+            '--lote',
+            type=int,
+            default=500,
+            help='Proyectos procesados por transacción (default: 500)'
+        )
+
+    def handle(self, *args, **options):
+        """
+        Ejecuta el comando principal.
+
+        Args:
+            *args: Argumentos posicionales
+            **options: Opciones del comando
+        """
+        lote = options['lote']
+        if lote < 1:
+            raise CommandError('--lote debe ser mayor que 0')
+
+        proyectos = (Proyectos.objects
+                     .order_by('idproyectos')
+                     .only('idproyectos', 'description_proyecto'))
+
+        total_proyectos = 0
+        total_etiquetas = 0
+        ultimo_id = 0
+        while True:
+            # Paginación por clave para no cargar toda la tabla
+            bloque = list(proyectos.filter(idproyectos__gt=ultimo_id)[:lote])
+            if not bloque:
+                break
+            total_etiquetas += rebuild_tecnologias(bloque)
+            total_proyectos += len(bloque)
+            ultimo_id = bloque[-1].idproyectos
+            self.stdout.write(f'  {total_proyectos} proyectos procesados...')
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Índice reconstruido: {total_proyectos} proyectos, '
+            f'{total_etiquetas} etiquetas de tecnología'
+        ))
@@ -6,55 +6,81 @@ las solicitudes HTTP y respuestas para análisis y depuración.
 """
 
 import logging
+import random
 import time
-import json
+from collections import Counter
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connection
 from django.utils.deprecation import MiddlewareMixin
 from django.conf import settings
 from django.contrib.auth.models import AnonymousUser
+from blog.services.api_metrics import record_request
+from blog.services.api_usage_log import log_api_usage
 
 logger = logging.getLogger(__name__)
 
-# Detectar si estamos en entorno serverless
-IS_SERVERLESS = getattr(settings, 'IS_VERCEL', False)
+# Códigos de estado por clase (2xx, 3xx, ...) usados para el muestreo
+STATUS_CLASSES = ('1xx', '2xx', '3xx', '4xx', '5xx')
 
 
 class RequestLoggingMiddleware(MiddlewareMixin):
     """
     Middleware para registrar todas las solicitudes HTTP.
     
-    Registra información detallada sobre cada solicitud incluyendo:
+    Emite un único registro por solicitud, al terminarla, con:
     - Método HTTP y URL
+    - Código de estado HTTP
+    - Tiempo de respuesta
     - Usuario autenticado
     - Dirección IP
     - User-Agent
-    - Tiempo de respuesta
-    - Código de estado HTTP    """
+    
+    Los mismos datos viajan como campos estructurados del ``LogRecord``
+    (``http_method``, ``http_path``, ``http_status``, ``duration_ms``,
+    ``user``, ``client_ip``, ``user_agent``) para los formatters JSON.
+    
+    El setting ``REQUEST_LOG_MODE`` controla el volumen:
+    - ``full``: registra todas las solicitudes
+    - ``sampled``: registra una fracción por clase de estado según
+      ``REQUEST_LOG_SAMPLE_RATES`` (por ejemplo 1% de 2xx y todos los 5xx)
+    - ``off``: no registra solicitudes (las excepciones sí)
+    """
+    
+    def __init__(self, get_response=None):
+        super().__init__(get_response)
+        self.mode = getattr(settings, 'REQUEST_LOG_MODE', 'full')
+        rates = getattr(settings, 'REQUEST_LOG_SAMPLE_RATES', {})
+        self.sample_rates = {
+            status_class: float(rates.get(status_class, 1.0))
+            for status_class in STATUS_CLASSES
+        }
     
     def process_request(self, request):
         """
-        Procesa la solicitud entrante y registra información básica.
+        Marca el inicio de la solicitud.
         
         Args:
             request: Objeto HttpRequest de Django
         """
-        request.start_time = time.time()
+        request.start_time_ns = time.perf_counter_ns()
+        return None
+    
+    def should_log(self, status_code):
+        """
+        Decide si se registra una solicitud según el modo y el muestreo.
         
-        # En entornos serverless, limitamos el logging para mejor performance
-        if not IS_SERVERLESS:
-            # Obtener información del cliente
-            user_agent = request.META.get('HTTP_USER_AGENT', 'Unknown')
-            ip_address = self.get_client_ip(request)
-            user = getattr(request, 'user', AnonymousUser())
+        Args:
+            status_code: Código de estado HTTP de la respuesta
             
-            # Registrar solicitud entrante
-            logger.info(
-                f"REQUEST: {request.method} {request.get_full_path()} | "
-                f"User: {user.username if not isinstance(user, AnonymousUser) else 'Anonymous'} | "
-                f"IP: {ip_address} | "
-                f"UA: {user_agent[:100]}"
-            )
-        
-        return None
+        Returns:
+            bool: True si la solicitud debe registrarse
+        """
+        if self.mode == 'off':
+            return False
+        if self.mode != 'sampled':
+            return True
+        rate = self.sample_rates.get(f'{status_code // 100}xx', 1.0)
+        return rate >= 1.0 or (rate > 0.0 and random.random() < rate)
     
     def process_response(self, request, response):
         """
@@ -67,28 +93,45 @@ class RequestLoggingMiddleware(MiddlewareMixin):
         Returns:
             HttpResponse: La respuesta original sin modificar
         """
-        if hasattr(request, 'start_time'):
-            duration = time.time() - request.start_time
-            
-            user = getattr(request, 'user', AnonymousUser())
-            ip_address = self.get_client_ip(request)
-            
-            # Determinar el nivel de log basado en el código de estado
-            log_level = logging.INFO
-            if response.status_code >= 400:
-                log_level = logging.WARNING
-            if response.status_code >= 500:
-                log_level = logging.ERROR
-            
-            # Registrar respuesta
-            logger.log(
-                log_level,
-                f"RESPONSE: {request.method} {request.get_full_path()} | "
-                f"Status: {response.status_code} | "
-                f"Duration: {duration:.3f}s | "
-                f"User: {user.username if not isinstance(user, AnonymousUser) else 'Anonymous'} | "
-                f"IP: {ip_address}"
-            )
+        start_ns = getattr(request, 'start_time_ns', None)
+        if start_ns is None:
+            return response
+        
+        duration_ns = time.perf_counter_ns() - start_ns
+        status_code = response.status_code
+        
+        # Alimentar las métricas agregadas (/api/metrics/)
+        record_request(request, status_code, duration_ns / 1e9)
+        
+        # Determinar el nivel de log basado en el código de estado
+        log_level = logging.INFO
+        if status_code >= 400:
+            log_level = logging.WARNING
+        if status_code >= 500:
+            log_level = logging.ERROR
+        
+        # Los datos del registro solo se calculan si va a emitirse
+        if not self.should_log(status_code) or not logger.isEnabledFor(log_level):
+            return response
+        
+        user = getattr(request, 'user', None)
+        fields = {
+            'http_method': request.method,
+            'http_path': request.get_full_path(),
+            'http_status': status_code,
+            'duration_ms': duration_ns / 1e6,
+            'user': user.username if user is not None and user.is_authenticated else 'Anonymous',
+            'client_ip': self.get_client_ip(request),
+            'user_agent': request.META.get('HTTP_USER_AGENT', 'Unknown')[:100],
+        }
+        logger.log(
+            log_level,
+            "REQUEST: %s %s | Status: %s | Duration: %.1fms | User: %s | IP: %s | UA: %s",
+            fields['http_method'], fields['http_path'], status_code,
+            fields['duration_ms'], fields['user'], fields['client_ip'],
+            fields['user_agent'],
+            extra=fields
+        )
         
         return response
     
@@ -100,15 +143,16 @@ class RequestLoggingMiddleware(MiddlewareMixin):
             request: Objeto HttpRequest de Django
             exception: La excepción que ocurrió
         """
-        user = getattr(request, 'user', AnonymousUser())
-        ip_address = self.get_client_ip(request)
+        user = getattr(request, 'user', None)
         
         logger.error(
-            f"EXCEPTION: {request.method} {request.get_full_path()} | "
-            f"Error: {str(exception)} | "
-            f"Type: {type(exception).__name__} | "
-            f"User: {user.username if not isinstance(user, AnonymousUser) else 'Anonymous'} | "
-            f"IP: {ip_address}",
+            "EXCEPTION: %s %s | Error: %s | Type: %s | User: %s | IP: %s",
+            request.method,
+            request.get_full_path(),
+            exception,
+            type(exception).__name__,
+            user.username if user is not None and user.is_authenticated else 'Anonymous',
+            self.get_client_ip(request),
             exc_info=True
         )
         
@@ -132,17 +176,135 @@ class RequestLoggingMiddleware(MiddlewareMixin):
         return ip
 
 
+class QueryBudgetExceeded(AssertionError):
+    """Se lanza en modo estricto cuando una vista supera su presupuesto de queries."""
+
+
+class QueryCollector:
+    """
+    Wrapper de ejecución que acumula estadísticas de las queries SQL.
+    
+    Se instala con ``connection.execute_wrapper`` y registra, para cada
+    consulta, el tiempo empleado y la plantilla SQL (sin parámetros), lo
+    que permite detectar patrones N+1 repetidos.
+    """
+    
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.templates = Counter()
+    
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - start
+            self.count += 1
+            self.templates[sql] += 1
+    
+    def repeated_templates(self, threshold):
+        """
+        Obtiene las plantillas SQL que se repiten al menos ``threshold`` veces.
+        
+        Args:
+            threshold: Número mínimo de repeticiones
+            
+        Returns:
+            list: Tuplas (sql, repeticiones) ordenadas de mayor a menor
+        """
+        return [
+            (sql, total) for sql, total in self.templates.most_common()
+            if total >= threshold
+        ]
+
+
+class QueryCountMiddleware:
+    """
+    Middleware para medir las queries SQL ejecutadas en cada solicitud.
+    
+    Para cada solicitud:
+    - Agrega los headers ``X-DB-Queries`` (número de queries) y
+      ``X-DB-Time`` (tiempo total en base de datos, en milisegundos)
+    - Registra como posible N+1 toda plantilla SQL repetida al menos
+      ``QUERY_N_PLUS_ONE_THRESHOLD`` veces
+    - Compara el total con el presupuesto ``query_budget`` declarado en el
+      ViewSet (un entero o un dict por acción con clave opcional
+      ``default``); si se supera registra un warning, o lanza
+      ``QueryBudgetExceeded`` cuando ``QUERY_BUDGET_STRICT`` está activo
+      (pensado para la suite de pruebas)
+    
+    Se activa con el setting ``QUERY_INSPECTOR_ENABLED``.
+    """
+    
+    def __init__(self, get_response):
+        if not getattr(settings, 'QUERY_INSPECTOR_ENABLED', False):
+            raise MiddlewareNotUsed()
+        self.get_response = get_response
+        self.n_plus_one_threshold = getattr(settings, 'QUERY_N_PLUS_ONE_THRESHOLD', 5)
+        self.strict = getattr(settings, 'QUERY_BUDGET_STRICT', False)
+    
+    def __call__(self, request):
+        collector = QueryCollector()
+        with connection.execute_wrapper(collector):
+            response = self.get_response(request)
+        
+        response['X-DB-Queries'] = str(collector.count)
+        response['X-DB-Time'] = f"{collector.duration * 1000:.2f}"
+        
+        for sql, total in collector.repeated_templates(self.n_plus_one_threshold):
+            logger.warning(
+                f"POSIBLE N+1: {request.method} {request.path} | "
+                f"{total} ejecuciones de: {sql[:200]}"
+            )
+        
+        budget = getattr(request, 'query_budget', None)
+        if budget is not None and collector.count > budget:
+            message = (
+                f"PRESUPUESTO DE QUERIES EXCEDIDO: {request.method} {request.path} | "
+                f"Queries: {collector.count} | Presupuesto: {budget}"
+            )
+            if self.strict:
+                raise QueryBudgetExceeded(message)
+            logger.warning(message)
+        
+        return response
+    
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        """
+        Resuelve el presupuesto de queries de la vista que atenderá la solicitud.
+        
+        Args:
+            request: Objeto HttpRequest de Django
+            view_func: Vista resuelta (para ViewSets expone ``cls`` y ``actions``)
+            view_args: Argumentos posicionales de la vista
+            view_kwargs: Argumentos nombrados de la vista
+        """
+        view_class = getattr(view_func, 'cls', None)
+        budget = getattr(view_class, 'query_budget', None)
+        
+        if isinstance(budget, dict):
+            actions = getattr(view_func, 'actions', None) or {}
+            action = actions.get(request.method.lower())
+            budget = budget.get(action, budget.get('default'))
+        
+        request.query_budget = budget
+        return None
+
+
 class APIUsageMiddleware(MiddlewareMixin):
     """
     Middleware para monitorear el uso de la API.
     
     Registra estadísticas de uso de endpoints específicos
-    para análisis de rendimiento y patrones de uso.
+    para análisis de rendimiento y patrones de uso. Los registros se
+    encolan en un buffer en memoria y se escriben por lotes desde un hilo
+    en segundo plano (ver ``blog.services.api_usage_log``).
     """
     
     def process_response(self, request, response):
         """
-        Procesa la respuesta y registra estadísticas de uso de API.
+        Procesa la respuesta y encola estadísticas de uso de API.
         
         Args:
             request: Objeto HttpRequest de Django
@@ -155,21 +317,21 @@ class APIUsageMiddleware(MiddlewareMixin):
         if request.path.startswith('/api/'):
             user = getattr(request, 'user', AnonymousUser())
             
-            # Registrar uso de API
-            api_logger = logging.getLogger('api_usage')
-            api_logger.info(
-                json.dumps({
-                    'timestamp': time.time(),
-                    'method': request.method,
-                    'endpoint': request.path,
-                    'status_code': response.status_code,
-                    'user': user.username if not isinstance(user, AnonymousUser) else 'anonymous',
-                    'user_agent': request.META.get('HTTP_USER_AGENT', ''),
-                    'ip_address': self.get_client_ip(request),
-                    'query_params': dict(request.GET),
-                    'content_length': len(response.content) if hasattr(response, 'content') else 0
-                })
-            )
+            # El tamaño sale del header (CommonMiddleware lo fija en las
+            # respuestas normales) para no materializar respuestas en streaming
+            content_length = response.get('Content-Length')
+            
+            log_api_usage({
+                'timestamp': time.time(),
+                'method': request.method,
+                'endpoint': request.path,
+                'status_code': response.status_code,
+                'user': user.username if not isinstance(user, AnonymousUser) else 'anonymous',
+                'user_agent': request.META.get('HTTP_USER_AGENT', ''),
+                'ip_address': self.get_client_ip(request),
+                'query_params': dict(request.GET),
+                'content_length': int(content_length) if content_length else None
+            })
         
         return response
     
@@ -212,8 +374,9 @@ class SecurityHeadersMiddleware(MiddlewareMixin):
         if not settings.DEBUG:
             response['Strict-Transport-Security'] = 'max-age=31536000; includeSubDomains'
         
-        # Headers específicos para API
-        if request.path.startswith('/api/'):
+        # Headers específicos para API (respetando las vistas que definen
+        # su propia política de caché, por ejemplo con ETag)
+        if request.path.startswith('/api/') and not response.has_header('Cache-Control'):
             response['Cache-Control'] = 'no-cache, no-store, must-revalidate'
             response['Pragma'] = 'no-cache'
             response['Expires'] = '0'
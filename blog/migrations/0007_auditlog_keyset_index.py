@@ -0,0 +1,17 @@
+# Generated by Django 5.1.5 on 2026-10-18 09:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0006_fix_auditlog_user_delete'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='auditlog',
+            index=models.Index(fields=['-timestamp', '-id'], name='blog_auditlog_ts_id_idx'),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.1.5 on 2026-10-18 10:00
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0007_auditlog_keyset_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProyectoTecnologia',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('tecnologia', models.CharField(help_text='Tecnología mencionada en la descripción (en minúsculas)', max_length=40)),
+                ('proyecto', models.ForeignKey(help_text='Proyecto que menciona la tecnología', on_delete=django.db.models.deletion.CASCADE, related_name='tecnologias', to='blog.proyectos')),
+            ],
+            options={
+                'verbose_name': 'Tecnología de Proyecto',
+                'verbose_name_plural': 'Tecnologías de Proyectos',
+                'indexes': [models.Index(fields=['tecnologia', 'proyecto'], name='blog_proytec_tec_proy_idx')],
+                'constraints': [models.UniqueConstraint(fields=('proyecto', 'tecnologia'), name='blog_proyectotecnologia_unica')],
+            },
+        ),
+    ]
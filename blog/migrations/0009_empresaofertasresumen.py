@@ -0,0 +1,41 @@
+# Generated by Django 5.1.5 on 2026-10-18 11:00
+
+from django.db import migrations, models
+
+
+def poblar_resumen(apps, schema_editor):
+    """Llena el resumen con las ofertas existentes."""
+    OfertasEmpleo = apps.get_model('blog', 'OfertasEmpleo')
+    EmpresaOfertasResumen = apps.get_model('blog', 'EmpresaOfertasResumen')
+    filas = (OfertasEmpleo.objects
+             .values('empresa')
+             .annotate(total=models.Count('idoferta')))
+    EmpresaOfertasResumen.objects.bulk_create([
+        EmpresaOfertasResumen(empresa=fila['empresa'], total_ofertas=fila['total'])
+        for fila in filas
+    ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0008_proyectotecnologia'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EmpresaOfertasResumen',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('empresa', models.CharField(help_text='Nombre de la empresa', max_length=230, unique=True)),
+                ('total_ofertas', models.PositiveIntegerField(default=0, help_text='Número de ofertas de la empresa')),
+                ('actualizado', models.DateTimeField(auto_now=True, help_text='Fecha y hora de la última actualización')),
+            ],
+            options={
+                'verbose_name': 'Resumen de Ofertas por Empresa',
+                'verbose_name_plural': 'Resúmenes de Ofertas por Empresa',
+                'indexes': [models.Index(fields=['-total_ofertas', 'empresa'], name='blog_empresa_total_idx')],
+            },
+        ),
+        migrations.RunPython(poblar_resumen, migrations.RunPython.noop),
+    ]
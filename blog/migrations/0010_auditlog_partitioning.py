@@ -0,0 +1,100 @@
+# Generated by Django 5.1.5 on 2026-10-18 12:00
+
+from datetime import datetime, timezone as dt_timezone
+from django.conf import settings
+from django.db import migrations
+from django.utils import timezone
+
+TABLE = 'blog_auditlog'
+LEGACY = 'blog_auditlog_legacy'
+
+
+def _add_months(month, months):
+    index = month.year * 12 + month.month - 1 + months
+    return datetime(index // 12, index % 12 + 1, 1, tzinfo=dt_timezone.utc)
+
+
+def _month_start(value):
+    value = value.astimezone(dt_timezone.utc)
+    return datetime(value.year, value.month, 1, tzinfo=dt_timezone.utc)
+
+
+def particionar_auditlog(apps, schema_editor):
+    """
+    Convierte blog_auditlog en una tabla particionada por mes.
+
+    Se crea la tabla particionada con las mismas columnas, una partición
+    por cada mes con logs (hasta AUDIT_PARTITION_MONTHS_AHEAD meses por
+    adelantado) y la partición por defecto; se copian los logs
+    conservando sus ids y se recrean la llave primaria (id, timestamp),
+    la llave foránea a auth_user y los índices del modelo.
+    """
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+
+    AuditLog = apps.get_model('blog', 'AuditLog')
+    execute = schema_editor.execute
+    cursor = schema_editor.connection.cursor()
+
+    execute(f'ALTER TABLE {TABLE} RENAME TO {LEGACY}')
+    execute(
+        f'CREATE TABLE {TABLE} (LIKE {LEGACY} INCLUDING DEFAULTS INCLUDING IDENTITY) '
+        f'PARTITION BY RANGE (timestamp)'
+    )
+    execute(f'CREATE TABLE {TABLE}_default PARTITION OF {TABLE} DEFAULT')
+
+    cursor.execute(f'SELECT MIN(timestamp) FROM {LEGACY}')
+    primero = cursor.fetchone()[0]
+    actual = _month_start(timezone.now())
+    ultimo = _add_months(actual, getattr(settings, 'AUDIT_PARTITION_MONTHS_AHEAD', 3))
+    mes = _month_start(primero) if primero else actual
+    while mes <= ultimo:
+        execute(
+            f'CREATE TABLE {TABLE}_p{mes:%Y%m} PARTITION OF {TABLE} '
+            f'FOR VALUES FROM (%s) TO (%s)',
+            [mes, _add_months(mes, 1)]
+        )
+        mes = _add_months(mes, 1)
+
+    execute(f'INSERT INTO {TABLE} OVERRIDING SYSTEM VALUE SELECT * FROM {LEGACY}')
+
+    # El id puede ser IDENTITY (copiada con una secuencia nueva) o serial
+    # (cuya secuencia pertenece a la tabla anterior)
+    cursor.execute(
+        'SELECT attidentity FROM pg_attribute '
+        'WHERE attrelid = %s::regclass AND attname = %s',
+        [TABLE, 'id']
+    )
+    if cursor.fetchone()[0]:
+        execute(
+            f"SELECT setval(pg_get_serial_sequence('{TABLE}', 'id'), "
+            f"COALESCE(MAX(id), 1), MAX(id) IS NOT NULL) FROM {TABLE}"
+        )
+    else:
+        cursor.execute("SELECT pg_get_serial_sequence(%s, 'id')", [LEGACY])
+        secuencia = cursor.fetchone()[0]
+        if secuencia:
+            execute(f'ALTER SEQUENCE {secuencia} OWNED BY {TABLE}.id')
+
+    execute(f'DROP TABLE {LEGACY}')
+
+    # La llave primaria de una tabla particionada debe incluir la columna
+    # de partición; id sigue siendo único porque sale de la secuencia
+    execute(f'ALTER TABLE {TABLE} ADD CONSTRAINT {TABLE}_pkey PRIMARY KEY (id, timestamp)')
+    user_field = AuditLog._meta.get_field('user')
+    execute(schema_editor._create_fk_sql(AuditLog, user_field, '_fk_%(to_table)s_%(to_column)s'))
+    for index in AuditLog._meta.indexes:
+        schema_editor.add_index(AuditLog, index)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0009_empresaofertasresumen'),
+    ]
+
+    operations = [
+        # Sin reversa: la tabla particionada es compatible con el modelo,
+        # por lo que revertir la migración la deja particionada
+        migrations.RunPython(particionar_auditlog, migrations.RunPython.noop),
+    ]
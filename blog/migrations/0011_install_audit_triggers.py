@@ -0,0 +1,16 @@
+# Generated by Django 5.1.5 on 2026-10-18 13:00
+
+from django.db import migrations
+
+import blog.operations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0010_auditlog_partitioning'),
+    ]
+
+    operations = [
+        blog.operations.InstallAuditTriggers(version=1),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.1.5 on 2026-10-18 14:00
+
+from django.db import migrations
+
+import blog.operations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0011_install_audit_triggers'),
+    ]
+
+    operations = [
+        # Triggers v2: payloads de UPDATE solo con las columnas modificadas
+        blog.operations.InstallAuditTriggers(version=2),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.1.5 on 2026-10-18 15:00
+
+import django.core.serializers.json
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0012_audit_triggers_diff_payloads'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='auditlog',
+            name='timestamp',
+            field=models.DateTimeField(default=django.utils.timezone.now, editable=False, help_text='Fecha y hora de la operación'),
+        ),
+        migrations.CreateModel(
+            name='AuditOutbox',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('created', models.DateTimeField(default=django.utils.timezone.now, help_text='Momento en que se produjo el cambio')),
+                ('user_id', models.IntegerField(blank=True, help_text='ID del usuario que realizó la operación', null=True)),
+                ('table_name', models.CharField(help_text='Nombre de la tabla de base de datos afectada', max_length=255)),
+                ('change_type', models.CharField(help_text='Tipo de operación realizada', max_length=6)),
+                ('affected_record_id', models.IntegerField(blank=True, help_text='ID del registro afectado por la operación', null=True)),
+                ('modified_data', models.JSONField(blank=True, encoder=django.core.serializers.json.DjangoJSONEncoder, help_text='Datos modificados en formato JSON', null=True)),
+            ],
+            options={
+                'verbose_name': 'Cambio Pendiente de Auditoría',
+                'verbose_name_plural': 'Cambios Pendientes de Auditoría',
+            },
+        ),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 5.1.5 on 2026-10-18 16:00
+
+import django.contrib.postgres.indexes
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0013_auditoutbox'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='auditlog',
+            index=django.contrib.postgres.indexes.BrinIndex(fields=['timestamp'], name='blog_auditlog_ts_brin'),
+        ),
+        migrations.AddIndex(
+            model_name='auditlog',
+            index=models.Index(fields=['table_name', 'change_type', '-timestamp'], name='blog_auditlog_tbl_type_ts_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='auditlog',
+            index=models.Index(fields=['user', '-timestamp'], name='blog_auditlog_user_ts_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='auditlog',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['modified_data'], name='blog_auditlog_data_gin', opclasses=['jsonb_path_ops']),
+        ),
+        # Los índices de una sola columna quedan cubiertos por los anteriores
+        migrations.RemoveIndex(
+            model_name='auditlog',
+            name='blog_auditl_timesta_502cf4_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='auditlog',
+            name='blog_auditl_user_id_9f88c2_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='auditlog',
+            name='blog_auditl_table_n_6ce630_idx',
+        ),
+        migrations.AlterField(
+            model_name='auditlog',
+            name='user',
+            field=models.ForeignKey(blank=True, db_index=False, help_text='Usuario que realizó la operación (NULL si el usuario fue eliminado)', null=True, on_delete=django.db.models.deletion.SET_NULL, to=settings.AUTH_USER_MODEL),
+        ),
+    ]
@@ -0,0 +1,92 @@
+"""
+Operaciones de migración propias de la app blog.
+"""
+
+from django.conf import settings
+from django.db.migrations.operations.base import Operation
+import logging
+
+from blog.services import audit_triggers
+
+logger = logging.getLogger(__name__)
+
+
+class InstallAuditTriggers(Operation):
+    """
+    Instala una versión congelada de los triggers de auditoría (ver
+    ``blog.services.audit_triggers``) sobre los modelos auditados del
+    estado de la migración.
+
+    Se agrega una migración con ``InstallAuditTriggers(version=n)`` por
+    cada versión nueva del SQL; al revertirla se reinstala la versión
+    ``n - 1`` (la versión 1 elimina los triggers). Solo aplica en
+    PostgreSQL y con ``AUDIT_MODE = 'trigger'``: con otro modo la
+    instalación se omite con un aviso (solo se eliminan los triggers por
+    fila heredados) y los triggers se gestionan con
+    ``manage.py audit_triggers --aplicar-modo``.
+
+    Args:
+        version: Versión del SQL de ``audit_triggers`` a instalar
+    """
+
+    reversible = True
+    reduces_to_sql = True
+
+    def __init__(self, version):
+        self.version = version
+
+    def deconstruct(self):
+        return self.__class__.__qualname__, [], {'version': self.version}
+
+    def state_forwards(self, app_label, state):
+        pass
+
+    def _trigger_mode(self):
+        modo = getattr(settings, 'AUDIT_MODE', 'trigger')
+        if modo != 'trigger':
+            logger.warning(
+                f"AUDIT_MODE={modo}: se omite la instalación de los triggers de "
+                f"auditoría v{self.version}"
+            )
+            return False
+        return True
+
+    def _install(self, version, schema_editor, state):
+        models = audit_triggers.get_audited_models(state.apps)
+        for statement in audit_triggers.build_install_sql(
+            models, schema_editor.quote_name, version
+        ):
+            schema_editor.execute(statement)
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor != 'postgresql':
+            return
+        if self._trigger_mode():
+            self._install(self.version, schema_editor, to_state)
+            return
+        # Sin triggers generados, los heredados de los scripts anteriores
+        # duplicarían los logs de la auditoría en la aplicación
+        models = audit_triggers.get_audited_models(to_state.apps)
+        for statement in audit_triggers.build_legacy_uninstall_sql(models, schema_editor.quote_name):
+            schema_editor.execute(statement)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor != 'postgresql':
+            return
+        if self.version > 1:
+            if self._trigger_mode():
+                self._install(self.version - 1, schema_editor, to_state)
+            return
+        models = audit_triggers.get_audited_models(from_state.apps)
+        for statement in audit_triggers.build_uninstall_sql(models, schema_editor.quote_name):
+            schema_editor.execute(statement)
+
+    def describe(self):
+        return (
+            f'Install blog audit triggers v{self.version} '
+            f'(only drops legacy triggers unless AUDIT_MODE is "trigger")'
+        )
+
+    @property
+    def migration_name_fragment(self):
+        return f'install_audit_triggers_v{self.version}'
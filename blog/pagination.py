@@ -5,20 +5,277 @@ Este módulo define diferentes tipos de paginación para optimizar
 la respuesta de la API según el tipo de contenido.
 """
 
-from rest_framework.pagination import PageNumberPagination
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from django.conf import settings
+from django.core.cache import caches
+from django.core.exceptions import EmptyResultSet
+from django.core.paginator import InvalidPage, Paginator
+from django.db import connection
+from django.db.models import Q
+from django.utils.functional import cached_property
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
 from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+import hashlib
+import json
+import logging
 
+logger = logging.getLogger(__name__)
 
-class StandardResultsSetPagination(PageNumberPagination):
+# Estrategias de conteo disponibles
+COUNT_EXACT = 'exact'
+COUNT_CACHED = 'cached'
+COUNT_ESTIMATED = 'estimated'
+
+
+def estimate_table_rows(model):
     """
-    Paginación estándar para la mayoría de endpoints.
+    Número aproximado de filas de la tabla de un modelo.
     
-    Proporciona 20 elementos por página con información adicional
-    sobre la paginación en la respuesta.
+    Lee ``pg_class.reltuples`` (actualizado por ``ANALYZE``/autovacuum),
+    sin recorrer la tabla. Autovacuum no analiza las tablas particionadas
+    (su ``reltuples`` queda en -1), por lo que en ellas se suman las
+    estimaciones de las particiones.
+    
+    Args:
+        model: Modelo de Django
+    
+    Returns:
+        int | None: Estimación, o None si el motor no es PostgreSQL o la
+        tabla aún no tiene estadísticas
     """
-    page_size = 20
-    page_size_query_param = 'page_size'
-    max_page_size = 100
+    if connection.vendor != 'postgresql':
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT CASE WHEN parent.relkind = 'p' THEN (
+                       SELECT SUM(child.reltuples)
+                       FROM pg_inherits
+                       JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+                       WHERE pg_inherits.inhparent = parent.oid
+                         AND child.reltuples >= 0
+                   ) ELSE parent.reltuples END::bigint
+            FROM pg_class parent
+            WHERE parent.oid = %s::regclass
+            """,
+            [model._meta.db_table]
+        )
+        row = cursor.fetchone()
+    if not row or row[0] is None or row[0] < 0:
+        return None
+    return row[0]
+
+
+class CountStrategyPaginator(Paginator):
+    """
+    Paginator de Django con estrategia de conteo configurable.
+    
+    - ``exact``: ``COUNT(*)`` en cada solicitud (comportamiento de Django)
+    - ``cached``: el conteo se guarda en caché por hash de la consulta
+      filtrada durante ``cache_timeout`` segundos
+    - ``estimated``: usa la estimación del planificador de PostgreSQL y solo
+      hace ``COUNT(*)`` cuando la estimación está por debajo del umbral
+    """
+    
+    def __init__(self, object_list, per_page, strategy=COUNT_EXACT,
+                 cache_timeout=60, estimate_threshold=10000, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self.strategy = strategy
+        self.cache_timeout = cache_timeout
+        self.estimate_threshold = estimate_threshold
+        self.count_is_estimate = False
+    
+    @cached_property
+    def count(self):
+        """Número total de objetos según la estrategia configurada."""
+        if self.strategy == COUNT_CACHED:
+            return self._cached_count()
+        if self.strategy == COUNT_ESTIMATED:
+            estimate = self._planner_estimate()
+            if estimate is not None and estimate >= self.estimate_threshold:
+                self.count_is_estimate = True
+                return estimate
+        return super().count
+    
+    def _cached_count(self):
+        """Conteo exacto guardado en caché por hash del SQL y sus parámetros."""
+        try:
+            sql, params = self.object_list.query.sql_with_params()
+        except EmptyResultSet:
+            # Filtros que no pueden coincidir (``.none()``, ``__in=[]``)
+            return 0
+        digest = hashlib.md5(
+            repr((sql, params)).encode('utf-8'), usedforsecurity=False
+        ).hexdigest()
+        key = f'blog:count:{digest}'
+        
+        cache = caches[getattr(settings, 'PAGINATION_COUNT_CACHE_ALIAS', 'default')]
+        total = cache.get(key)
+        if total is None:
+            total = self.object_list.count()
+            cache.set(key, total, self.cache_timeout)
+        return total
+    
+    def _planner_estimate(self):
+        """
+        Filas estimadas por el planificador para la consulta filtrada.
+        
+        Returns:
+            int | None: Estimación, o None si el motor no es PostgreSQL
+        """
+        if connection.vendor != 'postgresql':
+            return None
+        try:
+            plan = json.loads(self.object_list.order_by().explain(format='json'))
+            return int(plan[0]['Plan']['Plan Rows'])
+        except Exception as e:
+            logger.warning(f"No se pudo estimar el conteo: {str(e)}")
+            return None
+
+
+class UncountedPage:
+    """
+    Página sin conteo total, usada con ``?count=false`` y cuando el total
+    es una estimación.
+    
+    Se lee una fila adicional para saber si existe una página siguiente.
+    """
+    
+    def __init__(self, object_list, number, has_next):
+        self.object_list = object_list
+        self.number = number
+        self._has_next = has_next
+    
+    def __iter__(self):
+        return iter(self.object_list)
+    
+    def __len__(self):
+        return len(self.object_list)
+    
+    def has_next(self):
+        return self._has_next
+    
+    def has_previous(self):
+        return self.number > 1
+    
+    def next_page_number(self):
+        return self.number + 1
+    
+    def previous_page_number(self):
+        return self.number - 1
+
+
+class BaseResultsSetPagination(PageNumberPagination):
+    """
+    Base de la paginación por número de página del blog.
+    
+    Centraliza la respuesta con metadatos y la estrategia de conteo
+    (``count_strategy``). El cliente puede omitir el total con
+    ``?count=false``; en ese caso ``count`` y ``total_pages`` son null y
+    no se ejecuta ningún ``COUNT(*)``.
+    """
+    count_strategy = COUNT_EXACT
+    count_query_param = 'count'
+    
+    def get_count_cache_timeout(self):
+        """TTL (segundos) del conteo en caché."""
+        return getattr(settings, 'PAGINATION_COUNT_CACHE_TIMEOUT', 60)
+    
+    def get_count_estimate_threshold(self):
+        """Filas estimadas a partir de las cuales se usa la estimación."""
+        return getattr(settings, 'PAGINATION_COUNT_ESTIMATE_THRESHOLD', 10000)
+    
+    def count_requested(self, request):
+        """Indica si el cliente quiere el total de resultados."""
+        return request.query_params.get(self.count_query_param, 'true').lower() != 'false'
+    
+    def paginate_queryset(self, queryset, request, view=None):
+        """
+        Pagina el queryset aplicando la estrategia de conteo.
+        
+        Args:
+            queryset: Queryset ya filtrado
+            request: Solicitud actual
+            view: Vista que pagina
+            
+        Returns:
+            list | None: Objetos de la página o None si no hay paginación
+        """
+        self.request = request
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+        
+        self.with_count = self.count_requested(request)
+        if not self.with_count:
+            return self._paginate_without_count(queryset, page_size, request)
+        
+        strategy = self.count_strategy
+        if (strategy == COUNT_ESTIMATED
+                and request.query_params.get(self.page_query_param) in self.last_page_strings):
+            # La última página solo se puede ubicar con el total exacto
+            strategy = COUNT_EXACT
+        
+        paginator = CountStrategyPaginator(
+            queryset,
+            page_size,
+            strategy=strategy,
+            cache_timeout=self.get_count_cache_timeout(),
+            estimate_threshold=self.get_count_estimate_threshold()
+        )
+        
+        if paginator.count and paginator.count_is_estimate:
+            # El número de página no se valida contra num_pages de la
+            # estimación (podría rechazar páginas reales o aceptar páginas
+            # vacías): la página se lee como sin conteo y el total estimado
+            # queda solo como metadato
+            self.page = self._get_uncounted_page(queryset, page_size, request)
+            self.page.paginator = paginator
+            return list(self.page)
+        
+        page_number = self.get_page_number(request, paginator)
+        
+        try:
+            self.page = paginator.page(page_number)
+        except InvalidPage as exc:
+            msg = self.invalid_page_message.format(
+                page_number=page_number, message=str(exc)
+            )
+            raise NotFound(msg)
+        
+        if paginator.num_pages > 1 and self.template is not None:
+            self.display_page_controls = True
+        
+        return list(self.page)
+    
+    def _paginate_without_count(self, queryset, page_size, request):
+        """Pagina sin ``COUNT(*)`` leyendo ``page_size + 1`` filas."""
+        self.page = self._get_uncounted_page(queryset, page_size, request)
+        return list(self.page)
+    
+    def _get_uncounted_page(self, queryset, page_size, request):
+        """
+        Lee la página solicitada y una fila adicional para saber si existe
+        una página siguiente.
+        
+        Returns:
+            UncountedPage: Página sin total
+        """
+        try:
+            page_number = int(request.query_params.get(self.page_query_param) or 1)
+            if page_number < 1:
+                raise ValueError
+        except ValueError:
+            raise NotFound(self.invalid_page_message.format(
+                page_number=request.query_params.get(self.page_query_param),
+                message='Número de página inválido'
+            ))
+        
+        offset = (page_number - 1) * page_size
+        rows = list(queryset[offset:offset + page_size + 1])
+        return UncountedPage(rows[:page_size], page_number, len(rows) > page_size)
     
     def get_paginated_response(self, data):
         """
@@ -30,45 +287,59 @@ class StandardResultsSetPagination(PageNumberPagination):
         Returns:
             Response: Respuesta con datos y metadatos de paginación
         """
+        if self.with_count:
+            paginator = self.page.paginator
+            count = paginator.count
+            total_pages = paginator.num_pages
+            count_is_estimate = paginator.count_is_estimate
+        else:
+            count = total_pages = None
+            count_is_estimate = False
+        
         return Response({
             'pagination': {
                 'next': self.get_next_link(),
                 'previous': self.get_previous_link(),
-                'count': self.page.paginator.count,
+                'count': count,
+                'count_is_estimate': count_is_estimate,
                 'current_page': self.page.number,
-                'total_pages': self.page.paginator.num_pages,
+                'total_pages': total_pages,
                 'page_size': self.get_page_size(self.request)
             },
             'results': data
         })
 
 
-class LargeResultsSetPagination(PageNumberPagination):
+class StandardResultsSetPagination(BaseResultsSetPagination):
+    """
+    Paginación estándar para la mayoría de endpoints.
+    
+    Proporciona 20 elementos por página con información adicional
+    sobre la paginación en la respuesta. El total se guarda en caché
+    por combinación de filtros, ya que los filtros ``icontains`` hacen
+    que el conteo cueste tanto como la propia página.
+    """
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    count_strategy = COUNT_CACHED
+
+
+class LargeResultsSetPagination(BaseResultsSetPagination):
     """
     Paginación para conjuntos grandes de datos.
     
     Útil para endpoints que manejan grandes volúmenes de información
-    como logs de auditoría o históricos.
+    como logs de auditoría o históricos. Por encima del umbral usa la
+    estimación del planificador en lugar de ``COUNT(*)``.
     """
     page_size = 50
     page_size_query_param = 'page_size'
     max_page_size = 200
-    
-    def get_paginated_response(self, data):
-        return Response({
-            'pagination': {
-                'next': self.get_next_link(),
-                'previous': self.get_previous_link(),
-                'count': self.page.paginator.count,
-                'current_page': self.page.number,
-                'total_pages': self.page.paginator.num_pages,
-                'page_size': self.get_page_size(self.request)
-            },
-            'results': data
-        })
+    count_strategy = COUNT_ESTIMATED
 
 
-class SmallResultsSetPagination(PageNumberPagination):
+class SmallResultsSetPagination(BaseResultsSetPagination):
     """
     Paginación para conjuntos pequeños de datos.
     
@@ -78,16 +349,211 @@ class SmallResultsSetPagination(PageNumberPagination):
     page_size = 10
     page_size_query_param = 'page_size'
     max_page_size = 50
+
+
+class KeysetPagination(BasePagination):
+    """
+    Paginación por keyset (cursor) para tablas grandes ordenadas por tiempo.
+    
+    En lugar de ``OFFSET`` y ``COUNT(*)`` filtra por la última clave vista,
+    por ejemplo ``(timestamp, id) < (t, i)``, de modo que cada página cuesta
+    lo mismo sin importar su profundidad y aprovecha el índice compuesto.
+    
+    Los cursores son opacos (base64) y permiten navegar hacia adelante y
+    hacia atrás. Con ``?total=aprox`` se incluye un total aproximado
+    tomado de las estadísticas del planificador (``pg_class.reltuples``).
+    
+    Attributes:
+        ordering (tuple): Campos de ordenamiento; el último debe ser único
+    """
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 200
+    cursor_query_param = 'cursor'
+    ordering = ('-timestamp', '-id')
+    invalid_cursor_message = 'Cursor inválido'
+    
+    def __init__(self, ordering=None):
+        if ordering:
+            self.ordering = tuple(ordering)
+    
+    def paginate_queryset(self, queryset, request, view=None):
+        """
+        Retorna la página correspondiente al cursor de la solicitud.
+        
+        Args:
+            queryset: Queryset ya filtrado
+            request: Solicitud actual
+            view: Vista que pagina
+            
+        Returns:
+            list: Objetos de la página
+        """
+        self.request = request
+        self.queryset = queryset
+        self.page_size = self.get_page_size(request)
+        self.fields = [self._field_name(item) for item in self.ordering]
+        
+        values, self.reverse = self.decode_cursor(request)
+        ordering = self._invert(self.ordering) if self.reverse else self.ordering
+        
+        queryset = queryset.order_by(*ordering)
+        if values is not None:
+            queryset = queryset.filter(self._keyset_filter(ordering, values))
+        
+        results = list(queryset[:self.page_size + 1])
+        self.has_more = len(results) > self.page_size
+        self.page = results[:self.page_size]
+        self.has_cursor = values is not None
+        
+        if self.reverse:
+            self.page.reverse()
+        
+        return self.page
     
     def get_paginated_response(self, data):
+        """
+        Respuesta con metadatos de paginación por cursor.
+        
+        Args:
+            data: Datos serializados de la página actual
+            
+        Returns:
+            Response: Respuesta con datos y metadatos de paginación
+        """
+        pagination = {
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'page_size': self.page_size
+        }
+        if self.request.query_params.get('total') == 'aprox':
+            pagination['count_aproximado'] = self.get_estimated_count()
+        
         return Response({
-            'pagination': {
-                'next': self.get_next_link(),
-                'previous': self.get_previous_link(),
-                'count': self.page.paginator.count,
-                'current_page': self.page.number,
-                'total_pages': self.page.paginator.num_pages,
-                'page_size': self.get_page_size(self.request)
-            },
+            'pagination': pagination,
             'results': data
         })
+    
+    def get_page_size(self, request):
+        """Obtiene el tamaño de página solicitado respetando el máximo."""
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return max(1, min(size, self.max_page_size))
+    
+    def get_next_link(self):
+        """Link a la página siguiente (más antigua en orden descendente)."""
+        if not self.page:
+            return None
+        if self.reverse or self.has_more:
+            return self.encode_cursor(self.page[-1], reverse=False)
+        return None
+    
+    def get_previous_link(self):
+        """Link a la página anterior."""
+        if not self.page:
+            return None
+        if (self.reverse and self.has_more) or (not self.reverse and self.has_cursor):
+            return self.encode_cursor(self.page[0], reverse=True)
+        return None
+    
+    def get_estimated_count(self):
+        """
+        Total aproximado de filas de la tabla según el planificador.
+        
+        Refleja la tabla completa, no los filtros aplicados.
+        
+        Returns:
+            int | None: Estimación o None si no está disponible
+        """
+        return estimate_table_rows(self.queryset.model)
+    
+    def encode_cursor(self, obj, reverse):
+        """
+        Codifica la clave del objeto como cursor opaco.
+        
+        Args:
+            obj: Objeto de referencia (primero o último de la página)
+            reverse: True para navegar hacia atrás
+            
+        Returns:
+            str: URL con el parámetro cursor
+        """
+        values = [
+            self.queryset.model._meta.get_field(name).value_to_string(obj)
+            for name in self.fields
+        ]
+        payload = json.dumps({'v': values, 'r': int(reverse)}, separators=(',', ':'))
+        token = urlsafe_b64encode(payload.encode('utf-8')).decode('ascii')
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, token)
+    
+    def decode_cursor(self, request):
+        """
+        Decodifica el cursor de la solicitud.
+        
+        Returns:
+            tuple: (valores de la clave o None, navegación hacia atrás)
+        """
+        token = request.query_params.get(self.cursor_query_param)
+        if not token:
+            return None, False
+        try:
+            payload = json.loads(urlsafe_b64decode(token.encode('ascii')))
+            raw_values = payload['v']
+            if len(raw_values) != len(self.fields):
+                raise ValueError
+            values = [
+                self.queryset.model._meta.get_field(name).to_python(value)
+                for name, value in zip(self.fields, raw_values)
+            ]
+            return values, bool(payload.get('r'))
+        except Exception:
+            raise NotFound(self.invalid_cursor_message)
+    
+    def get_schema_operation_parameters(self, view):
+        """Parámetros para la documentación OpenAPI."""
+        return [
+            {
+                'name': self.cursor_query_param,
+                'required': False,
+                'in': 'query',
+                'description': 'Cursor opaco de la página',
+                'schema': {'type': 'string'},
+            },
+            {
+                'name': self.page_size_query_param,
+                'required': False,
+                'in': 'query',
+                'description': 'Número de resultados por página',
+                'schema': {'type': 'integer'},
+            },
+        ]
+    
+    def _keyset_filter(self, ordering, values):
+        """
+        Construye la condición lexicográfica "después de la clave".
+        
+        Para ``('-timestamp', '-id')`` y valores ``(t, i)`` genera
+        ``timestamp < t OR (timestamp = t AND id < i)``.
+        """
+        condition = Q()
+        equal = Q()
+        for item, value in zip(ordering, values):
+            name = self._field_name(item)
+            lookup = 'lt' if item.startswith('-') else 'gt'
+            condition |= equal & Q(**{f'{name}__{lookup}': value})
+            equal &= Q(**{name: value})
+        return condition
+    
+    @staticmethod
+    def _field_name(item):
+        return item.lstrip('-')
+    
+    @staticmethod
+    def _invert(ordering):
+        return tuple(
+            item[1:] if item.startswith('-') else f'-{item}'
+            for item in ordering
+        )
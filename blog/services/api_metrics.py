@@ -0,0 +1,323 @@
+"""
+Métricas agregadas de la API (contadores e histogramas de latencia).
+
+``RequestLoggingMiddleware`` reporta cada solicitud con su ruta resuelta
+(``view_name`` de la URL, no el path crudo), método, código de estado y
+duración. Aquí se agregan en:
+
+- un contador de solicitudes por ruta, método y código de estado
+- un histograma de latencia por ruta y método con buckets log-lineales
+  (estilo HDR: error relativo acotado en todo el rango)
+
+Con ``API_METRICS_REDIS_URL`` configurado, cada worker acumula en memoria
+y un hilo en segundo plano suma sus deltas en un hash de Redis
+(``<CACHE_KEY_PREFIX>:blog:metrics``) cada ``API_METRICS_FLUSH_INTERVAL``
+segundos, de modo que todos los workers de gunicorn comparten los mismos
+totales sin que una solicitud espere a Redis. Sin Redis las métricas son
+por proceso, y si Redis deja de responder ``/api/metrics/`` muestra los
+totales locales pendientes de envío en lugar de fallar.
+
+``render_prometheus`` produce el formato de texto de Prometheus que expone
+el endpoint ``/api/metrics/``.
+"""
+
+from bisect import bisect_left
+from collections import defaultdict
+from django.conf import settings
+import atexit
+import logging
+import os
+import threading
+
+logger = logging.getLogger(__name__)
+
+REDIS_KEY = 'blog:metrics'
+UNMATCHED_ROUTE = 'unmatched'
+
+# Límites superiores de los buckets en milisegundos: 10 sub-buckets por
+# década entre 1 ms y 10 s (error relativo máximo del 25%)
+_SUB_BUCKETS = (1, 1.25, 1.5, 2, 2.5, 3, 4, 5, 6, 8)
+LATENCY_BUCKETS_MS = tuple(
+    round(base * step, 2)
+    for base in (1, 10, 100, 1000)
+    for step in _SUB_BUCKETS
+) + (10000,)
+
+
+def bucket_index(duration_ms):
+    """
+    Índice del bucket de latencia que corresponde a una duración.
+
+    Args:
+        duration_ms: Duración en milisegundos
+
+    Returns:
+        int: Índice en ``LATENCY_BUCKETS_MS``; ``len(LATENCY_BUCKETS_MS)``
+        representa el bucket ``+Inf``
+    """
+    return bisect_left(LATENCY_BUCKETS_MS, duration_ms)
+
+
+class MetricsSnapshot:
+    """
+    Acumulador de métricas en memoria.
+
+    ``requests`` se indexa por ``(ruta, método, estado)`` y ``latency`` por
+    ``(ruta, método)`` con una lista ``[count, sum_ms, bucket_0, ...]``.
+    """
+
+    def __init__(self):
+        self.requests = defaultdict(int)
+        self.latency = defaultdict(lambda: [0, 0.0] + [0] * (len(LATENCY_BUCKETS_MS) + 1))
+
+    def observe(self, route, method, status, duration_ms):
+        self.requests[(route, method, str(status))] += 1
+        series = self.latency[(route, method)]
+        series[0] += 1
+        series[1] += duration_ms
+        series[2 + bucket_index(duration_ms)] += 1
+
+    def merge(self, other):
+        """Suma los totales de otro acumulador a este."""
+        for key, total in other.requests.items():
+            self.requests[key] += total
+        for key, series in other.latency.items():
+            target = self.latency[key]
+            for index, value in enumerate(series):
+                target[index] += value
+
+    def copy(self):
+        """Copia independiente del acumulador."""
+        data = MetricsSnapshot()
+        data.merge(self)
+        return data
+
+    def __bool__(self):
+        return bool(self.requests)
+
+
+class LocalMetricsStore:
+    """Almacén de métricas del proceso actual."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._data = MetricsSnapshot()
+
+    def observe(self, route, method, status, duration_ms):
+        with self._lock:
+            self._data.observe(route, method, status, duration_ms)
+
+    def snapshot(self):
+        """Copia de los totales, para recorrerla fuera del lock."""
+        with self._lock:
+            return self._data.copy()
+
+
+class RedisMetricsStore(LocalMetricsStore):
+    """
+    Almacén compartido entre workers mediante un hash de Redis.
+
+    Las observaciones se acumulan localmente y un hilo en segundo plano
+    (uno por proceso, re-arrancado tras un fork) las envía como incrementos
+    (``HINCRBY``/``HINCRBYFLOAT`` en una transacción) una vez por intervalo.
+    Si el envío falla, los deltas se devuelven al acumulador y se
+    reintentan en el siguiente intervalo.
+    """
+
+    def __init__(self, url, flush_interval, key=REDIS_KEY):
+        super().__init__()
+        import redis
+        self._client = redis.Redis.from_url(
+            url, socket_connect_timeout=0.5, socket_timeout=0.5
+        )
+        self._flush_interval = flush_interval
+        self._key = key
+        self._pid = None
+        self._stopping = threading.Event()
+
+    def observe(self, route, method, status, duration_ms):
+        if self._pid != os.getpid():
+            self._start_flusher()
+        super().observe(route, method, status, duration_ms)
+
+    def _start_flusher(self):
+        """Arranca el hilo de envío de este proceso."""
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            if self._pid is None:
+                atexit.register(self.flush)
+            else:
+                # Tras un fork los deltas heredados pertenecen al proceso padre
+                self._data = MetricsSnapshot()
+            self._pid = os.getpid()
+        threading.Thread(
+            target=self._run, name='api-metrics-flush', daemon=True
+        ).start()
+
+    def _run(self):
+        while not self._stopping.wait(self._flush_interval):
+            self.flush()
+
+    def flush(self):
+        """Envía a Redis los deltas acumulados desde el último envío."""
+        with self._lock:
+            pending, self._data = self._data, MetricsSnapshot()
+        if not pending:
+            return
+
+        # MULTI/EXEC: si el envío falla no se aplica ningún incremento
+        pipe = self._client.pipeline(transaction=True)
+        for (route, method, status), total in pending.requests.items():
+            pipe.hincrby(self._key, f'req|{route}|{method}|{status}', total)
+        for (route, method), series in pending.latency.items():
+            prefix = f'lat|{route}|{method}'
+            pipe.hincrby(self._key, f'{prefix}|count', series[0])
+            pipe.hincrbyfloat(self._key, f'{prefix}|sum', series[1])
+            for index, total in enumerate(series[2:]):
+                if total:
+                    pipe.hincrby(self._key, f'{prefix}|{index}', total)
+        try:
+            pipe.execute()
+        except Exception as e:
+            logger.warning(f"No se pudieron enviar las métricas a Redis: {str(e)}")
+            with self._lock:
+                self._data.merge(pending)
+
+    def snapshot(self):
+        """
+        Lee los totales compartidos de todos los workers.
+
+        Si Redis no responde se retornan los totales locales pendientes de
+        envío de este proceso (parciales) en lugar de fallar.
+        """
+        from redis.exceptions import RedisError
+        self.flush()
+        try:
+            fields = self._client.hgetall(self._key)
+        except RedisError as e:
+            logger.warning(f"No se pudieron leer las métricas de Redis: {str(e)}")
+            return super().snapshot()
+
+        data = MetricsSnapshot()
+        for field, value in fields.items():
+            parts = field.decode().split('|')
+            if len(parts) != 4:
+                continue
+            kind, route, method, name = parts
+            if kind == 'req':
+                data.requests[(route, method, name)] = int(value)
+            elif kind == 'lat':
+                series = data.latency[(route, method)]
+                if name == 'count':
+                    series[0] = int(value)
+                elif name == 'sum':
+                    series[1] = float(value)
+                else:
+                    series[2 + int(name)] = int(value)
+        return data
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_metrics_store():
+    """Obtiene (creándolo la primera vez) el almacén configurado."""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                url = getattr(settings, 'API_METRICS_REDIS_URL', '')
+                if url:
+                    prefix = getattr(settings, 'CACHE_KEY_PREFIX', '')
+                    _store = RedisMetricsStore(
+                        url,
+                        getattr(settings, 'API_METRICS_FLUSH_INTERVAL', 5.0),
+                        key=f'{prefix}:{REDIS_KEY}' if prefix else REDIS_KEY
+                    )
+                else:
+                    _store = LocalMetricsStore()
+    return _store
+
+
+def resolve_route(request):
+    """
+    Nombre de la ruta resuelta de la solicitud.
+
+    Args:
+        request: Objeto HttpRequest de Django
+
+    Returns:
+        str: ``view_name`` de la URL (por ejemplo ``proyectos-list``)
+    """
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return UNMATCHED_ROUTE
+    return match.view_name or match.route or UNMATCHED_ROUTE
+
+
+def record_request(request, status_code, duration):
+    """
+    Registra una solicitud atendida.
+
+    Args:
+        request: Objeto HttpRequest de Django
+        status_code: Código de estado HTTP de la respuesta
+        duration: Duración en segundos
+    """
+    try:
+        get_metrics_store().observe(
+            resolve_route(request), request.method, status_code, duration * 1000
+        )
+    except Exception as e:
+        logger.warning(f"No se pudo registrar la métrica: {str(e)}")
+
+
+def _labels(**labels):
+    """Formatea etiquetas de Prometheus escapando los valores."""
+    parts = []
+    for name, value in labels.items():
+        value = str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        parts.append(f'{name}="{value}"')
+    return '{' + ','.join(parts) + '}'
+
+
+def render_prometheus(snapshot=None):
+    """
+    Genera las métricas en el formato de texto de Prometheus (0.0.4).
+
+    Args:
+        snapshot: Métricas a exportar; por defecto las del almacén configurado
+
+    Returns:
+        str: Exposición de texto con contadores e histogramas
+    """
+    data = snapshot if snapshot is not None else get_metrics_store().snapshot()
+    lines = [
+        '# HELP blog_http_requests_total Solicitudes atendidas por ruta, método y estado.',
+        '# TYPE blog_http_requests_total counter',
+    ]
+    for (route, method, status), total in sorted(data.requests.items()):
+        lines.append(
+            f'blog_http_requests_total{_labels(route=route, method=method, status=status)} {total}'
+        )
+
+    lines += [
+        '# HELP blog_http_request_duration_seconds Latencia de las solicitudes por ruta y método.',
+        '# TYPE blog_http_request_duration_seconds histogram',
+    ]
+    bounds = [f'{bound / 1000:g}' for bound in LATENCY_BUCKETS_MS] + ['+Inf']
+    for (route, method), series in sorted(data.latency.items()):
+        cumulative = 0
+        for bound, total in zip(bounds, series[2:]):
+            cumulative += total
+            lines.append(
+                'blog_http_request_duration_seconds_bucket'
+                f'{_labels(route=route, method=method, le=bound)} {cumulative}'
+            )
+        labels = _labels(route=route, method=method)
+        lines.append(f'blog_http_request_duration_seconds_sum{labels} {series[1] / 1000:.6f}')
+        lines.append(f'blog_http_request_duration_seconds_count{labels} {series[0]}')
+
+    return '\n'.join(lines) + '\n'
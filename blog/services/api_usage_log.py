@@ -0,0 +1,226 @@
+"""
+Registro asíncrono y por lotes del uso de la API.
+
+``APIUsageMiddleware`` solo arma un diccionario con los datos de la
+solicitud y lo deja en un buffer circular en memoria. Un hilo en segundo
+plano (``QueueListener``) vacía el buffer por lotes, serializa cada
+registro a JSON y lo entrega a los handlers configurados para el logger
+``api_usage`` (archivo rotativo o consola). Así la serialización y la
+escritura en disco quedan fuera de la latencia del request.
+
+El buffer es acotado: si el hilo de escritura no da abasto se descartan
+los registros más antiguos y se informa periódicamente cuántos se
+perdieron, en lugar de bloquear las solicitudes.
+"""
+
+from collections import deque
+from django.conf import settings
+from logging.handlers import QueueHandler, QueueListener
+import atexit
+import json
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+API_USAGE_LOGGER = 'api_usage'
+
+
+class UsageRingBuffer:
+    """
+    Buffer circular acotado compatible con la interfaz de ``queue.Queue``
+    que usan ``QueueHandler`` y ``QueueListener``.
+
+    Al llenarse descarta el elemento más antiguo y lleva la cuenta de los
+    descartes.
+    """
+
+    def __init__(self, maxsize):
+        self._items = deque(maxlen=maxsize)
+        self._not_empty = threading.Condition(threading.Lock())
+        self.dropped = 0
+
+    def put_nowait(self, item):
+        with self._not_empty:
+            if len(self._items) == self._items.maxlen:
+                self.dropped += 1
+            self._items.append(item)
+            self._not_empty.notify()
+
+    put = put_nowait
+
+    def get(self, block=True, timeout=None):
+        """
+        Extrae el elemento más antiguo.
+
+        Raises:
+            IndexError: Si no hay elementos tras esperar ``timeout``
+        """
+        with self._not_empty:
+            if block and not self._items:
+                self._not_empty.wait(timeout)
+            return self._items.popleft()
+
+    def drain(self, limit):
+        """
+        Extrae hasta ``limit`` elementos sin bloquear.
+
+        Returns:
+            list: Elementos en orden de llegada
+        """
+        with self._not_empty:
+            count = min(limit, len(self._items))
+            return [self._items.popleft() for _ in range(count)]
+
+    def pop_dropped(self):
+        """Obtiene y reinicia el número de registros descartados."""
+        with self._not_empty:
+            dropped, self.dropped = self.dropped, 0
+            return dropped
+
+    def __len__(self):
+        return len(self._items)
+
+
+class UsageQueueHandler(QueueHandler):
+    """
+    ``QueueHandler`` que encola el registro tal cual.
+
+    El ``QueueHandler`` estándar formatea el mensaje en el hilo que emite;
+    aquí el formateo se hace en el hilo del listener.
+    """
+
+    def prepare(self, record):
+        return record
+
+
+class BatchQueueListener(QueueListener):
+    """
+    ``QueueListener`` que procesa los registros por lotes.
+
+    Espera hasta ``flush_interval`` segundos por registros nuevos, procesa
+    hasta ``batch_size`` de una vez y luego hace ``flush`` de los handlers
+    una sola vez por lote.
+    """
+
+    def __init__(self, buffer, *handlers, batch_size=200, flush_interval=1.0):
+        super().__init__(buffer, *handlers, respect_handler_level=True)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._stopping = threading.Event()
+
+    def _monitor(self):
+        while True:
+            stopping = self._stopping.is_set()
+            try:
+                first = self.queue.get(block=not stopping, timeout=self.flush_interval)
+            except IndexError:
+                if stopping:
+                    return
+                continue
+
+            self._handle_batch([first] + self.queue.drain(self.batch_size - 1))
+
+    def _handle_batch(self, records):
+        for record in records:
+            if record is self._sentinel:
+                self._stopping.set()
+                continue
+            self.handle(record)
+
+        dropped = self.queue.pop_dropped()
+        if dropped:
+            self.handle(logging.LogRecord(
+                API_USAGE_LOGGER, logging.WARNING, __file__, 0,
+                {'event': 'api_usage_dropped', 'dropped': dropped}, None, None
+            ))
+
+        for handler in self.handlers:
+            handler.flush()
+
+    def stop(self):
+        """Detiene el hilo tras escribir los registros pendientes."""
+        if self._thread is not None:
+            self._stopping.set()
+            self.enqueue_sentinel()
+            self._thread.join()
+            self._thread = None
+
+
+class ApiUsageFormatter(logging.Formatter):
+    """Serializa a una línea JSON los registros cuyo mensaje es un dict."""
+
+    def format(self, record):
+        if isinstance(record.msg, dict):
+            return json.dumps(record.msg, default=str)
+        return super().format(record)
+
+
+_lock = threading.Lock()
+_state = {'pid': None, 'handler': None, 'listener': None, 'buffer': None}
+
+
+def _start():
+    """Reemplaza los handlers de ``api_usage`` por la cola y arranca el hilo."""
+    usage_logger = logging.getLogger(API_USAGE_LOGGER)
+    listener = _state['listener']
+
+    if listener is not None:
+        # Proceso hijo tras un fork: el hilo del padre no existe aquí
+        targets = listener.handlers
+        usage_logger.removeHandler(_state['handler'])
+    else:
+        targets = tuple(usage_logger.handlers)
+        for handler in targets:
+            usage_logger.removeHandler(handler)
+
+    buffer = UsageRingBuffer(getattr(settings, 'API_USAGE_BUFFER_SIZE', 10000))
+    queue_handler = UsageQueueHandler(buffer)
+    listener = BatchQueueListener(
+        buffer,
+        *targets,
+        batch_size=getattr(settings, 'API_USAGE_BATCH_SIZE', 200),
+        flush_interval=getattr(settings, 'API_USAGE_FLUSH_INTERVAL', 1.0)
+    )
+    usage_logger.addHandler(queue_handler)
+    listener.start()
+
+    if _state['pid'] is None:
+        atexit.register(stop_usage_logging)
+    _state.update(pid=os.getpid(), handler=queue_handler,
+                  listener=listener, buffer=buffer)
+
+
+def ensure_usage_logging():
+    """
+    Arranca el pipeline de registro si no está activo en este proceso.
+
+    Se comprueba el PID para re-arrancar el hilo en los workers creados
+    con ``fork`` (por ejemplo gunicorn con ``--preload``).
+    """
+    if _state['pid'] == os.getpid():
+        return
+    with _lock:
+        if _state['pid'] != os.getpid():
+            _start()
+
+
+def stop_usage_logging():
+    """Escribe los registros pendientes y detiene el hilo de escritura."""
+    listener = _state['listener']
+    if listener is not None and _state['pid'] == os.getpid():
+        listener.stop()
+
+
+def log_api_usage(record):
+    """
+    Encola un registro de uso de la API sin bloquear la solicitud.
+
+    Args:
+        record: Diccionario con los datos de la solicitud
+    """
+    ensure_usage_logging()
+    record.setdefault('timestamp', time.time())
+    logging.getLogger(API_USAGE_LOGGER).info(record)
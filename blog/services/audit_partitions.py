@@ -0,0 +1,238 @@
+"""
+Particiones mensuales de ``blog_auditlog``.
+
+Desde la migración ``0010_auditlog_partitioning`` la tabla de auditoría
+está particionada por rango de ``timestamp`` (una partición por mes,
+``blog_auditlog_pYYYYMM``, más ``blog_auditlog_default`` como red de
+seguridad para que un insert de los triggers nunca falle por falta de
+partición).
+
+Este módulo crea por adelantado las particiones de los próximos meses y
+elimina las que quedaron fuera del periodo de retención con
+``DETACH``/``DROP`` (instantáneo, sin ``DELETE`` fila por fila). Las
+consultas filtradas por ``timestamp`` descartan las particiones que no
+necesitan (partition pruning) sin cambios en el ORM.
+
+Solo aplica en PostgreSQL; en otros motores las funciones no hacen nada.
+"""
+
+from datetime import datetime, timezone as dt_timezone
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+import logging
+import re
+
+logger = logging.getLogger(__name__)
+
+TABLE = 'blog_auditlog'
+DEFAULT_PARTITION = f'{TABLE}_default'
+PARTITION_RE = re.compile(rf'^{TABLE}_p(\d{{4}})(\d{{2}})$')
+
+
+def month_start(value: datetime) -> datetime:
+    """Primer instante (UTC) del mes de ``value``."""
+    value = value.astimezone(dt_timezone.utc)
+    return datetime(value.year, value.month, 1, tzinfo=dt_timezone.utc)
+
+
+def add_months(month: datetime, months: int) -> datetime:
+    """Suma meses a un inicio de mes."""
+    index = month.year * 12 + month.month - 1 + months
+    return datetime(index // 12, index % 12 + 1, 1, tzinfo=dt_timezone.utc)
+
+
+def partition_name(month: datetime) -> str:
+    """Nombre de la partición de un mes (``blog_auditlog_pYYYYMM``)."""
+    return f'{TABLE}_p{month:%Y%m}'
+
+
+def is_partitioned() -> bool:
+    """Indica si ``blog_auditlog`` es una tabla particionada."""
+    if connection.vendor != 'postgresql':
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT 1 FROM pg_partitioned_table WHERE partrelid = %s::regclass",
+            [TABLE]
+        )
+        return cursor.fetchone() is not None
+
+
+def list_partitions() -> dict:
+    """
+    Particiones mensuales existentes.
+
+    Returns:
+        dict ``{inicio_de_mes: nombre}`` ordenado por mes
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT child.relname
+            FROM pg_inherits
+            JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+            WHERE pg_inherits.inhparent = %s::regclass
+            """,
+            [TABLE]
+        )
+        names = [row[0] for row in cursor.fetchall()]
+
+    partitions = {}
+    for name in names:
+        match = PARTITION_RE.match(name)
+        if match:
+            month = datetime(int(match.group(1)), int(match.group(2)), 1, tzinfo=dt_timezone.utc)
+            partitions[month] = name
+    return dict(sorted(partitions.items()))
+
+
+def create_partition(month: datetime) -> str:
+    """
+    Crea la partición de un mes.
+
+    Si la partición por defecto ya recibió filas de ese mes (porque la
+    tarea de mantenimiento no corrió a tiempo), se mueven a la nueva
+    partición antes de adjuntarla.
+
+    Args:
+        month: Inicio del mes
+
+    Returns:
+        str con el nombre de la partición
+    """
+    name = partition_name(month)
+    start, end = month, add_months(month, 1)
+    quote = connection.ops.quote_name
+
+    # STORAGE y COMPRESSION conservan en las particiones nuevas la
+    # compresión de payloads (AUDIT_PAYLOAD_COMPRESSION) del padre;
+    # INCLUDING COMPRESSION existe desde PostgreSQL 14
+    including = 'INCLUDING DEFAULTS INCLUDING CONSTRAINTS INCLUDING STORAGE'
+    if connection.pg_version >= 140000:
+        including += ' INCLUDING COMPRESSION'
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(f"CREATE TABLE {quote(name)} (LIKE {quote(TABLE)} {including})")
+        cursor.execute(
+            f"""
+            WITH moved AS (
+                DELETE FROM {quote(DEFAULT_PARTITION)}
+                WHERE timestamp >= %s AND timestamp < %s
+                RETURNING *
+            )
+            INSERT INTO {quote(name)} SELECT * FROM moved
+            """,
+            [start, end]
+        )
+        if cursor.rowcount:
+            logger.warning(f"Movidos {cursor.rowcount} logs de la partición por defecto a {name}")
+        cursor.execute(
+            f"ALTER TABLE {quote(TABLE)} ATTACH PARTITION {quote(name)} "
+            f"FOR VALUES FROM (%s) TO (%s)",
+            [start, end]
+        )
+
+    logger.info(f"Creada la partición de auditoría {name}")
+    return name
+
+
+def drop_partition(name: str) -> None:
+    """Separa y elimina una partición completa."""
+    quote = connection.ops.quote_name
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(f"ALTER TABLE {quote(TABLE)} DETACH PARTITION {quote(name)}")
+        cursor.execute(f"DROP TABLE {quote(name)}")
+    logger.info(f"Eliminada la partición de auditoría {name}")
+
+
+def ensure_future_partitions(months_ahead: int = None, now: datetime = None) -> list:
+    """
+    Crea las particiones del mes actual y de los próximos meses.
+
+    Args:
+        months_ahead: Meses a crear por adelantado
+            (por defecto ``AUDIT_PARTITION_MONTHS_AHEAD``)
+        now: Instante de referencia (por defecto ahora)
+
+    Returns:
+        list con los nombres de las particiones creadas
+    """
+    if months_ahead is None:
+        months_ahead = getattr(settings, 'AUDIT_PARTITION_MONTHS_AHEAD', 3)
+    current = month_start(now or timezone.now())
+    existing = list_partitions()
+    return [
+        create_partition(month)
+        for month in (add_months(current, i) for i in range(months_ahead + 1))
+        if month not in existing
+    ]
+
+
+def drop_expired_partitions(retention_months: int = None, now: datetime = None) -> list:
+    """
+    Elimina las particiones cuyos logs superan el periodo de retención.
+
+    Una partición se elimina solo cuando todo su mes quedó fuera del
+    periodo, de modo que nunca se pierden logs más recientes.
+
+    Args:
+        retention_months: Meses a conservar (por defecto
+            ``AUDIT_RETENTION_MONTHS``; 0 conserva todo)
+        now: Instante de referencia (por defecto ahora)
+
+    Returns:
+        list con los nombres de las particiones eliminadas
+    """
+    if retention_months is None:
+        retention_months = getattr(settings, 'AUDIT_RETENTION_MONTHS', 12)
+    if retention_months <= 0:
+        return []
+    return drop_partitions_before(
+        add_months(month_start(now or timezone.now()), -retention_months)
+    )
+
+
+def drop_partitions_before(cutoff: datetime) -> list:
+    """
+    Elimina las particiones que terminan antes de ``cutoff``.
+
+    Los logs anteriores a ``cutoff`` que hayan caído en la partición por
+    defecto (meses sin partición propia) se eliminan con un ``DELETE``.
+
+    Args:
+        cutoff: Instante límite; se eliminan los meses completos anteriores
+
+    Returns:
+        list con los nombres de las particiones eliminadas
+    """
+    dropped = []
+    for month, name in list_partitions().items():
+        if add_months(month, 1) <= cutoff:
+            drop_partition(name)
+            dropped.append(name)
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"DELETE FROM {connection.ops.quote_name(DEFAULT_PARTITION)} WHERE timestamp < %s",
+            [cutoff]
+        )
+        if cursor.rowcount:
+            logger.info(f"Eliminados {cursor.rowcount} logs expirados de {DEFAULT_PARTITION}")
+    return dropped
+
+
+def maintain_partitions() -> dict:
+    """
+    Mantenimiento periódico: crea particiones futuras y elimina las
+    expiradas.
+
+    Returns:
+        dict con las particiones ``creadas`` y ``eliminadas``
+    """
+    if not is_partitioned():
+        return {'creadas': [], 'eliminadas': []}
+    return {
+        'creadas': ensure_future_partitions(),
+        'eliminadas': drop_expired_partitions(),
+    }
@@ -0,0 +1,470 @@
+"""
+Triggers de auditoría generados a partir de los modelos del blog.
+
+Reemplaza las funciones PL/pgSQL escritas a mano por tabla y operación
+(``tests/apply_all_triggers.py`` y similares) por:
+
+- una única función genérica, ``blog_audit_statement()``, que recibe la
+  columna de llave primaria y la del usuario como argumentos del trigger
+- tres triggers por tabla (INSERT, UPDATE, DELETE) a nivel de sentencia
+  (``FOR EACH STATEMENT``) con tablas de transición
+  (``REFERENCING NEW TABLE``/``OLD TABLE``)
+
+Cada sentencia escribe todos sus logs con un solo ``INSERT ... SELECT``,
+por lo que un ``UPDATE`` o ``DELETE`` masivo (por ejemplo
+``limpiar_expiradas``) ya no ejecuta una función por fila.
+
+El payload (``modified_data``) de un UPDATE contiene solo las columnas que
+cambiaron (``old_<campo>``/``new_<campo>``) y las actualizaciones sin
+cambios no generan log. ``AUDIT_PAYLOAD_COMPRESSION`` (``lz4``/``pglz``)
+fija la compresión TOAST de la columna, sin perder datos. Opcionalmente
+``AUDIT_PAYLOAD_TRUNCATE_TEXT_LENGTH`` recorta los textos más largos que
+el límite: se guardan solo su longitud, su md5 y un prefijo, y el resto
+del texto se pierde. Ambas opciones se aplican al instalar los triggers.
+
+Se auditan los modelos de la app ``blog`` con una llave foránea
+``creador``, que se registra como ``user_id`` del log. La instalación la
+hace la operación de migración ``blog.operations.InstallAuditTriggers``
+y el comando ``manage.py audit_triggers``. Solo aplica en PostgreSQL.
+"""
+
+from django.apps import apps as global_apps
+from django.conf import settings
+from django.db import connection as default_connection
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Versión más reciente del SQL generado. El SQL de cada versión queda
+# congelado (FUNCTION_SQL_Vn/TRIGGER_SQL_Vn): para cambiarlo se agrega una
+# versión nueva y una migración con InstallAuditTriggers(version=n), que al
+# revertirse reinstala la versión anterior
+AUDIT_TRIGGER_VERSION = 2
+
+FUNCTION_NAME = 'blog_audit_statement'
+TRIGGER_PREFIX = 'blog_audit'
+# Triggers por fila que instalaban los scripts de tests/ (trigger_log_<tabla>_<op>)
+LEGACY_TRIGGER_PREFIX = 'trigger_log_'
+USER_FIELD = 'creador'
+OPERATIONS = ('insert', 'update', 'delete')
+COMPRESSION_METHODS = ('pglz', 'lz4', 'default')
+
+# --- v1: payloads completos (old_/new_ de todas las columnas) ---
+
+FUNCTION_SQL_V1 = """
+CREATE OR REPLACE FUNCTION {function}() RETURNS trigger
+LANGUAGE plpgsql AS $$
+DECLARE
+    pk_col text := TG_ARGV[0];
+    user_col text := NULLIF(TG_ARGV[1], '');
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO blog_auditlog (
+            timestamp, user_id, table_name, change_type,
+            affected_record_id, modified_data
+        )
+        SELECT NOW(), (nueva.fila ->> user_col)::integer, TG_TABLE_NAME, 'CREATE',
+               (nueva.fila ->> pk_col)::integer,
+               nueva.fila - pk_col - COALESCE(user_col, '')
+        FROM (SELECT to_jsonb(n) AS fila FROM nuevas n) AS nueva;
+
+    ELSIF TG_OP = 'UPDATE' THEN
+        INSERT INTO blog_auditlog (
+            timestamp, user_id, table_name, change_type,
+            affected_record_id, modified_data
+        )
+        SELECT NOW(), (nueva.fila ->> user_col)::integer, TG_TABLE_NAME, 'UPDATE',
+               (nueva.fila ->> pk_col)::integer,
+               (SELECT COALESCE(jsonb_object_agg('old_' || campo.key, campo.value), '{{}}')
+                FROM jsonb_each(vieja.fila - pk_col - COALESCE(user_col, '')) AS campo)
+               || (SELECT COALESCE(jsonb_object_agg('new_' || campo.key, campo.value), '{{}}')
+                   FROM jsonb_each(nueva.fila - pk_col - COALESCE(user_col, '')) AS campo)
+        FROM (SELECT to_jsonb(n) AS fila FROM nuevas n) AS nueva
+        JOIN (SELECT to_jsonb(v) AS fila FROM viejas v) AS vieja
+          ON vieja.fila -> pk_col = nueva.fila -> pk_col;
+
+    ELSIF TG_OP = 'DELETE' THEN
+        INSERT INTO blog_auditlog (
+            timestamp, user_id, table_name, change_type,
+            affected_record_id, modified_data
+        )
+        SELECT NOW(), (vieja.fila ->> user_col)::integer, TG_TABLE_NAME, 'DELETE',
+               (vieja.fila ->> pk_col)::integer,
+               vieja.fila - pk_col - COALESCE(user_col, '')
+        FROM (SELECT to_jsonb(v) AS fila FROM viejas v) AS vieja;
+    END IF;
+
+    RETURN NULL;
+END;
+$$;
+COMMENT ON FUNCTION {function}() IS 'blog audit triggers v{version}';
+"""
+
+TRIGGER_SQL_V1 = {
+    'insert': (
+        "CREATE TRIGGER {trigger} AFTER INSERT ON {table} "
+        "REFERENCING NEW TABLE AS nuevas "
+        "FOR EACH STATEMENT EXECUTE FUNCTION {function}({pk}, {user});"
+    ),
+    'update': (
+        "CREATE TRIGGER {trigger} AFTER UPDATE ON {table} "
+        "REFERENCING OLD TABLE AS viejas NEW TABLE AS nuevas "
+        "FOR EACH STATEMENT EXECUTE FUNCTION {function}({pk}, {user});"
+    ),
+    'delete': (
+        "CREATE TRIGGER {trigger} AFTER DELETE ON {table} "
+        "REFERENCING OLD TABLE AS viejas "
+        "FOR EACH STATEMENT EXECUTE FUNCTION {function}({pk}, {user});"
+    ),
+}
+
+
+# --- v2: UPDATE solo con las columnas modificadas y textos recortados ---
+
+COMPACT_FUNCTION_NAME = 'blog_audit_compact'
+
+# Recorte con pérdida: reemplaza los textos más largos que max_text por su
+# longitud, su md5 y sus primeros max_text caracteres (max_text <= 0
+# desactiva el recorte)
+COMPACT_FUNCTION_SQL = """
+CREATE OR REPLACE FUNCTION {compact}(datos jsonb, max_text integer) RETURNS jsonb
+LANGUAGE sql IMMUTABLE AS $$
+    SELECT CASE
+        WHEN datos IS NULL OR max_text IS NULL OR max_text <= 0 THEN datos
+        ELSE (
+            SELECT COALESCE(jsonb_object_agg(
+                campo.key,
+                CASE
+                    WHEN jsonb_typeof(campo.value) = 'string'
+                         AND length(campo.value #>> '{{}}') > max_text
+                    THEN jsonb_build_object(
+                        'longitud', length(campo.value #>> '{{}}'),
+                        'md5', md5(campo.value #>> '{{}}'),
+                        'inicio', left(campo.value #>> '{{}}', max_text)
+                    )
+                    ELSE campo.value
+                END
+            ), '{{}}')
+            FROM jsonb_each(datos) AS campo
+        )
+    END
+$$;
+"""
+
+FUNCTION_SQL_V2 = """
+CREATE OR REPLACE FUNCTION {function}() RETURNS trigger
+LANGUAGE plpgsql AS $$
+DECLARE
+    pk_col text := TG_ARGV[0];
+    user_col text := NULLIF(TG_ARGV[1], '');
+    max_text integer := COALESCE(NULLIF(TG_ARGV[2], ''), '0')::integer;
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO blog_auditlog (
+            timestamp, user_id, table_name, change_type,
+            affected_record_id, modified_data
+        )
+        SELECT NOW(), (nueva.fila ->> user_col)::integer, TG_TABLE_NAME, 'CREATE',
+               (nueva.fila ->> pk_col)::integer,
+               {compact}(nueva.fila - pk_col - COALESCE(user_col, ''), max_text)
+        FROM (SELECT to_jsonb(n) AS fila FROM nuevas n) AS nueva;
+
+    ELSIF TG_OP = 'UPDATE' THEN
+        -- Solo las columnas que cambiaron; las actualizaciones sin cambios
+        -- (diff vacío) no generan log
+        INSERT INTO blog_auditlog (
+            timestamp, user_id, table_name, change_type,
+            affected_record_id, modified_data
+        )
+        SELECT NOW(), (nueva.fila ->> user_col)::integer, TG_TABLE_NAME, 'UPDATE',
+               (nueva.fila ->> pk_col)::integer,
+               {compact}(diff.datos, max_text)
+        FROM (SELECT to_jsonb(n) AS fila FROM nuevas n) AS nueva
+        JOIN (SELECT to_jsonb(v) AS fila FROM viejas v) AS vieja
+          ON vieja.fila -> pk_col = nueva.fila -> pk_col
+        CROSS JOIN LATERAL (
+            SELECT jsonb_object_agg('old_' || campo.key, vieja.fila -> campo.key)
+                   || jsonb_object_agg('new_' || campo.key, campo.value) AS datos
+            FROM jsonb_each(nueva.fila - pk_col) AS campo
+            WHERE campo.value IS DISTINCT FROM vieja.fila -> campo.key
+        ) AS diff
+        WHERE diff.datos IS NOT NULL;
+
+    ELSIF TG_OP = 'DELETE' THEN
+        INSERT INTO blog_auditlog (
+            timestamp, user_id, table_name, change_type,
+            affected_record_id, modified_data
+        )
+        SELECT NOW(), (vieja.fila ->> user_col)::integer, TG_TABLE_NAME, 'DELETE',
+               (vieja.fila ->> pk_col)::integer,
+               {compact}(vieja.fila - pk_col - COALESCE(user_col, ''), max_text)
+        FROM (SELECT to_jsonb(v) AS fila FROM viejas v) AS vieja;
+    END IF;
+
+    RETURN NULL;
+END;
+$$;
+COMMENT ON FUNCTION {function}() IS 'blog audit triggers v{version}';
+"""
+
+TRIGGER_SQL_V2 = {
+    'insert': (
+        "CREATE TRIGGER {trigger} AFTER INSERT ON {table} "
+        "REFERENCING NEW TABLE AS nuevas "
+        "FOR EACH STATEMENT EXECUTE FUNCTION {function}({pk}, {user}, {max_text});"
+    ),
+    'update': (
+        "CREATE TRIGGER {trigger} AFTER UPDATE ON {table} "
+        "REFERENCING OLD TABLE AS viejas NEW TABLE AS nuevas "
+        "FOR EACH STATEMENT EXECUTE FUNCTION {function}({pk}, {user}, {max_text});"
+    ),
+    'delete': (
+        "CREATE TRIGGER {trigger} AFTER DELETE ON {table} "
+        "REFERENCING OLD TABLE AS viejas "
+        "FOR EACH STATEMENT EXECUTE FUNCTION {function}({pk}, {user}, {max_text});"
+    ),
+}
+
+
+def _quote_literal(value: str) -> str:
+    return "'" + value.replace("'", "''") + "'"
+
+
+def trigger_name(operation: str) -> str:
+    """Nombre del trigger generado para una operación."""
+    return f'{TRIGGER_PREFIX}_{operation}'
+
+
+def get_audited_models(apps=None) -> list:
+    """
+    Modelos de la app ``blog`` que se auditan.
+
+    Args:
+        apps: Registro de apps (el de la migración o el global)
+
+    Returns:
+        list de modelos con llave foránea ``creador``, ordenados por tabla
+    """
+    apps = apps or global_apps
+    audited = []
+    for model in apps.get_app_config('blog').get_models():
+        if not model._meta.managed or model._meta.proxy:
+            continue
+        field_names = {field.name for field in model._meta.concrete_fields}
+        if USER_FIELD in field_names:
+            audited.append(model)
+    return sorted(audited, key=lambda model: model._meta.db_table)
+
+
+def build_legacy_uninstall_sql(models, quote_name) -> list:
+    """
+    Sentencias que eliminan los triggers por fila de los scripts
+    anteriores (``trigger_log_<tabla>_<operación>``) y sus funciones
+    ``log_<tabla>_<operación>()``.
+
+    Args:
+        models: Modelos auditados
+        quote_name: Función del backend para citar identificadores
+
+    Returns:
+        list de sentencias SQL
+    """
+    statements = []
+    for model in models:
+        table = model._meta.db_table
+        suffix = table.removeprefix('blog_')
+        for operation in OPERATIONS:
+            statements += [
+                f"DROP TRIGGER IF EXISTS {quote_name(f'{LEGACY_TRIGGER_PREFIX}{suffix}_{operation}')} "
+                f"ON {quote_name(table)};",
+                f"DROP FUNCTION IF EXISTS {quote_name(f'log_{suffix}_{operation}')}();",
+            ]
+    return statements
+
+
+def _trigger_statements(models, quote_name, trigger_sql, max_text=0) -> list:
+    """
+    Sentencias que (re)crean los triggers de cada tabla auditada.
+
+    También eliminan los triggers por fila heredados para no duplicar logs.
+    """
+    statements = build_legacy_uninstall_sql(models, quote_name)
+    for model in models:
+        table = model._meta.db_table
+        pk_column = model._meta.pk.column
+        user_column = model._meta.get_field(USER_FIELD).column
+        for operation in OPERATIONS:
+            statements += [
+                f"DROP TRIGGER IF EXISTS {quote_name(trigger_name(operation))} "
+                f"ON {quote_name(table)};",
+                trigger_sql[operation].format(
+                    trigger=quote_name(trigger_name(operation)),
+                    table=quote_name(table),
+                    function=FUNCTION_NAME,
+                    pk=_quote_literal(pk_column),
+                    user=_quote_literal(user_column),
+                    max_text=_quote_literal(str(max_text)),
+                ),
+            ]
+    return statements
+
+
+def _build_install_sql_v1(models, quote_name) -> list:
+    statements = [FUNCTION_SQL_V1.format(function=FUNCTION_NAME, version=1)]
+    statements += _trigger_statements(models, quote_name, TRIGGER_SQL_V1)
+    # Al bajar desde v2 la función de recorte queda sin uso
+    statements.append(f"DROP FUNCTION IF EXISTS {COMPACT_FUNCTION_NAME}(jsonb, integer);")
+    return statements
+
+
+def _build_install_sql_v2(models, quote_name) -> list:
+    max_text = getattr(settings, 'AUDIT_PAYLOAD_TRUNCATE_TEXT_LENGTH', 0)
+    compression = getattr(settings, 'AUDIT_PAYLOAD_COMPRESSION', '')
+    statements = [
+        COMPACT_FUNCTION_SQL.format(compact=COMPACT_FUNCTION_NAME),
+        FUNCTION_SQL_V2.format(
+            function=FUNCTION_NAME,
+            compact=COMPACT_FUNCTION_NAME,
+            version=2
+        ),
+    ]
+    if compression:
+        if compression not in COMPRESSION_METHODS:
+            raise ValueError(
+                f"AUDIT_PAYLOAD_COMPRESSION debe ser uno de {', '.join(COMPRESSION_METHODS)}"
+            )
+        # Compresión TOAST de los payloads nuevos (PostgreSQL 14+)
+        statements.append(
+            f"ALTER TABLE blog_auditlog ALTER COLUMN modified_data "
+            f"SET COMPRESSION {compression};"
+        )
+    statements += _trigger_statements(models, quote_name, TRIGGER_SQL_V2, max_text)
+    return statements
+
+
+INSTALL_SQL_BUILDERS = {
+    1: _build_install_sql_v1,
+    2: _build_install_sql_v2,
+}
+
+
+def build_install_sql(models, quote_name, version: int = AUDIT_TRIGGER_VERSION) -> list:
+    """
+    Sentencias que instalan la función genérica y los triggers de una
+    versión.
+
+    Args:
+        models: Modelos a auditar
+        quote_name: Función del backend para citar identificadores
+        version: Versión del SQL (por defecto la más reciente)
+
+    Returns:
+        list de sentencias SQL
+    """
+    try:
+        builder = INSTALL_SQL_BUILDERS[version]
+    except KeyError:
+        raise ValueError(f"Versión de triggers de auditoría desconocida: {version}")
+    return builder(models, quote_name)
+
+
+def build_uninstall_sql(models, quote_name) -> list:
+    """
+    Sentencias que eliminan los triggers generados, los heredados de los
+    scripts anteriores y sus funciones.
+
+    Args:
+        models: Modelos auditados
+        quote_name: Función del backend para citar identificadores
+
+    Returns:
+        list de sentencias SQL
+    """
+    statements = build_legacy_uninstall_sql(models, quote_name)
+    statements += [
+        f"DROP TRIGGER IF EXISTS {quote_name(trigger_name(operation))} "
+        f"ON {quote_name(model._meta.db_table)};"
+        for model in models
+        for operation in OPERATIONS
+    ]
+    statements.append(f"DROP FUNCTION IF EXISTS {FUNCTION_NAME}();")
+    statements.append(f"DROP FUNCTION IF EXISTS {COMPACT_FUNCTION_NAME}(jsonb, integer);")
+    return statements
+
+
+def install(models=None, connection=None) -> int:
+    """
+    Instala (o actualiza) los triggers de auditoría.
+
+    Args:
+        models: Modelos a auditar (por defecto ``get_audited_models()``)
+        connection: Conexión de Django (por defecto ``default``)
+
+    Returns:
+        int con el número de tablas auditadas
+    """
+    connection = connection or default_connection
+    models = get_audited_models() if models is None else models
+    if connection.vendor != 'postgresql':
+        return 0
+    with connection.cursor() as cursor:
+        for statement in build_install_sql(models, connection.ops.quote_name):
+            cursor.execute(statement)
+    logger.info(f"Triggers de auditoría v{AUDIT_TRIGGER_VERSION} instalados en {len(models)} tablas")
+    return len(models)
+
+
+def uninstall(models=None, connection=None) -> None:
+    """Elimina los triggers de auditoría generados y los heredados."""
+    connection = connection or default_connection
+    models = get_audited_models() if models is None else models
+    if connection.vendor != 'postgresql':
+        return
+    with connection.cursor() as cursor:
+        for statement in build_uninstall_sql(models, connection.ops.quote_name):
+            cursor.execute(statement)
+    logger.info("Triggers de auditoría eliminados")
+
+
+def get_status(connection=None) -> dict:
+    """
+    Estado de los triggers de auditoría en la base de datos.
+
+    Returns:
+        dict con la versión instalada, la esperada, los triggers de cada
+        tabla (generados y heredados de los scripts anteriores) y si quedan
+        triggers heredados
+    """
+    connection = connection or default_connection
+    tables = [model._meta.db_table for model in get_audited_models()]
+    status = {
+        'version_esperada': AUDIT_TRIGGER_VERSION,
+        'version_instalada': None,
+        'heredados': False,
+        'tablas': {table: [] for table in tables},
+    }
+    if connection.vendor != 'postgresql':
+        return status
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT obj_description(p.oid, 'pg_proc') FROM pg_proc p "
+            "WHERE p.proname = %s",
+            [FUNCTION_NAME]
+        )
+        row = cursor.fetchone()
+        if row and row[0] and row[0].rsplit('v', 1)[-1].isdigit():
+            status['version_instalada'] = int(row[0].rsplit('v', 1)[-1])
+
+        cursor.execute(
+            "SELECT c.relname, t.tgname FROM pg_trigger t "
+            "JOIN pg_class c ON c.oid = t.tgrelid "
+            "WHERE NOT t.tgisinternal AND c.relname = ANY(%s) "
+            "ORDER BY c.relname, t.tgname",
+            [tables]
+        )
+        for table, trigger in cursor.fetchall():
+            status['tablas'][table].append(trigger)
+            if trigger.startswith(LEGACY_TRIGGER_PREFIX):
+                status['heredados'] = True
+    return status
@@ -0,0 +1,371 @@
+"""
+Auditoría en modo ``write_behind`` (``AUDIT_MODE = 'write_behind'``).
+
+En el modo ``trigger`` (por defecto) los logs los escriben los triggers
+de PostgreSQL dentro de la transacción del usuario, con el costo de
+insertar en ``blog_auditlog`` y mantener sus índices en cada escritura.
+
+En el modo ``write_behind``:
+
+1. Las señales ``post_save``/``post_delete`` de los modelos auditados
+   (los mismos que ``blog.services.audit_triggers``) arman el payload en
+   Python, con el mismo formato que los triggers v2 (UPDATE solo con las
+   columnas que cambiaron, textos recortados según
+   ``AUDIT_PAYLOAD_TRUNCATE_TEXT_LENGTH`` y fechas como las serializa
+   ``to_jsonb``; las actualizaciones sin cambios no generan registro).
+2. El cambio se guarda en ``AuditOutbox`` dentro de la transacción del
+   cambio: si se revierte el registro desaparece con ella y si el proceso
+   cae después del commit el registro sigue en la tabla. Las escrituras de
+   la API corren en ``transaction.atomic()`` (``AtomicWriteMixin``); un
+   ``save()`` fuera de un bloque atómico (shell, scripts) confirma el
+   cambio y el outbox por separado, y una caída entre ambos pierde el log.
+3. Tras el commit se despierta un hilo en segundo plano que mueve los
+   registros pendientes a ``AuditLog`` por lotes con ``bulk_create``. La
+   tarea de Celery ``procesar_outbox_auditoria`` hace lo mismo de forma
+   periódica y recupera lo que un proceso caído dejó pendiente.
+
+Las escrituras que no emiten señales (``QuerySet.update``,
+``bulk_create``, SQL directo) no se auditan en este modo. Los triggers
+deben eliminarse al activarlo (``manage.py audit_triggers --aplicar-modo``)
+para no duplicar los logs.
+"""
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import close_old_connections, transaction
+import atexit
+import datetime
+import hashlib
+import json
+import logging
+import os
+import threading
+
+from blog.Models.AuditLogModel import AuditLog
+from blog.Models.AuditOutboxModel import AuditOutbox
+from blog.services.audit_triggers import USER_FIELD
+
+logger = logging.getLogger(__name__)
+
+MODE_TRIGGER = 'trigger'
+MODE_WRITE_BEHIND = 'write_behind'
+
+_encoder = DjangoJSONEncoder()
+
+
+def get_audit_mode() -> str:
+    """Modo de auditoría configurado (``trigger`` o ``write_behind``)."""
+    return getattr(settings, 'AUDIT_MODE', MODE_TRIGGER)
+
+
+def is_write_behind() -> bool:
+    """Indica si la auditoría se hace en la capa de aplicación."""
+    return get_audit_mode() == MODE_WRITE_BEHIND
+
+
+# ---------------------------------------------------------------------------
+# Payloads (mismo formato que los triggers v2)
+# ---------------------------------------------------------------------------
+
+def _pg_isoformat(value, length: int) -> str:
+    """
+    Fecha/hora en formato ISO como la escribe PostgreSQL: microsegundos
+    sin ceros finales y omitidos si son cero.
+
+    Args:
+        value: datetime o time
+        length: Largo de la parte sin fracción ni zona ('HH:MM:SS' = 8)
+    """
+    text = value.replace(microsecond=0).isoformat()
+    if value.microsecond:
+        fraction = f'{value.microsecond:06d}'.rstrip('0')
+        text = f'{text[:length]}.{fraction}{text[length:]}'
+    return text
+
+
+def _json_value(field, value):
+    """Valor de una columna tal como lo guardaría ``to_jsonb``."""
+    value = field.get_prep_value(value)
+    if value is None:
+        return None
+    if isinstance(value, datetime.datetime):
+        if value.tzinfo is not None:
+            # La conexión de Django usa la zona UTC
+            value = value.astimezone(datetime.timezone.utc)
+        return _pg_isoformat(value, 19)
+    if isinstance(value, datetime.time):
+        return _pg_isoformat(value, 8)
+    return json.loads(_encoder.encode(value))
+
+
+def truncate_payload(payload: dict) -> dict:
+    """
+    Recorta los textos largos como ``blog_audit_compact`` de los triggers:
+    los que superan ``AUDIT_PAYLOAD_TRUNCATE_TEXT_LENGTH`` caracteres se
+    reemplazan por su longitud, su md5 y sus primeros caracteres (el resto
+    del texto se pierde).
+
+    Args:
+        payload: Datos del cambio
+
+    Returns:
+        dict con los textos recortados (el mismo si el recorte está desactivado)
+    """
+    max_text = getattr(settings, 'AUDIT_PAYLOAD_TRUNCATE_TEXT_LENGTH', 0)
+    if max_text <= 0:
+        return payload
+    return {
+        key: {
+            'longitud': len(value),
+            'md5': hashlib.md5(value.encode()).hexdigest(),
+            'inicio': value[:max_text],
+        } if isinstance(value, str) and len(value) > max_text else value
+        for key, value in payload.items()
+    }
+
+
+def _excluded_columns(model, include_user=False) -> set:
+    excluded = {model._meta.pk.attname}
+    if not include_user:
+        excluded.add(model._meta.get_field(USER_FIELD).attname)
+    return excluded
+
+
+def take_snapshot(instance) -> dict:
+    """
+    Valores cargados de las columnas de una instancia.
+
+    Solo incluye los campos presentes en ``__dict__`` para no cargar los
+    campos diferidos.
+    """
+    return {
+        field.attname: instance.__dict__[field.attname]
+        for field in instance._meta.concrete_fields
+        if field.attname in instance.__dict__
+    }
+
+
+def build_row_payload(instance) -> dict:
+    """Payload de CREATE/DELETE: todas las columnas salvo llave y usuario."""
+    excluded = _excluded_columns(instance._meta.model)
+    return {
+        field.column: _json_value(field, getattr(instance, field.attname))
+        for field in instance._meta.concrete_fields
+        if field.attname not in excluded and field.attname in instance.__dict__
+    }
+
+
+def build_diff_payload(instance, snapshot: dict) -> dict:
+    """
+    Payload de UPDATE: ``old_<columna>``/``new_<columna>`` de las columnas
+    que cambiaron respecto de ``snapshot``.
+
+    Returns:
+        dict vacío si no cambió ninguna columna
+    """
+    excluded = _excluded_columns(instance._meta.model, include_user=True)
+    old, new = {}, {}
+    for field in instance._meta.concrete_fields:
+        if field.attname in excluded or field.attname not in snapshot:
+            continue
+        before = _json_value(field, snapshot[field.attname])
+        after = _json_value(field, getattr(instance, field.attname))
+        if before != after:
+            old[f'old_{field.column}'] = before
+            new[f'new_{field.column}'] = after
+    return {**old, **new}
+
+
+# ---------------------------------------------------------------------------
+# Outbox y relevo a AuditLog
+# ---------------------------------------------------------------------------
+
+def record_change(instance, change_type: str, payload: dict) -> None:
+    """
+    Guarda un cambio en el outbox dentro de la transacción actual.
+
+    Fuera de un bloque atómico el outbox se confirma en su propia
+    transacción, después del cambio.
+
+    Args:
+        instance: Instancia modificada
+        change_type: CREATE, UPDATE o DELETE
+        payload: Datos del cambio
+    """
+    AuditOutbox.objects.create(
+        user_id=getattr(instance, instance._meta.get_field(USER_FIELD).attname),
+        table_name=instance._meta.db_table,
+        change_type=change_type,
+        affected_record_id=instance.pk,
+        modified_data=truncate_payload(payload),
+    )
+    transaction.on_commit(notify_relay)
+
+
+def relay_batch(batch_size: int = None) -> int:
+    """
+    Mueve un lote de registros del outbox a ``AuditLog``.
+
+    Las filas se bloquean con ``SKIP LOCKED``, por lo que varios procesos
+    (hilos de los workers y la tarea de Celery) pueden relevar a la vez
+    sin duplicar logs.
+
+    Args:
+        batch_size: Registros por lote (por defecto
+            ``AUDIT_WRITE_BEHIND_BATCH_SIZE``)
+
+    Returns:
+        int con el número de logs insertados
+    """
+    batch_size = batch_size or getattr(settings, 'AUDIT_WRITE_BEHIND_BATCH_SIZE', 500)
+    with transaction.atomic():
+        pendientes = list(
+            AuditOutbox.objects
+            .select_for_update(skip_locked=True)
+            .order_by('id')[:batch_size]
+        )
+        if not pendientes:
+            return 0
+
+        # Usuarios eliminados entre el cambio y el relevo
+        user_ids = {fila.user_id for fila in pendientes if fila.user_id is not None}
+        existentes = set(User.objects.filter(id__in=user_ids).values_list('id', flat=True))
+
+        AuditLog.objects.bulk_create([
+            AuditLog(
+                timestamp=fila.created,
+                user_id=fila.user_id if fila.user_id in existentes else None,
+                table_name=fila.table_name,
+                change_type=fila.change_type,
+                affected_record_id=fila.affected_record_id,
+                modified_data=fila.modified_data,
+            )
+            for fila in pendientes
+        ])
+        AuditOutbox.objects.filter(id__in=[fila.id for fila in pendientes]).delete()
+    return len(pendientes)
+
+
+def relay_outbox(batch_size: int = None) -> int:
+    """
+    Mueve a ``AuditLog`` todos los registros pendientes del outbox.
+
+    Returns:
+        int con el número total de logs insertados
+    """
+    total = 0
+    while True:
+        movidos = relay_batch(batch_size)
+        total += movidos
+        if not movidos:
+            return total
+
+
+class AuditRelayThread(threading.Thread):
+    """
+    Hilo que releva el outbox cuando se confirma una transacción con
+    cambios, o cada ``flush_interval`` segundos como máximo.
+
+    Agrupa en un solo relevo todos los commits que llegan mientras espera.
+    """
+
+    def __init__(self, flush_interval=2.0):
+        super().__init__(name='audit-write-behind', daemon=True)
+        self.flush_interval = flush_interval
+        self._pending = threading.Event()
+        self._stopping = threading.Event()
+
+    def notify(self):
+        self._pending.set()
+
+    def run(self):
+        while not self._stopping.is_set():
+            self._pending.wait(self.flush_interval)
+            if not self._pending.is_set():
+                continue
+            self._pending.clear()
+            self._relay()
+        self._relay()
+
+    def _relay(self):
+        try:
+            relay_outbox()
+        except Exception as e:
+            # Los registros siguen en el outbox; la tarea de Celery los recupera
+            logger.error(f"Error al relevar el outbox de auditoría: {str(e)}")
+        finally:
+            close_old_connections()
+
+    def stop(self):
+        """Releva lo pendiente y detiene el hilo."""
+        self._stopping.set()
+        self._pending.set()
+        self.join()
+
+
+_lock = threading.Lock()
+_state = {'pid': None, 'thread': None}
+
+
+def _start():
+    """Arranca el hilo de relevo de este proceso."""
+    thread = AuditRelayThread(
+        flush_interval=getattr(settings, 'AUDIT_WRITE_BEHIND_FLUSH_INTERVAL', 2.0)
+    )
+    thread.start()
+    if _state['pid'] is None:
+        atexit.register(stop_relay)
+    _state.update(pid=os.getpid(), thread=thread)
+
+
+def notify_relay():
+    """
+    Despierta el hilo de relevo (arrancándolo si hace falta).
+
+    Con ``AUDIT_WRITE_BEHIND_THREAD = False`` (por ejemplo en serverless)
+    no se usa hilo y el outbox lo procesa solo la tarea de Celery.
+    """
+    if not getattr(settings, 'AUDIT_WRITE_BEHIND_THREAD', True):
+        return
+    if _state['pid'] != os.getpid():
+        # Se comprueba el PID para re-arrancar el hilo tras un fork
+        with _lock:
+            if _state['pid'] != os.getpid():
+                _start()
+    _state['thread'].notify()
+
+
+def stop_relay():
+    """Releva los registros pendientes y detiene el hilo de este proceso."""
+    thread = _state['thread']
+    if thread is not None and _state['pid'] == os.getpid():
+        thread.stop()
+
+
+# ---------------------------------------------------------------------------
+# Receptores de señales (conectados en BlogConfig.ready con AUDIT_MODE
+# = 'write_behind')
+# ---------------------------------------------------------------------------
+
+def on_audited_init(sender, instance, **kwargs):
+    """post_init: guarda los valores cargados para calcular el diff."""
+    instance._audit_snapshot = take_snapshot(instance)
+
+
+def on_audited_saved(sender, instance, created, raw=False, **kwargs):
+    """post_save: registra el alta o las columnas modificadas."""
+    if raw:
+        return
+    if created:
+        record_change(instance, 'CREATE', build_row_payload(instance))
+    else:
+        payload = build_diff_payload(instance, getattr(instance, '_audit_snapshot', {}))
+        if payload:
+            record_change(instance, 'UPDATE', payload)
+    instance._audit_snapshot = take_snapshot(instance)
+
+
+def on_audited_deleted(sender, instance, **kwargs):
+    """post_delete: registra la baja con los datos del registro."""
+    record_change(instance, 'DELETE', build_row_payload(instance))
@@ -0,0 +1,193 @@
+"""
+Estadísticas de ofertas de empleo.
+
+- Los totales (todas, vigentes, expiradas) se calculan con una sola
+  consulta de agregación condicional (``Count`` con ``filter=Q(...)``).
+- Las empresas más activas se leen de ``EmpresaOfertasResumen``, que se
+  actualiza de forma incremental con las señales de ``OfertasEmpleo`` y se
+  recalcula completo con la tarea de Celery ``refrescar_resumen_ofertas``
+  (beat cada mitad de ``OFERTAS_RESUMEN_MAX_STALENESS``). Si el resumen
+  supera esa antigüedad, la consulta lo sirve igual y encola el recálculo
+  (uno a la vez gracias a un lock en la caché), sin ejecutarlo en la
+  solicitud.
+
+El recálculo corrige las diferencias que dejan las escrituras que no
+emiten señales (``QuerySet.update``, SQL directo).
+"""
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Q
+from django.utils import timezone
+import logging
+import time
+
+from blog.Models.EmpresaOfertasResumenModel import EmpresaOfertasResumen
+from blog.Models.OfertasEmpleoModel import OfertasEmpleo
+
+logger = logging.getLogger(__name__)
+
+REFRESHED_KEY = 'blog:ofertas:resumen_refrescado'
+REFRESH_LOCK_KEY = 'blog:ofertas:resumen_refresco_encolado'
+
+# Segundos durante los que no se vuelve a encolar el recálculo
+REFRESH_LOCK_TIMEOUT = 60
+
+
+def get_max_staleness() -> int:
+    """Antigüedad máxima (segundos) del resumen por empresa."""
+    return getattr(settings, 'OFERTAS_RESUMEN_MAX_STALENESS', 300)
+
+
+def get_conteos(queryset=None) -> dict:
+    """
+    Cuenta las ofertas totales, vigentes y expiradas en una sola consulta.
+
+    Args:
+        queryset: Queryset base (por defecto todas las ofertas)
+
+    Returns:
+        dict con ``total``, ``vigentes`` y ``expiradas``
+    """
+    if queryset is None:
+        queryset = OfertasEmpleo.objects.all()
+    ahora = timezone.now()
+    return queryset.order_by().aggregate(
+        total=Count('idoferta'),
+        vigentes=Count('idoferta', filter=Q(fecha_expiracion__gte=ahora)),
+        expiradas=Count('idoferta', filter=Q(fecha_expiracion__lt=ahora)),
+    )
+
+
+def apply_delta(empresa: str, delta: int) -> None:
+    """
+    Suma ``delta`` ofertas a una empresa en el resumen.
+
+    La actualización es atómica en la base de datos (``F`` expression);
+    las filas que llegan a cero se eliminan.
+
+    Args:
+        empresa: Nombre de la empresa
+        delta: Número de ofertas a sumar (negativo para restar)
+    """
+    if not empresa or not delta:
+        return
+
+    filas = EmpresaOfertasResumen.objects.filter(empresa=empresa)
+    if delta < 0:
+        filas.filter(total_ofertas__lte=-delta).delete()
+
+    if filas.update(total_ofertas=F('total_ofertas') + delta, actualizado=timezone.now()):
+        return
+    if delta < 0:
+        return
+
+    try:
+        with transaction.atomic():
+            EmpresaOfertasResumen.objects.create(empresa=empresa, total_ofertas=delta)
+    except IntegrityError:
+        # Otra transacción creó la fila entre el UPDATE y el INSERT
+        filas.update(total_ofertas=F('total_ofertas') + delta, actualizado=timezone.now())
+
+
+def refresh_resumen_empresas() -> int:
+    """
+    Recalcula el resumen completo a partir de las ofertas.
+
+    Returns:
+        int con el número de empresas en el resumen
+    """
+    totales = dict(
+        OfertasEmpleo.objects
+        .order_by()
+        .values_list('empresa')
+        .annotate(total=Count('idoferta'))
+    )
+
+    with transaction.atomic():
+        EmpresaOfertasResumen.objects.exclude(empresa__in=list(totales)).delete()
+        EmpresaOfertasResumen.objects.bulk_create(
+            [EmpresaOfertasResumen(empresa=empresa, total_ofertas=total)
+             for empresa, total in totales.items()],
+            update_conflicts=True,
+            unique_fields=['empresa'],
+            update_fields=['total_ofertas', 'actualizado'],
+        )
+
+    caches['default'].set(REFRESHED_KEY, time.time(), None)
+    logger.info(f"Resumen de ofertas por empresa recalculado: {len(totales)} empresas")
+    return len(totales)
+
+
+def request_refresh_if_stale():
+    """
+    Encola el recálculo del resumen si supera la antigüedad máxima.
+
+    El resumen vigente se sigue sirviendo mientras tanto; ``cache.add``
+    garantiza que solo una solicitud encole la tarea por
+    ``REFRESH_LOCK_TIMEOUT`` segundos.
+
+    Returns:
+        float | None: Instante (epoch) del último recálculo, o None si no
+        se conoce
+    """
+    cache = caches['default']
+    refrescado = cache.get(REFRESHED_KEY)
+    if refrescado is not None and time.time() - refrescado <= get_max_staleness():
+        return refrescado
+
+    if cache.add(REFRESH_LOCK_KEY, time.time(), REFRESH_LOCK_TIMEOUT):
+        from blog.tasks import refrescar_resumen_ofertas
+        try:
+            # Sin reintentos: con el broker caído la solicitud no espera
+            refrescar_resumen_ofertas.apply_async(retry=False)
+        except Exception as e:
+            logger.warning(f"No se pudo encolar el recálculo del resumen de ofertas: {str(e)}")
+    return refrescado
+
+
+def get_empresas_activas(limite: int = 5) -> list:
+    """
+    Empresas con más ofertas según el resumen.
+
+    Args:
+        limite: Número de empresas a retornar
+
+    Returns:
+        list de dicts ``{'empresa', 'total'}``
+    """
+    return list(
+        EmpresaOfertasResumen.objects
+        .order_by('-total_ofertas', 'empresa')
+        .annotate(total=F('total_ofertas'))
+        .values('empresa', 'total')[:limite]
+    )
+
+
+# ---------------------------------------------------------------------------
+# Receptores de señales (conectados en BlogConfig.ready)
+# ---------------------------------------------------------------------------
+
+def on_oferta_init(sender, instance, **kwargs):
+    """post_init: recuerda la empresa cargada para detectar cambios."""
+    # Sin acceder al atributo para no cargar campos diferidos
+    instance._empresa_original = instance.__dict__.get('empresa')
+
+
+def on_oferta_saved(sender, instance, created, raw=False, **kwargs):
+    """post_save de OfertasEmpleo: suma la oferta a su empresa."""
+    if raw:
+        return
+    anterior = None if created else getattr(instance, '_empresa_original', None)
+    if created:
+        apply_delta(instance.empresa, 1)
+    elif anterior is not None and anterior != instance.empresa:
+        apply_delta(anterior, -1)
+        apply_delta(instance.empresa, 1)
+    instance._empresa_original = instance.empresa
+
+
+def on_oferta_deleted(sender, instance, **kwargs):
+    """post_delete de OfertasEmpleo: resta la oferta de su empresa."""
+    apply_delta(instance.__dict__.get('empresa'), -1)
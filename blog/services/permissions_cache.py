@@ -0,0 +1,199 @@
+"""
+Caché de permisos por usuario para las vistas del blog.
+
+Este módulo mantiene una "instantánea" de los permisos ``blog.*`` de cada
+usuario. La instantánea se carga con una sola consulta, se guarda en la
+caché compartida (visible para todos los workers de gunicorn) y se invalida
+mediante señales cuando cambian grupos, permisos o asignaciones de usuario.
+
+Las claves incluyen un contador de versión global, de modo que un cambio en
+un grupo o en el catálogo de permisos invalida todas las instantáneas con
+un único incremento.
+"""
+
+from django.conf import settings
+from django.contrib.auth.models import User, Permission
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models import Q
+from typing import FrozenSet, Iterable, Optional
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+APP_LABEL = 'blog'
+VERSION_KEY = 'blog:perms:version'
+
+# Atributo donde se memoriza la instantánea durante la vida del request
+_USER_ATTR = '_blog_perm_snapshot'
+
+
+def get_cache():
+    """Obtiene el backend de caché configurado para los permisos."""
+    return caches[getattr(settings, 'PERMISSIONS_CACHE_ALIAS', 'default')]
+
+
+def _get_timeout() -> int:
+    """Tiempo de vida (segundos) de una instantánea en caché."""
+    return getattr(settings, 'PERMISSIONS_CACHE_TIMEOUT', 300)
+
+
+def get_permissions_version() -> int:
+    """
+    Obtiene el contador de versión actual de los permisos.
+
+    Si la clave no existe (caché vacía o expulsada) se inicializa con un
+    valor basado en el reloj para no reutilizar versiones anteriores.
+
+    Returns:
+        int con la versión vigente
+    """
+    cache = get_cache()
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        version = time.time_ns() // 1000
+        cache.add(VERSION_KEY, version, None)
+        version = cache.get(VERSION_KEY, version)
+    return version
+
+
+def _snapshot_key(user_id: int, version: int) -> str:
+    """Construye la clave de caché de la instantánea de un usuario."""
+    return f'blog:perms:v{version}:user:{user_id}'
+
+
+def load_permission_codenames(user: User) -> FrozenSet[str]:
+    """
+    Carga desde la base de datos los codenames ``blog.*`` efectivos del usuario.
+
+    Une en una sola consulta los permisos directos y los heredados de sus
+    grupos.
+
+    Args:
+        user: Usuario del cual cargar los permisos
+
+    Returns:
+        frozenset con codenames (por ejemplo ``view_noticias``)
+    """
+    codenames = (Permission.objects
+                 .filter(content_type__app_label=APP_LABEL)
+                 .filter(Q(user=user) | Q(group__user=user))
+                 .values_list('codename', flat=True)
+                 .distinct())
+    return frozenset(codenames)
+
+
+def get_permission_snapshot(user: User) -> FrozenSet[str]:
+    """
+    Obtiene la instantánea de permisos ``blog.*`` del usuario.
+
+    Orden de resolución: memoria del request, caché compartida y, por
+    último, la base de datos.
+
+    Args:
+        user: Usuario autenticado
+
+    Returns:
+        frozenset con los codenames que posee el usuario
+    """
+    snapshot = getattr(user, _USER_ATTR, None)
+    if snapshot is not None:
+        return snapshot
+
+    cache = get_cache()
+    key = _snapshot_key(user.pk, get_permissions_version())
+    snapshot = cache.get(key)
+    if snapshot is None:
+        snapshot = load_permission_codenames(user)
+        cache.set(key, snapshot, _get_timeout())
+
+    setattr(user, _USER_ATTR, snapshot)
+    return snapshot
+
+
+def has_blog_permission(user: User, codename: str) -> bool:
+    """
+    Verifica un permiso ``blog.<codename>`` usando la instantánea en caché.
+
+    Replica la semántica de ``ModelBackend``: los usuarios inactivos no
+    tienen permisos y los superusuarios activos los tienen todos.
+
+    Args:
+        user: Usuario a verificar
+        codename: Codename del permiso sin el prefijo de la app
+
+    Returns:
+        bool indicando si tiene el permiso
+    """
+    if not user.is_active:
+        return False
+    if user.is_superuser:
+        return True
+    return codename in get_permission_snapshot(user)
+
+
+def bump_permissions_version() -> None:
+    """Invalida todas las instantáneas incrementando la versión global."""
+    cache = get_cache()
+    try:
+        cache.incr(VERSION_KEY)
+    except ValueError:
+        # La clave no existía: una versión nueva basada en el reloj
+        cache.set(VERSION_KEY, time.time_ns() // 1000, None)
+    except Exception as e:
+        # Caché caída: las instantáneas expiran solas tras PERMISSIONS_CACHE_TIMEOUT
+        logger.warning(f"No se pudo invalidar la caché de permisos: {str(e)}")
+
+
+def invalidate_users(user_ids: Iterable[int]) -> None:
+    """
+    Invalida las instantáneas de usuarios concretos.
+
+    Args:
+        user_ids: IDs de los usuarios afectados
+    """
+    version = get_permissions_version()
+    get_cache().delete_many([_snapshot_key(pk, version) for pk in user_ids])
+
+
+# ---------------------------------------------------------------------------
+# Receptores de señales (conectados en BlogConfig.ready)
+# ---------------------------------------------------------------------------
+
+def _on_commit(func) -> None:
+    """Ejecuta la invalidación cuando la transacción se confirma."""
+    transaction.on_commit(func)
+
+
+def on_group_or_permission_changed(sender, **kwargs):
+    """post_save/post_delete de Group y Permission: invalida todo."""
+    _on_commit(bump_permissions_version)
+
+
+def on_group_permissions_changed(sender, action: str, **kwargs):
+    """m2m_changed de Group.permissions: invalida todo."""
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        _on_commit(bump_permissions_version)
+
+
+def on_user_relations_changed(sender, instance, action: str, reverse: bool,
+                              pk_set: Optional[set] = None, **kwargs):
+    """
+    m2m_changed de User.groups y User.user_permissions.
+
+    Cuando el cambio se hace desde el usuario solo se invalida su
+    instantánea; cuando se hace desde el grupo o el permiso (lado inverso)
+    se invalidan los usuarios afectados o, si no se conocen, todas.
+    """
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+
+    if not reverse:
+        user_id = instance.pk
+        _on_commit(lambda: invalidate_users([user_id]))
+    elif pk_set:
+        user_ids = list(pk_set)
+        _on_commit(lambda: invalidate_users(user_ids))
+    else:
+        _on_commit(bump_permissions_version)
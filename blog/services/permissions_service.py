@@ -6,16 +6,32 @@ y sincronizar los permisos entre Django Admin y el frontend.
 """
 
 from django.contrib.auth.models import User, Group, Permission
-from django.contrib.contenttypes.models import ContentType
+from collections import defaultdict
 from typing import List, Dict, Any
 import logging
 
+from blog.services.permissions_cache import (
+    APP_LABEL,
+    bump_permissions_version,
+    get_cache,
+    get_permission_snapshot,
+    get_permissions_version,
+    has_blog_permission
+)
+
 logger = logging.getLogger(__name__)
 
+# Acciones estándar de Django para cada modelo
+MODEL_ACTIONS = ('view', 'add', 'change', 'delete')
+
 def get_user_permissions(user: User) -> Dict[str, Dict[str, bool]]:
     """
     Obtiene todos los permisos del usuario para cada modelo.
     
+    Los modelos se obtienen del catálogo de permisos de la app ``blog`` y
+    los permisos efectivos se resuelven en bloque a partir de la instantánea
+    en caché, sin llamar a ``user.has_perm`` por cada combinación.
+    
     Args:
         user: Usuario del cual obtener los permisos
         
@@ -32,28 +48,23 @@ def get_user_permissions(user: User) -> Dict[str, Dict[str, bool]]:
     """
     if not user.is_authenticated:
         return {}
-        
-    # Modelos disponibles en la aplicación
-    app_models = [
-        'auditlog',
-        'conferencias', 
-        'cursos',
-        'integrantes',
-        'noticias',
-        'ofertasempleo',
-        'proyectos'
-    ]
+    
+    app_models = _load_permission_catalog().keys()
+    
+    if not user.is_active:
+        codenames = frozenset()
+    elif user.is_superuser:
+        codenames = None
+    else:
+        codenames = get_permission_snapshot(user)
     
     permissions = {}
     
     for model in app_models:
-        model_perms = {
-            'view': user.has_perm(f'blog.view_{model}'),
-            'add': user.has_perm(f'blog.add_{model}'),
-            'change': user.has_perm(f'blog.change_{model}'),
-            'delete': user.has_perm(f'blog.delete_{model}')
+        permissions[model] = {
+            action: codenames is None or f'{action}_{model}' in codenames
+            for action in MODEL_ACTIONS
         }
-        permissions[model] = model_perms
         
     return permissions
 
@@ -69,6 +80,60 @@ def get_user_groups(user: User) -> List[str]:
     """
     return list(user.groups.values_list('name', flat=True))
 
+# Catálogo memorizado en el proceso para la última versión leída
+_catalog_memo = {'version': None, 'catalog': None}
+
+# Una sola entrada con la versión junto al catálogo: al cambiar la versión
+# se sobrescribe en lugar de dejar claves sin expiración por versión
+CATALOG_KEY = 'blog:perms:catalog'
+
+def _query_permission_catalog() -> Dict[str, tuple]:
+    """Consulta el catálogo de permisos de la app ``blog``."""
+    catalog = defaultdict(list)
+    
+    perms = (Permission.objects
+             .filter(content_type__app_label=APP_LABEL)
+             .select_related('content_type')
+             .order_by('content_type__model', 'codename'))
+    
+    for perm in perms:
+        catalog[perm.content_type.model].append((perm.pk, perm.codename, perm.name))
+        
+    return {model: tuple(entries) for model, entries in catalog.items()}
+
+def _load_permission_catalog() -> Dict[str, tuple]:
+    """
+    Carga el catálogo de permisos de la app ``blog`` con una sola consulta.
+    
+    El catálogo se guarda en la caché compartida junto con la versión
+    global de permisos (``permissions_cache``), que se incrementa al
+    guardar o eliminar un ``Permission`` y al migrar; un catálogo de otra
+    versión se vuelve a consultar y reemplaza al anterior, así todos los
+    workers dejan de usarlo. Cada proceso memoriza la última versión leída
+    para no deserializarla en cada request.
+    
+    Returns:
+        Dict de modelo a tupla de (id, codename, name)
+    """
+    version = get_permissions_version()
+    if _catalog_memo['version'] == version:
+        return _catalog_memo['catalog']
+    
+    cache = get_cache()
+    cached = cache.get(CATALOG_KEY)
+    if cached is not None and cached[0] == version:
+        catalog = cached[1]
+    else:
+        catalog = _query_permission_catalog()
+        cache.set(CATALOG_KEY, (version, catalog), None)
+    
+    _catalog_memo.update(version=version, catalog=catalog)
+    return catalog
+
+def clear_permission_catalog(sender=None, **kwargs) -> None:
+    """Invalida el catálogo en todos los procesos (receptor de ``post_migrate``)."""
+    bump_permissions_version()
+
 def get_all_permissions() -> Dict[str, List[str]]:
     """
     Obtiene todos los permisos disponibles agrupados por modelo.
@@ -76,22 +141,17 @@ def get_all_permissions() -> Dict[str, List[str]]:
     Returns:
         Dict con permisos agrupados por modelo
     """
-    app_permissions = {}
-    
-    content_types = ContentType.objects.filter(app_label='blog')
-    
-    for ct in content_types:
-        model_perms = Permission.objects.filter(content_type=ct)
-        app_permissions[ct.model] = [
+    return {
+        model: [
             {
-                'id': perm.pk,
-                'codename': perm.codename,
-                'name': perm.name
+                'id': pk,
+                'codename': codename,
+                'name': name
             }
-            for perm in model_perms
+            for pk, codename, name in entries
         ]
-        
-    return app_permissions
+        for model, entries in _load_permission_catalog().items()
+    }
 
 def get_group_permissions(group_name: str) -> Dict[str, List[str]]:
     """
@@ -105,24 +165,24 @@ def get_group_permissions(group_name: str) -> Dict[str, List[str]]:
     """
     try:
         group = Group.objects.get(name=group_name)
-        permissions = {}
-        
-        for perm in group.permissions.all():
-            model = perm.content_type.model
-            if model not in permissions:
-                permissions[model] = []
-            permissions[model].append(perm.codename)
-            
-        return permissions
-        
     except Group.DoesNotExist:
         logger.warning(f"Grupo {group_name} no encontrado")
         return {}
+    
+    permissions = defaultdict(list)
+    
+    for perm in group.permissions.select_related('content_type'):
+        permissions[perm.content_type.model].append(perm.codename)
+        
+    return dict(permissions)
 
 def check_model_permission(user: User, model: str, action: str) -> bool:
     """
     Verifica si un usuario tiene un permiso específico sobre un modelo.
     
+    Usa la instantánea de permisos en caché en lugar de ``user.has_perm``
+    para no consultar las tablas de grupos y permisos en cada request.
+    
     Args:
         user: Usuario a verificar
         model: Nombre del modelo
@@ -134,5 +194,4 @@ def check_model_permission(user: User, model: str, action: str) -> bool:
     if not user.is_authenticated:
         return False
         
-    permission = f'blog.{action}_{model}'
-    return user.has_perm(permission) 
\ No newline at end of file
+    return has_blog_permission(user, f'{action}_{model}') 
\ No newline at end of file
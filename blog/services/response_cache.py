@@ -0,0 +1,201 @@
+"""
+Caché de respuestas para los endpoints de lectura del blog.
+
+Cada respuesta se guarda bajo una clave formada por:
+
+- el path de la solicitud y su query string normalizada (parámetros y
+  valores ordenados)
+- los rasgos del usuario que afectan al resultado: anónimo,
+  superusuario o un resumen de su instantánea de permisos ``blog.*``
+- la versión de cada modelo del que depende el endpoint
+
+Las versiones (por modelo y por objeto) se actualizan con
+``post_save``/``post_delete`` (y ``m2m_changed``) de los modelos
+registrados en ``BlogConfig.ready``, de modo que una escritura invalida
+todas las respuestas que la incluyen sin tener que buscarlas. Las mismas
+versiones alimentan los ETag y ``Last-Modified`` de ``ConditionalGetMixin``.
+"""
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from typing import Iterable
+from urllib.parse import urlencode
+import hashlib
+import json
+import logging
+import time
+
+from blog.services.permissions_cache import get_permission_snapshot
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = 'blog:respcache'
+
+
+def _get_cache():
+    """Obtiene el backend de caché configurado para las respuestas."""
+    return caches[getattr(settings, 'RESPONSE_CACHE_ALIAS', 'default')]
+
+
+def get_default_timeout() -> int:
+    """Tiempo de vida (segundos) por defecto de una respuesta en caché."""
+    return getattr(settings, 'RESPONSE_CACHE_TIMEOUT', 60)
+
+
+def _version_key(scope: str) -> str:
+    return f'{KEY_PREFIX}:version:{scope}'
+
+
+def model_label(model) -> str:
+    """Etiqueta ``app_label.model_name`` usada en las claves de versión."""
+    return model._meta.label_lower
+
+
+def object_scope(label: str, pk) -> str:
+    """Ámbito de versión de un objeto concreto (``app_label.model_name:pk``)."""
+    return f'{label}:{pk}'
+
+
+def _now_version() -> int:
+    return time.time_ns() // 1000
+
+
+def get_model_versions(scopes: Iterable[str]) -> list:
+    """
+    Obtiene las versiones actuales de varios modelos u objetos en una sola
+    lectura.
+
+    Una versión es el instante (microsegundos desde epoch) del último cambio
+    conocido, por lo que también sirve como ``Last-Modified``. Las versiones
+    que no existen (caché vacía o expulsada) se inicializan con el instante
+    actual: nunca reutilizan un valor previo y, como fecha, solo pueden
+    quedar por delante del cambio real.
+
+    Args:
+        scopes: Etiquetas ``app_label.model_name`` u ``object_scope``
+
+    Returns:
+        list con una versión por ámbito, en el mismo orden
+    """
+    cache = _get_cache()
+    keys = [_version_key(scope) for scope in scopes]
+    found = cache.get_many(keys)
+    versions = []
+    for key in keys:
+        version = found.get(key)
+        if version is None:
+            version = _now_version()
+            cache.add(key, version, None)
+            version = cache.get(key, version)
+        versions.append(version)
+    return versions
+
+
+def bump_model_versions(scopes: Iterable[str]) -> None:
+    """Marca como modificados modelos u objetos, invalidando sus respuestas."""
+    cache = _get_cache()
+    keys = [_version_key(scope) for scope in scopes]
+    current = cache.get_many(keys)
+    now = _now_version()
+    cache.set_many({
+        key: max(now, current.get(key, 0) + 1) for key in keys
+    }, None)
+
+
+def user_traits(user) -> str:
+    """
+    Resume los rasgos del usuario que pueden cambiar la respuesta.
+
+    Dos usuarios con los mismos permisos ``blog.*`` comparten entrada.
+
+    Args:
+        user: Usuario de la solicitud (puede ser anónimo)
+
+    Returns:
+        str corto para la clave de caché
+    """
+    if user is None or not user.is_authenticated:
+        return 'anon'
+    if user.is_superuser:
+        return 'su'
+    snapshot = ','.join(sorted(get_permission_snapshot(user)))
+    digest = hashlib.md5(snapshot.encode('utf-8'), usedforsecurity=False).hexdigest()
+    return f"{'staff' if user.is_staff else 'user'}:{digest[:12]}"
+
+
+def normalize_query(query_dict) -> str:
+    """Query string con parámetros y valores ordenados."""
+    items = sorted((key, sorted(values)) for key, values in query_dict.lists())
+    return urlencode(items, doseq=True)
+
+
+def build_cache_key(request, labels: Iterable[str]) -> str:
+    """
+    Construye la clave de caché de una solicitud.
+
+    Args:
+        request: Request de DRF
+        labels: Modelos de los que depende la respuesta
+
+    Returns:
+        str con la clave
+    """
+    versions = get_model_versions(labels)
+    raw = '|'.join([
+        request.path,
+        normalize_query(request.query_params),
+        request.accepted_media_type or '',
+        user_traits(getattr(request, 'user', None)),
+        ':'.join(str(version) for version in versions),
+    ])
+    digest = hashlib.md5(raw.encode('utf-8'), usedforsecurity=False).hexdigest()
+    return f'{KEY_PREFIX}:{digest}'
+
+
+def compute_etag(data) -> str:
+    """ETag (sin comillas) de unos datos serializables."""
+    payload = json.dumps(data, sort_keys=True, default=str)
+    return hashlib.md5(payload.encode('utf-8'), usedforsecurity=False).hexdigest()
+
+
+def get_cached(key: str):
+    """
+    Obtiene una respuesta guardada.
+
+    Returns:
+        tuple (data, etag) o None si no existe
+    """
+    return _get_cache().get(key)
+
+
+def set_cached(key: str, data, etag: str, timeout: int) -> None:
+    """Guarda los datos de una respuesta junto con su ETag."""
+    _get_cache().set(key, (data, etag), timeout)
+
+
+# ---------------------------------------------------------------------------
+# Receptores de señales (conectados en BlogConfig.ready)
+# ---------------------------------------------------------------------------
+
+def on_model_changed(sender, **kwargs):
+    """
+    post_save/post_delete/m2m_changed: invalida las respuestas del modelo y
+    las del objeto modificado.
+    """
+    action = kwargs.get('action')
+    if action is not None and action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+
+    instance = kwargs['instance']
+    if action is None:
+        label = model_label(sender)
+        scopes = [label, object_scope(label, instance.pk)]
+    else:
+        # m2m_changed: el sender es la tabla intermedia; cambian ambos lados
+        label = model_label(instance.__class__)
+        related_label = model_label(kwargs['model'])
+        scopes = [label, object_scope(label, instance.pk), related_label]
+        scopes += [object_scope(related_label, pk) for pk in kwargs.get('pk_set') or ()]
+
+    transaction.on_commit(lambda: bump_model_versions(scopes))
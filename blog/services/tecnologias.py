@@ -0,0 +1,115 @@
+"""
+Índice de tecnologías mencionadas en las descripciones de los proyectos.
+
+Las tecnologías se extraen con una única expresión regular precompilada
+(una alternación de todas las conocidas) y se guardan en
+``ProyectoTecnologia``; así ``tecnologias_populares`` es una agregación
+``GROUP BY`` en la base de datos en lugar de recorrer todos los proyectos
+con una regex por tecnología.
+"""
+
+from django.db import transaction
+from typing import Iterable
+import logging
+import re
+
+from blog.Models.ProyectoTecnologiaModel import ProyectoTecnologia
+
+logger = logging.getLogger(__name__)
+
+TECNOLOGIAS = (
+    'python', 'django', 'javascript', 'react', 'vue', 'angular',
+    'nodejs', 'java', 'spring', 'docker', 'kubernetes', 'aws',
+    'postgresql', 'mysql', 'mongodb', 'redis', 'git'
+)
+
+TECNOLOGIAS_RE = re.compile(
+    r'\b(?:' + '|'.join(re.escape(tech) for tech in TECNOLOGIAS) + r')\b',
+    re.IGNORECASE
+)
+
+
+def extract_tecnologias(texto: str) -> set:
+    """
+    Extrae las tecnologías conocidas mencionadas en un texto.
+
+    Args:
+        texto: Descripción del proyecto
+
+    Returns:
+        set con los nombres en minúsculas
+    """
+    if not texto:
+        return set()
+    return {match.lower() for match in TECNOLOGIAS_RE.findall(texto)}
+
+
+def sync_tecnologias(proyecto) -> set:
+    """
+    Actualiza el índice de tecnologías de un proyecto.
+
+    Solo borra e inserta las etiquetas que cambiaron.
+
+    Args:
+        proyecto: Instancia de Proyectos ya guardada
+
+    Returns:
+        set con las tecnologías actuales del proyecto
+    """
+    nuevas = extract_tecnologias(proyecto.description_proyecto)
+    actuales = set(
+        ProyectoTecnologia.objects
+        .filter(proyecto_id=proyecto.pk)
+        .values_list('tecnologia', flat=True)
+    )
+
+    with transaction.atomic():
+        if actuales - nuevas:
+            ProyectoTecnologia.objects.filter(
+                proyecto_id=proyecto.pk,
+                tecnologia__in=actuales - nuevas
+            ).delete()
+        if nuevas - actuales:
+            ProyectoTecnologia.objects.bulk_create(
+                [ProyectoTecnologia(proyecto_id=proyecto.pk, tecnologia=tech)
+                 for tech in sorted(nuevas - actuales)],
+                ignore_conflicts=True
+            )
+    return nuevas
+
+
+def rebuild_tecnologias(proyectos: Iterable) -> int:
+    """
+    Reconstruye el índice de un lote de proyectos.
+
+    Args:
+        proyectos: Proyectos con ``description_proyecto`` cargado
+
+    Returns:
+        int con el número de etiquetas insertadas
+    """
+    proyectos = list(proyectos)
+    etiquetas = [
+        ProyectoTecnologia(proyecto_id=proyecto.pk, tecnologia=tech)
+        for proyecto in proyectos
+        for tech in sorted(extract_tecnologias(proyecto.description_proyecto))
+    ]
+    with transaction.atomic():
+        ProyectoTecnologia.objects.filter(
+            proyecto_id__in=[proyecto.pk for proyecto in proyectos]
+        ).delete()
+        ProyectoTecnologia.objects.bulk_create(etiquetas)
+    return len(etiquetas)
+
+
+# ---------------------------------------------------------------------------
+# Receptores de señales (conectados en BlogConfig.ready)
+# ---------------------------------------------------------------------------
+
+def on_proyecto_saved(sender, instance, raw=False, update_fields=None, **kwargs):
+    """post_save de Proyectos: mantiene el índice de tecnologías."""
+    if raw:
+        return
+    if update_fields is not None and 'description_proyecto' not in update_fields:
+        return
+    sync_tecnologias(instance)
@@ -55,6 +55,101 @@ def eliminar_ofertas_expiradas():
         }
 
 
+@shared_task
+def refrescar_resumen_ofertas():
+    """
+    Tarea programada para recalcular el resumen de ofertas por empresa.
+    
+    El resumen se mantiene de forma incremental; esta tarea corrige las
+    diferencias de escrituras que no emiten señales y acota su antigüedad
+    (``OFERTAS_RESUMEN_MAX_STALENESS``).
+    
+    Returns:
+        dict: Resultado de la operación con el número de empresas
+    """
+    from blog.services.ofertas_estadisticas import refresh_resumen_empresas
+    
+    try:
+        empresas = refresh_resumen_empresas()
+        return {
+            'status': 'success',
+            'empresas': empresas,
+            'mensaje': f'Resumen recalculado para {empresas} empresas'
+        }
+        
+    except Exception as e:
+        logger.error(f"Error al recalcular el resumen de ofertas: {str(e)}")
+        return {
+            'status': 'error',
+            'mensaje': f'Error: {str(e)}'
+        }
+
+
+@shared_task
+def mantener_particiones_auditoria():
+    """
+    Tarea programada para mantener las particiones de ``blog_auditlog``.
+    
+    Crea por adelantado las particiones de los próximos
+    ``AUDIT_PARTITION_MONTHS_AHEAD`` meses y elimina las que superan
+    ``AUDIT_RETENTION_MONTHS``.
+    
+    Returns:
+        dict: Resultado de la operación con las particiones creadas y eliminadas
+    """
+    from blog.services.audit_partitions import maintain_partitions
+    
+    try:
+        resultado = maintain_partitions()
+        logger.info(
+            f"Particiones de auditoría: {len(resultado['creadas'])} creadas, "
+            f"{len(resultado['eliminadas'])} eliminadas"
+        )
+        return {
+            'status': 'success',
+            **resultado
+        }
+        
+    except Exception as e:
+        logger.error(f"Error al mantener las particiones de auditoría: {str(e)}")
+        return {
+            'status': 'error',
+            'mensaje': f'Error: {str(e)}'
+        }
+
+
+@shared_task
+def procesar_outbox_auditoria():
+    """
+    Tarea programada para mover a ``AuditLog`` los cambios pendientes del
+    outbox de auditoría (modo ``write_behind``).
+    
+    Recupera los registros que dejaron pendientes los procesos que se
+    detuvieron antes de relevarlos, y es el único relevo cuando
+    ``AUDIT_WRITE_BEHIND_THREAD`` está desactivado.
+    
+    Returns:
+        dict: Resultado de la operación con el número de logs insertados
+    """
+    from blog.services.audit_write_behind import relay_outbox
+    
+    try:
+        insertados = relay_outbox()
+        if insertados:
+            logger.info(f"Insertados {insertados} logs de auditoría desde el outbox")
+        return {
+            'status': 'success',
+            'insertados': insertados
+        }
+        
+    except Exception as e:
+        logger.error(f"Error al procesar el outbox de auditoría: {str(e)}")
+        return {
+            'status': 'error',
+            'mensaje': f'Error: {str(e)}'
+        }
+
+
 @shared_task
 def generar_reporte_estadisticas():
     """
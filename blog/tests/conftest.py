@@ -0,0 +1,30 @@
+"""
+Fixtures compartidas por las pruebas de la app blog.
+"""
+
+import pytest
+from django.contrib.auth.models import User
+
+from blog.Models.OfertasEmpleoModel import OfertasEmpleo
+
+
+@pytest.fixture
+def creador(db):
+    """Usuario sin permisos especiales que figura como creador."""
+    return User.objects.create_user(username='creador', password='12345')
+
+
+@pytest.fixture
+def crear_oferta(creador):
+    """Fábrica de ofertas de empleo de ``creador``; los campos se pueden sobrescribir."""
+    def crear(empresa='ACME', **datos):
+        return OfertasEmpleo.objects.create(**{
+            'titulo_empleo': 'Desarrollador',
+            'empresa': empresa,
+            'descripcion_empleo': 'Descripción de prueba',
+            'imagen': 'ofertas/test.jpg',
+            'link_oferta': 'https://empresa.com/oferta',
+            'creador': creador,
+            **datos,
+        })
+    return crear
@@ -0,0 +1,94 @@
+"""
+Auditoría en modo ``write_behind``: señales → ``AuditOutbox`` → ``AuditLog``.
+
+Los receptores se conectan a ``OfertasEmpleo`` en el fixture porque
+``BlogConfig.ready`` solo los conecta con ``AUDIT_MODE = 'write_behind'``.
+"""
+
+import hashlib
+import re
+
+import pytest
+from django.db import transaction
+from django.db.models.signals import post_delete, post_init, post_save
+
+from blog.Models.AuditLogModel import AuditLog
+from blog.Models.AuditOutboxModel import AuditOutbox
+from blog.Models.OfertasEmpleoModel import OfertasEmpleo
+from blog.services import audit_write_behind
+
+RECEPTORES = [
+    (post_init, audit_write_behind.on_audited_init),
+    (post_save, audit_write_behind.on_audited_saved),
+    (post_delete, audit_write_behind.on_audited_deleted),
+]
+
+
+@pytest.fixture
+def write_behind(settings):
+    settings.AUDIT_WRITE_BEHIND_THREAD = False
+    settings.AUDIT_PAYLOAD_TRUNCATE_TEXT_LENGTH = 0
+    for signal, receptor in RECEPTORES:
+        signal.connect(receptor, sender=OfertasEmpleo)
+    yield
+    for signal, receptor in RECEPTORES:
+        signal.disconnect(receptor, sender=OfertasEmpleo)
+
+
+def outbox():
+    return list(AuditOutbox.objects.order_by('id').values_list('change_type', 'modified_data'))
+
+
+@pytest.mark.django_db(transaction=True)
+def test_outbox_registra_cambios_y_se_releva(write_behind, creador, crear_oferta):
+    """Alta, cambio (solo columnas modificadas), guardado sin cambios y baja."""
+    oferta = crear_oferta()
+    [(tipo, datos)] = outbox()
+    assert tipo == 'CREATE'
+    assert datos['empresa'] == 'ACME'
+    assert 'idoferta' not in datos and 'creador_id' not in datos
+
+    oferta = OfertasEmpleo.objects.get(pk=oferta.pk)
+    oferta.empresa = 'Globex'
+    oferta.save()
+    oferta.save()
+    assert outbox()[1:] == [('UPDATE', {'old_empresa': 'ACME', 'new_empresa': 'Globex'})]
+
+    pk = oferta.pk
+    oferta.delete()
+    assert [tipo for tipo, _ in outbox()] == ['CREATE', 'UPDATE', 'DELETE']
+
+    # Un cambio revertido no deja registro en el outbox
+    with pytest.raises(RuntimeError), transaction.atomic():
+        crear_oferta()
+        raise RuntimeError
+    assert len(outbox()) == 3
+
+    # Con AUDIT_MODE = 'trigger' en PostgreSQL los triggers también escriben
+    AuditLog.objects.all().delete()
+    assert audit_write_behind.relay_outbox() == 3
+    assert not AuditOutbox.objects.exists()
+    logs = AuditLog.objects.order_by('id')
+    assert [log.change_type for log in logs] == ['CREATE', 'UPDATE', 'DELETE']
+    assert {(log.table_name, log.affected_record_id, log.user_id) for log in logs} == {
+        ('blog_ofertasempleo', pk, creador.pk)
+    }
+
+
+@pytest.mark.django_db
+def test_payload_con_formato_de_los_triggers(write_behind, settings, crear_oferta):
+    """Textos largos recortados como blog_audit_compact y fechas como to_jsonb."""
+    settings.AUDIT_PAYLOAD_TRUNCATE_TEXT_LENGTH = 40
+    descripcion = 'x' * 50
+    crear_oferta(descripcion_empleo=descripcion)
+
+    [(_, datos)] = outbox()
+    assert datos['descripcion_empleo'] == {
+        'longitud': 50,
+        'md5': hashlib.md5(descripcion.encode()).hexdigest(),
+        'inicio': 'x' * 40,
+    }
+    assert datos['empresa'] == 'ACME'
+    assert re.fullmatch(
+        r'\d{4}-\d\d-\d\dT\d\d:\d\d:\d\d(\.\d*[1-9])?\+00:00', datos['fecha_publicacion']
+    )
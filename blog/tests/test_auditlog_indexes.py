@@ -0,0 +1,140 @@
+"""
+Verifica con EXPLAIN que los endpoints de auditoría usan los índices de
+``AuditLog`` pensados para sus consultas.
+
+Cada caso llama a un endpoint, captura sus consultas sobre
+``blog_auditlog`` con condiciones (``WHERE``) y revisa su plan con
+``enable_seqscan = off`` (con tan pocas filas el planificador siempre
+preferiría leer la tabla completa). Los índices de las particiones se
+traducen al índice de la tabla particionada que los generó.
+
+Solo aplica en PostgreSQL.
+"""
+
+import json
+from datetime import timedelta
+
+import pytest
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from blog.Models.AuditLogModel import AuditLog
+
+pytestmark = [
+    pytest.mark.django_db,
+    pytest.mark.skipif(connection.vendor != 'postgresql', reason='Requiere PostgreSQL'),
+]
+
+TABLE = 'blog_auditlog'
+RANGO_FECHAS = {'blog_auditlog_ts_brin', 'blog_auditlog_ts_id_idx'}
+
+# (url, parámetros, índices aceptados para sus consultas)
+CASOS = [
+    ('audit-logs-simple', {'table': 'blog_noticias', 'type': 'UPDATE'},
+     {'blog_auditlog_tbl_type_ts_idx'}),
+    ('auditlog-list', {'tabla': 'blog_noticias', 'tipo': 'UPDATE'},
+     {'blog_auditlog_tbl_type_ts_idx'}),
+    ('auditlog-list', {'usuario': 'editor'},
+     {'blog_auditlog_user_ts_idx'}),
+    ('auditlog-list', {'datos': json.dumps({'new_empresa': 'ACME'})},
+     {'blog_auditlog_data_gin'}),
+    ('auditlog-resumen-actividad', {}, RANGO_FECHAS),
+    ('audit-verify', {}, RANGO_FECHAS),
+]
+
+
+def crear_logs(usuario, cantidad=300):
+    """Crea logs repartidos en tablas, tipos y en los últimos 30 días."""
+    ahora = timezone.now()
+    tablas = ['blog_noticias', 'blog_cursos', 'blog_proyectos', 'blog_ofertasempleo']
+    tipos = ['CREATE', 'UPDATE', 'DELETE']
+    AuditLog.objects.bulk_create([
+        AuditLog(
+            timestamp=ahora - timedelta(hours=i * 2),
+            user=usuario if i % 5 == 0 else None,
+            table_name=tablas[i % len(tablas)],
+            change_type=tipos[i % len(tipos)],
+            affected_record_id=i,
+            modified_data={'new_empresa': 'ACME' if i % 50 == 0 else f'Empresa {i}'},
+        )
+        for i in range(cantidad)
+    ])
+    with connection.cursor() as cursor:
+        cursor.execute(f'ANALYZE {TABLE}')
+
+
+def explain(sql):
+    """Plan de una consulta en formato JSON."""
+    with connection.cursor() as cursor:
+        cursor.execute('SET LOCAL enable_seqscan = off')
+        cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}')
+        plan = cursor.fetchone()[0]
+    return json.loads(plan) if isinstance(plan, str) else plan
+
+
+def parent_index(name):
+    """Índice de la tabla particionada del que proviene un índice de partición."""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT parent.relname
+            FROM pg_class child
+            JOIN pg_inherits ON pg_inherits.inhrelid = child.oid
+            JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+            WHERE child.relname = %s
+            """,
+            [name]
+        )
+        row = cursor.fetchone()
+    return row[0] if row else name
+
+
+def scans(plan):
+    """
+    Recorre un plan y retorna los índices de auditoría usados y las
+    tablas de auditoría leídas completas.
+    """
+    indices, seq_scans = set(), set()
+    pendientes = [plan[0]['Plan']]
+    while pendientes:
+        nodo = pendientes.pop()
+        pendientes.extend(nodo.get('Plans', []))
+        if 'Index Name' in nodo:
+            indice = parent_index(nodo['Index Name'])
+            if indice.startswith(TABLE):
+                indices.add(indice)
+        elif nodo['Node Type'] == 'Seq Scan' and nodo['Relation Name'].startswith(TABLE):
+            seq_scans.add(nodo['Relation Name'])
+    return indices, seq_scans
+
+
+@pytest.fixture
+def staff_client(client):
+    usuario = User.objects.create_superuser(username='editor', password='12345')
+    crear_logs(usuario)
+    caches['default'].clear()
+    client.force_login(usuario)
+    return client
+
+
+@pytest.mark.parametrize('url_name,params,esperados', CASOS)
+def test_auditlog_endpoint_usa_indices(staff_client, url_name, params, esperados):
+    """Las consultas filtradas del endpoint usan alguno de los índices esperados."""
+    with CaptureQueriesContext(connection) as ctx:
+        response = staff_client.get(reverse(url_name), params)
+    assert response.status_code == 200
+
+    consultas = [
+        q['sql'] for q in ctx.captured_queries
+        if f'FROM "{TABLE}"' in q['sql'] and ' WHERE ' in q['sql']
+    ]
+    assert consultas, 'El endpoint no consultó blog_auditlog con filtros'
+
+    for sql in consultas:
+        indices, seq_scans = scans(explain(sql))
+        assert not seq_scans, f'Lectura completa de {seq_scans} en: {sql}'
+        assert indices & esperados, f'Índices {indices or "ninguno"} en lugar de {esperados} en: {sql}'
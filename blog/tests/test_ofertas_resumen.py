@@ -0,0 +1,73 @@
+import time
+
+import pytest
+from django.core.cache import caches
+
+from blog.Models.EmpresaOfertasResumenModel import EmpresaOfertasResumen
+from blog.Models.OfertasEmpleoModel import OfertasEmpleo
+from blog.services import ofertas_estadisticas
+from blog.services.ofertas_estadisticas import apply_delta
+
+
+def resumen():
+    return dict(EmpresaOfertasResumen.objects.values_list('empresa', 'total_ofertas'))
+
+
+@pytest.mark.django_db
+def test_apply_delta_crea_suma_y_elimina():
+    """Las filas se crean al sumar y se eliminan al llegar a cero."""
+    apply_delta('ACME', 2)
+    apply_delta('ACME', 1)
+    assert resumen() == {'ACME': 3}
+
+    apply_delta('ACME', -1)
+    assert resumen() == {'ACME': 2}
+
+    apply_delta('ACME', -2)
+    apply_delta('Otra', -1)
+    assert resumen() == {}
+
+
+def test_resumen_sigue_las_ofertas(crear_oferta):
+    """Altas, cambios de empresa y bajas actualizan el resumen."""
+    oferta = crear_oferta('ACME')
+    crear_oferta('ACME')
+    assert resumen() == {'ACME': 2}
+
+    # Instancia recién cargada: post_init recuerda la empresa original
+    oferta = OfertasEmpleo.objects.get(pk=oferta.pk)
+    oferta.empresa = 'Globex'
+    oferta.save()
+    assert resumen() == {'ACME': 1, 'Globex': 1}
+
+    # Guardar sin cambiar la empresa no altera los totales
+    oferta.titulo_empleo = 'Desarrollador senior'
+    oferta.save()
+    assert resumen() == {'ACME': 1, 'Globex': 1}
+
+    oferta.delete()
+    assert resumen() == {'ACME': 1}
+
+
+def test_resumen_vencido_encola_un_solo_recalculo(creador, monkeypatch):
+    """La consulta no recalcula el resumen: encola la tarea una sola vez."""
+    from blog import tasks
+
+    encoladas = []
+    monkeypatch.setattr(
+        tasks.refrescar_resumen_ofertas, 'apply_async', lambda **kwargs: encoladas.append(1)
+    )
+    cache = caches['default']
+    cache.delete(ofertas_estadisticas.REFRESH_LOCK_KEY)
+
+    vencido = time.time() - ofertas_estadisticas.get_max_staleness() - 1
+    cache.set(ofertas_estadisticas.REFRESHED_KEY, vencido, None)
+
+    assert ofertas_estadisticas.request_refresh_if_stale() == vencido
+    assert ofertas_estadisticas.request_refresh_if_stale() == vencido
+    assert encoladas == [1]
+
+    cache.set(ofertas_estadisticas.REFRESHED_KEY, time.time(), None)
+    cache.delete(ofertas_estadisticas.REFRESH_LOCK_KEY)
+    ofertas_estadisticas.request_refresh_if_stale()
+    assert encoladas == [1]
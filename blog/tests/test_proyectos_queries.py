@@ -0,0 +1,101 @@
+import pytest
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from blog.Models.IntegrantesModel import Integrantes
+from blog.Models.ProyectosModel import Proyectos
+
+
+def crear_proyectos(creador, cantidad, inicio=0):
+    """
+    Crea proyectos, cada uno con un integrante activo.
+
+    Se ejecutan los callbacks ``on_commit`` para que la caché de respuestas
+    del listado se invalide igual que en producción.
+    """
+    with TestCase.captureOnCommitCallbacks(execute=True):
+        _crear_proyectos(creador, cantidad, inicio)
+
+
+def _crear_proyectos(creador, cantidad, inicio):
+    for i in range(inicio, inicio + cantidad):
+        integrante = Integrantes.objects.create(
+            nombre_integrante=f'Integrante {i}',
+            semestre='5',
+            correo=f'integrante{i}@test.com',
+            link_git=f'https://github.com/integrante{i}',
+            imagen='integrantes/test.jpg',
+            creador=creador,
+            reseña='Reseña de prueba del integrante',
+        )
+        proyecto = Proyectos.objects.create(
+            nombre_proyecto=f'Proyecto {i}',
+            fecha_proyecto=timezone.now(),
+            link_proyecto='https://github.com/test/proyecto',
+            description_proyecto='Descripción de prueba con python y django',
+            creador=creador,
+        )
+        proyecto.integrantes.add(integrante)
+
+
+def contar_queries_listado(client):
+    """Ejecuta el listado de proyectos y retorna (respuesta, número de queries)."""
+    with CaptureQueriesContext(connection) as ctx:
+        response = client.get(reverse('proyectos-list'))
+    return response, len(ctx.captured_queries)
+
+
+@pytest.mark.django_db
+def test_proyectos_list_queries_constantes(client):
+    """El número de queries del listado no depende del número de filas."""
+    creador = User.objects.create_user(username='creador', password='12345')
+
+    crear_proyectos(creador, 2)
+    response, queries_pocas_filas = contar_queries_listado(client)
+    assert response.status_code == 200
+    assert len(response.data['results']) == 2
+
+    crear_proyectos(creador, 10, inicio=2)
+    response, queries_muchas_filas = contar_queries_listado(client)
+    assert response.status_code == 200
+    assert len(response.data['results']) == 12
+
+    assert queries_muchas_filas == queries_pocas_filas
+
+
+@pytest.mark.django_db
+def test_proyectos_list_consume_precarga(client):
+    """Los campos calculados salen de la anotación y del Prefetch."""
+    creador = User.objects.create_user(username='creador', password='12345')
+    crear_proyectos(creador, 3)
+
+    response, _ = contar_queries_listado(client)
+    proyecto = response.data['results'][0]
+
+    assert proyecto['creador_username'] == 'creador'
+    assert proyecto['total_integrantes'] == 1
+    assert len(proyecto['integrantes_info']) == 1
+
+
+@pytest.mark.django_db
+def test_proyectos_patch_responde_integrantes_actualizados(client):
+    """La respuesta de un PATCH refleja los integrantes recién asignados."""
+    creador = User.objects.create_superuser(username='creador', password='12345')
+    crear_proyectos(creador, 2)
+    proyecto, otro = Proyectos.objects.order_by('pk')
+    integrante = otro.integrantes.get()
+    proyecto.integrantes.clear()
+
+    client.force_login(creador)
+    response = client.patch(
+        reverse('proyectos-detail', args=[proyecto.pk]),
+        {'integrantes': [integrante.pk]},
+        content_type='application/json',
+    )
+    assert response.status_code == 200
+    assert response.data['total_integrantes'] == 1
+    assert [i['id'] for i in response.data['integrantes_info']] == [integrante.pk]
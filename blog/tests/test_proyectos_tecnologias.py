@@ -0,0 +1,71 @@
+import pytest
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from blog.Models.ProyectosModel import Proyectos
+from blog.Models.ProyectoTecnologiaModel import ProyectoTecnologia
+from blog.services.tecnologias import extract_tecnologias
+
+
+def crear_proyecto(creador, nombre, descripcion):
+    """Crea un proyecto ejecutando los callbacks ``on_commit``."""
+    with TestCase.captureOnCommitCallbacks(execute=True):
+        return Proyectos.objects.create(
+            nombre_proyecto=nombre,
+            fecha_proyecto=timezone.now(),
+            link_proyecto='https://github.com/test/proyecto',
+            description_proyecto=descripcion,
+            creador=creador,
+        )
+
+
+def tecnologias_de(proyecto):
+    return set(
+        ProyectoTecnologia.objects
+        .filter(proyecto=proyecto)
+        .values_list('tecnologia', flat=True)
+    )
+
+
+def test_extract_tecnologias_palabras_completas():
+    """Solo se reconocen palabras completas, sin distinguir mayúsculas."""
+    texto = 'API en JavaScript y Java, alojada en GitHub con Git'
+    assert extract_tecnologias(texto) == {'javascript', 'java', 'git'}
+
+
+@pytest.mark.django_db
+def test_indice_se_mantiene_al_guardar(client):
+    """El índice sigue a la descripción y alimenta tecnologias_populares."""
+    creador = User.objects.create_user(username='creador', password='12345')
+    proyecto = crear_proyecto(creador, 'Proyecto A', 'Backend en Python, Django y Docker')
+    crear_proyecto(creador, 'Proyecto B', 'Frontend en React consumiendo una API en python')
+
+    assert tecnologias_de(proyecto) == {'python', 'django', 'docker'}
+
+    response = client.get(reverse('proyectos-tecnologias-populares'))
+    assert response.status_code == 200
+    assert response.data[0] == {'tecnologia': 'python', 'proyectos': 2}
+
+    with TestCase.captureOnCommitCallbacks(execute=True):
+        proyecto.description_proyecto = 'Caché con Redis'
+        proyecto.save()
+    assert tecnologias_de(proyecto) == {'redis'}
+
+    response = client.get(reverse('proyectos-list'), {'tecnologia': 'Redis'})
+    assert [p['nombre_proyecto'] for p in response.data['results']] == ['Proyecto A']
+
+
+@pytest.mark.django_db
+def test_indexar_tecnologias_reconstruye_filas_existentes():
+    """El comando llena el índice de proyectos guardados sin él."""
+    creador = User.objects.create_user(username='creador', password='12345')
+    for i in range(3):
+        crear_proyecto(creador, f'Proyecto {i}', 'Servicio en python con postgresql')
+    ProyectoTecnologia.objects.all().delete()
+
+    call_command('indexar_tecnologias', '--lote', '2')
+
+    assert ProyectoTecnologia.objects.count() == 6
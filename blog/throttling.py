@@ -0,0 +1,140 @@
+"""
+Clases de throttling (rate limiting) para las APIs del blog.
+
+Las clases de DRF guardan sus contadores en la caché ``default``; estas
+usan el alias configurado en ``THROTTLE_CACHE_ALIAS`` para que los límites
+se compartan entre todos los workers y no se mezclen con otras cachés.
+
+Además reemplazan el historial de timestamps de ``SimpleRateThrottle``
+(una lista de hasta ``num_requests`` elementos que se lee y reescribe en
+cada solicitud) por un contador de ventana deslizante de dos buckets:
+cada solicitud hace un ``incr`` atómico sobre el bucket actual y una
+lectura del anterior, con un costo constante sin importar la tasa.
+
+Si la caché de los contadores no está disponible la solicitud se permite
+(fail open): una caída de Redis no debe rechazar todo el tráfico.
+"""
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework import throttling
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class SharedCacheThrottleMixin:
+    """Mixin que resuelve la caché de los contadores de throttling."""
+
+    @property
+    def cache(self):
+        return caches[getattr(settings, 'THROTTLE_CACHE_ALIAS', 'default')]
+
+
+class SlidingWindowThrottleMixin:
+    """
+    Throttling por contador de ventana deslizante (dos buckets fijos).
+
+    El tiempo se divide en ventanas de ``duration`` segundos con un
+    contador por ventana. La tasa estimada en el instante ``t`` es::
+
+        anterior * (1 - transcurrido / duration) + actual
+
+    es decir, se asume que las solicitudes de la ventana anterior se
+    repartieron de forma uniforme. El incremento es atómico (``incr`` de
+    Redis); si la solicitud se rechaza, el incremento se revierte para que
+    los rechazos no cuenten contra el cliente.
+    """
+
+    def get_bucket_keys(self, now):
+        """Claves de los buckets actual y anterior, y fracción transcurrida."""
+        window = int(now // self.duration)
+        elapsed = (now - window * self.duration) / self.duration
+        return f'{self.key}:{window}', f'{self.key}:{window - 1}', elapsed
+
+    def allow_request(self, request, view):
+        """
+        Indica si la solicitud está dentro del límite.
+
+        Args:
+            request: Request actual
+            view: Vista que atiende la solicitud
+
+        Returns:
+            bool: True si se permite la solicitud
+        """
+        if self.rate is None:
+            return True
+
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        self.now = self.timer()
+        current_key, previous_key, elapsed = self.get_bucket_keys(self.now)
+
+        try:
+            current, previous = self.count_request(current_key, previous_key)
+        except Exception as e:
+            logger.warning(f"Throttling sin caché, se permite la solicitud: {str(e)}")
+            return True
+
+        self.current_count = current
+        self.previous_count = previous
+        self.elapsed = elapsed
+
+        if previous * (1 - elapsed) + current > self.num_requests:
+            try:
+                self.cache.decr(current_key)
+            except Exception as e:
+                logger.warning(f"No se pudo revertir el contador de throttling: {str(e)}")
+            self.current_count -= 1
+            return self.throttle_failure()
+        return self.throttle_success()
+
+    def count_request(self, current_key, previous_key):
+        """
+        Cuenta la solicitud en el bucket actual.
+
+        Returns:
+            tuple: (total del bucket actual, total del bucket anterior)
+        """
+        try:
+            current = self.cache.incr(current_key)
+        except ValueError:
+            # Primer uso del bucket; otro worker pudo crearlo a la vez
+            if self.cache.add(current_key, 1, self.duration * 2):
+                current = 1
+            else:
+                current = self.cache.incr(current_key)
+        return current, self.cache.get(previous_key, 0)
+
+    def throttle_success(self):
+        return True
+
+    def wait(self):
+        """
+        Segundos hasta que la tasa estimada vuelva a estar bajo el límite.
+
+        Returns:
+            float | None: Tiempo de espera sugerido (header ``Retry-After``)
+        """
+        # Solicitudes que caben en la ventana actual contando la próxima
+        remaining = self.num_requests - self.current_count - 1
+        if remaining < 0 or not self.previous_count:
+            # Hay que esperar a la siguiente ventana
+            return self.duration * (1 - self.elapsed)
+
+        # El peso de la ventana anterior decrece linealmente con el tiempo
+        target = 1 - remaining / self.previous_count
+        return max(0.0, (target - self.elapsed) * self.duration)
+
+
+class AnonRateThrottle(SharedCacheThrottleMixin, SlidingWindowThrottleMixin,
+                       throttling.AnonRateThrottle):
+    """Límite para usuarios anónimos (scope ``anon``) por IP."""
+
+
+class UserRateThrottle(SharedCacheThrottleMixin, SlidingWindowThrottleMixin,
+                       throttling.UserRateThrottle):
+    """Límite para usuarios autenticados (scope ``user``)."""
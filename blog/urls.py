@@ -12,6 +12,7 @@ from blog.Views.OfertasEmpleoView import OfertasEmpleoViewSet
 from blog.Views.ProyectosView import ProyectosViewSet
 from blog.Views.AuthView import user_profile, update_profile, check_auth_status
 from blog.Views.AuditVerificationView import audit_verification_status, audit_logs_simple, test_audit_trigger
+from blog.Views.MetricsView import api_metrics
 from blog.Views.PermissionsView import (
     get_my_permissions,
     check_permission,
@@ -58,6 +59,9 @@ urlpatterns = [
     path('permissions/available/', get_available_permissions, name='available-permissions'),
     path('permissions/group/<str:group_name>/', get_group_perms, name='group-permissions'),
     
+    # Métricas (formato Prometheus)
+    path('metrics/', api_metrics, name='api-metrics'),
+    
     # URLs de documentación
     path('swagger<format>/', schema_view.without_ui(cache_timeout=0), name='schema-json'),
     path('swagger/', schema_view.with_ui('swagger', cache_timeout=0), name='schema-swagger-ui'),
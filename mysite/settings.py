@@ -13,6 +13,8 @@ import os
 from pathlib import Path
 from dotenv import load_dotenv
 from urllib.parse import urlparse
+import tempfile
+from django.core.exceptions import ImproperlyConfigured
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -97,6 +99,7 @@ MIDDLEWARE = [
     'whitenoise.middleware.WhiteNoiseMiddleware',  # Añadir whitenoise aquí
     'blog.middleware.SecurityHeadersMiddleware',  # Headers de seguridad personalizados
     'blog.middleware.RequestLoggingMiddleware',  # Logging de solicitudes
+    'blog.middleware.QueryCountMiddleware',  # Conteo de queries y detección de N+1
     'blog.middleware.APIUsageMiddleware',  # Monitoreo de uso de API
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -146,8 +149,8 @@ REST_FRAMEWORK = {
         'rest_framework.filters.OrderingFilter',
     ],
     'DEFAULT_THROTTLE_CLASSES': [
-        'rest_framework.throttling.AnonRateThrottle',
-        'rest_framework.throttling.UserRateThrottle'
+        'blog.throttling.AnonRateThrottle',
+        'blog.throttling.UserRateThrottle'
     ],
     'DEFAULT_THROTTLE_RATES': {
         'anon': '100/hour',
@@ -155,11 +158,97 @@ REST_FRAMEWORK = {
     }
 }
 
+# Inspección de queries por solicitud (headers X-DB-*, detección de N+1 y
+# presupuestos por vista). Activo por defecto solo en desarrollo.
+QUERY_INSPECTOR_ENABLED = os.getenv('QUERY_INSPECTOR_ENABLED', str(DEBUG)).lower() == 'true'
+QUERY_N_PLUS_ONE_THRESHOLD = int(os.getenv('QUERY_N_PLUS_ONE_THRESHOLD', '5'))
+# En modo estricto (pruebas) exceder el presupuesto lanza una excepción
+QUERY_BUDGET_STRICT = os.getenv('QUERY_BUDGET_STRICT', 'False').lower() == 'true'
+
+# Conteo de resultados en la paginación (blog.pagination)
+PAGINATION_COUNT_CACHE_TIMEOUT = int(os.getenv('PAGINATION_COUNT_CACHE_TIMEOUT', '60'))
+PAGINATION_COUNT_ESTIMATE_THRESHOLD = int(os.getenv('PAGINATION_COUNT_ESTIMATE_THRESHOLD', '10000'))
+
+# Registro de uso de la API (buffer en memoria escrito por lotes)
+API_USAGE_BUFFER_SIZE = int(os.getenv('API_USAGE_BUFFER_SIZE', '10000'))
+API_USAGE_BATCH_SIZE = int(os.getenv('API_USAGE_BATCH_SIZE', '200'))
+API_USAGE_FLUSH_INTERVAL = float(os.getenv('API_USAGE_FLUSH_INTERVAL', '1.0'))
+
+# Métricas agregadas (/api/metrics/). Con Redis se comparten entre workers
+API_METRICS_REDIS_URL = os.getenv('API_METRICS_REDIS_URL', os.getenv('REDIS_URL', ''))
+API_METRICS_FLUSH_INTERVAL = float(os.getenv('API_METRICS_FLUSH_INTERVAL', '5.0'))
+# Token Bearer para el scraper de Prometheus (sin token: solo staff)
+API_METRICS_TOKEN = os.getenv('API_METRICS_TOKEN', '')
+
+# Registro de solicitudes (RequestLoggingMiddleware): full, sampled u off
+REQUEST_LOG_MODE = os.getenv('REQUEST_LOG_MODE', 'full' if DEBUG else 'sampled')
+# Fracción de solicitudes registradas por clase de estado en modo sampled
+REQUEST_LOG_SAMPLE_RATES = {
+    '1xx': float(os.getenv('REQUEST_LOG_SAMPLE_1XX', '0.01')),
+    '2xx': float(os.getenv('REQUEST_LOG_SAMPLE_2XX', '0.01')),
+    '3xx': float(os.getenv('REQUEST_LOG_SAMPLE_3XX', '0.01')),
+    '4xx': float(os.getenv('REQUEST_LOG_SAMPLE_4XX', '1.0')),
+    '5xx': float(os.getenv('REQUEST_LOG_SAMPLE_5XX', '1.0')),
+}
+
+# Antigüedad máxima (segundos) del resumen de ofertas por empresa usado en
+# /ofertas/estadisticas/; la tarea que lo recalcula corre cada mitad de este
+# valor y, si se supera, la consulta encola un recálculo
+OFERTAS_RESUMEN_MAX_STALENESS = int(os.getenv('OFERTAS_RESUMEN_MAX_STALENESS', '300'))
+
+# Particiones mensuales de blog_auditlog (blog.services.audit_partitions):
+# meses creados por adelantado y meses conservados (0 = sin límite)
+AUDIT_PARTITION_MONTHS_AHEAD = int(os.getenv('AUDIT_PARTITION_MONTHS_AHEAD', '3'))
+AUDIT_RETENTION_MONTHS = int(os.getenv('AUDIT_RETENTION_MONTHS', '12'))
+
+# Modo de auditoría: trigger (triggers de PostgreSQL en la transacción) o
+# write_behind (señales + outbox + inserción por lotes en segundo plano,
+# ver blog.services.audit_write_behind). Al cambiarlo ejecutar
+# python manage.py audit_triggers --aplicar-modo
+AUDIT_MODE = os.getenv('AUDIT_MODE', 'trigger')
+if AUDIT_MODE not in ('trigger', 'write_behind'):
+    raise ImproperlyConfigured("AUDIT_MODE debe ser 'trigger' o 'write_behind'")
+AUDIT_WRITE_BEHIND_BATCH_SIZE = int(os.getenv('AUDIT_WRITE_BEHIND_BATCH_SIZE', '500'))
+AUDIT_WRITE_BEHIND_FLUSH_INTERVAL = float(os.getenv('AUDIT_WRITE_BEHIND_FLUSH_INTERVAL', '2.0'))
+# Sin hilo de relevo (serverless) el outbox lo procesa solo Celery
+AUDIT_WRITE_BEHIND_THREAD = os.getenv(
+    'AUDIT_WRITE_BEHIND_THREAD', str(not IS_VERCEL)
+).lower() == 'true'
+
+# Payloads de los triggers de auditoría (blog.services.audit_triggers);
+# se aplican al instalar los triggers (manage.py audit_triggers --instalar).
+# Compresión TOAST de modified_data (sin pérdida): pglz, lz4 o vacío.
+# Recorte con pérdida: los textos más largos que el límite se guardan solo
+# como longitud + md5 + prefijo y el resto se descarta (0 = sin recorte)
+AUDIT_PAYLOAD_TRUNCATE_TEXT_LENGTH = int(os.getenv('AUDIT_PAYLOAD_TRUNCATE_TEXT_LENGTH', '0'))
+AUDIT_PAYLOAD_COMPRESSION = os.getenv('AUDIT_PAYLOAD_COMPRESSION', '')
+
+# Segundos que se guarda en caché /auditlog/resumen_actividad/
+AUDIT_SUMMARY_CACHE_TIMEOUT = int(os.getenv('AUDIT_SUMMARY_CACHE_TIMEOUT', '30'))
+
+# Caché de respuestas de los endpoints de lectura (ResponseCacheMixin)
+RESPONSE_CACHE_TIMEOUT = int(os.getenv('RESPONSE_CACHE_TIMEOUT', '60'))
+
 # Database
 # https://docs.djangoproject.com/en/5.1/ref/settings/#databases
 
 tmpPostgres = urlparse(os.getenv("DATABASE_URL"))
 
+# Gestión de conexiones
+# - Conexiones persistentes: cada worker reutiliza su conexión durante
+#   DB_CONN_MAX_AGE segundos en lugar de abrir una nueva (TCP + TLS +
+#   autenticación) por solicitud. CONN_HEALTH_CHECKS descarta las conexiones
+#   caídas antes de usarlas.
+# - Pool de psycopg 3 (opcional, DB_POOL_ENABLED=True): requiere instalar
+#   psycopg[binary,pool] y es incompatible con CONN_MAX_AGE. El tamaño se
+#   reparte el presupuesto DB_MAX_CONNECTIONS entre los workers de gunicorn.
+GUNICORN_WORKERS = int(os.getenv('WEB_CONCURRENCY', '2'))
+GUNICORN_THREADS = int(os.getenv('GUNICORN_THREADS', '1'))
+DB_MAX_CONNECTIONS = int(os.getenv('DB_MAX_CONNECTIONS', '20'))
+DB_CONN_MAX_AGE = int(os.getenv('DB_CONN_MAX_AGE', '0' if IS_VERCEL else '60'))
+DB_CONN_HEALTH_CHECKS = os.getenv('DB_CONN_HEALTH_CHECKS', 'True').lower() == 'true'
+DB_POOL_ENABLED = os.getenv('DB_POOL_ENABLED', 'False').lower() == 'true'
+
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.postgresql',
@@ -167,10 +256,40 @@ DATABASES = {
         'USER': tmpPostgres.username,
         'PASSWORD': tmpPostgres.password,
         'HOST': tmpPostgres.hostname,
-        'PORT': 5432,
+        'PORT': tmpPostgres.port or 5432,
+        'CONN_MAX_AGE': DB_CONN_MAX_AGE,
+        'CONN_HEALTH_CHECKS': DB_CONN_HEALTH_CHECKS,
+        'OPTIONS': {
+            'connect_timeout': int(os.getenv('DB_CONNECT_TIMEOUT', '5')),
+        },
     }
 }
 
+if DB_POOL_ENABLED:
+    try:
+        from psycopg_pool import ConnectionPool
+    except ImportError:
+        import warnings
+        warnings.warn(
+            'DB_POOL_ENABLED=True requiere psycopg[binary,pool]; '
+            'se usan conexiones persistentes sin pool'
+        )
+    else:
+        # Conexiones por worker: una por hilo, sin superar su parte del presupuesto
+        db_pool_cap = max(1, DB_MAX_CONNECTIONS // max(1, GUNICORN_WORKERS))
+        DB_POOL_MAX_SIZE = int(os.getenv('DB_POOL_MAX_SIZE', str(min(GUNICORN_THREADS, db_pool_cap))))
+        DB_POOL_MIN_SIZE = min(int(os.getenv('DB_POOL_MIN_SIZE', '1')), DB_POOL_MAX_SIZE)
+        
+        DATABASES['default']['CONN_MAX_AGE'] = 0
+        DATABASES['default']['OPTIONS']['pool'] = {
+            'min_size': DB_POOL_MIN_SIZE,
+            'max_size': DB_POOL_MAX_SIZE,
+            'timeout': float(os.getenv('DB_POOL_TIMEOUT', '10')),
+            'max_idle': float(os.getenv('DB_POOL_MAX_IDLE', '300')),
+            # Verificar cada conexión al sacarla del pool
+            'check': ConnectionPool.check_connection,
+        }
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
@@ -291,8 +410,9 @@ elif IS_RAILWAY or IS_RENDER:
         CELERY_TASK_EAGER_PROPAGATES = True
 else:
     # Desarrollo local con Redis local
-    CELERY_BROKER_URL = os.getenv('REDIS_URL', 'redis://localhost:6379/0')
-    CELERY_RESULT_BACKEND = os.getenv('REDIS_URL', 'redis://localhost:6379/0')
+    redis_url = os.getenv('REDIS_URL')
+    CELERY_BROKER_URL = redis_url or 'redis://localhost:6379/0'
+    CELERY_RESULT_BACKEND = redis_url or 'redis://localhost:6379/0'
 
 # Configuración de Celery Beat (solo en desarrollo local)
 if not IS_VERCEL and not IS_RAILWAY and not IS_RENDER:
@@ -302,6 +422,17 @@ if not IS_VERCEL and not IS_RAILWAY and not IS_RENDER:
             'task': 'blog.tasks.eliminar_ofertas_expiradas',
             'schedule': 86400.0,  # Ejecutar cada 24 horas
         },
+        # Recalcular el resumen de ofertas por empresa (a la mitad de la
+        # antigüedad máxima para que el retraso de beat no la supere)
+        'refrescar_resumen_ofertas': {
+            'task': 'blog.tasks.refrescar_resumen_ofertas',
+            'schedule': OFERTAS_RESUMEN_MAX_STALENESS / 2,
+        },
+        # Crear particiones futuras de auditoría y eliminar las expiradas
+        'mantener_particiones_auditoria': {
+            'task': 'blog.tasks.mantener_particiones_auditoria',
+            'schedule': 86400.0,  # Ejecutar cada 24 horas
+        },
         # Generar reporte de estadísticas cada semana
         'generar_reporte_estadisticas': {
             'task': 'blog.tasks.generar_reporte_estadisticas',
@@ -322,8 +453,95 @@ else:
             'task': 'blog.tasks.eliminar_ofertas_expiradas',
             'schedule': 86400.0,  # Ejecutar cada 24 horas
         },
+        # Recalcular el resumen de ofertas por empresa (a la mitad de la
+        # antigüedad máxima para que el retraso de beat no la supere)
+        'refrescar_resumen_ofertas': {
+            'task': 'blog.tasks.refrescar_resumen_ofertas',
+            'schedule': OFERTAS_RESUMEN_MAX_STALENESS / 2,
+        },
+        # Crear particiones futuras de auditoría y eliminar las expiradas
+        'mantener_particiones_auditoria': {
+            'task': 'blog.tasks.mantener_particiones_auditoria',
+            'schedule': 86400.0,  # Ejecutar cada 24 horas
+        },
+    }
+
+if AUDIT_MODE == 'write_behind':
+    # Relevo periódico del outbox de auditoría (recupera procesos caídos)
+    CELERY_BEAT_SCHEDULE['procesar_outbox_auditoria'] = {
+        'task': 'blog.tasks.procesar_outbox_auditoria',
+        'schedule': 60.0,  # Ejecutar cada minuto
+    }
+
+# Configuración de caché
+# Con Redis (CACHE_LOCATION o la URL de Redis calculada arriba) todas las
+# cachés se comparten entre los workers de gunicorn. Sin Redis se usa
+# FileBasedCache en producción (compartida entre los workers de una misma
+# máquina) y LocMemCache en desarrollo. Cada alias usa su propio prefijo:
+# - default: caché general (permisos, conteos de paginación)
+# - throttle: contadores de rate limiting
+# - responses: respuestas de los endpoints de lectura y sus versiones
+# - sessions: sesiones (cached_db), solo con Redis
+# Con Redis se usa FailOpenRedisCache: si Redis cae, las lecturas son
+# fallos de caché y las escrituras se descartan en lugar de fallar
+CACHE_REDIS_URL = os.getenv('CACHE_LOCATION') or redis_url
+CACHE_KEY_PREFIX = os.getenv(
+    'CACHE_KEY_PREFIX',
+    'hack3r:' + (os.getenv('RAILWAY_ENVIRONMENT') or os.getenv('VERCEL_ENV') or
+                 ('render' if IS_RENDER else 'local'))
+)
+CACHE_FALLBACK = os.getenv('CACHE_FALLBACK', 'file' if IS_PRODUCTION else 'locmem')
+CACHE_FILE_DIR = os.getenv(
+    'CACHE_FILE_DIR', os.path.join(tempfile.gettempdir(), 'hack3r-cache')
+)
+
+
+def build_cache(alias, timeout=300):
+    """Configuración de un alias de caché con el backend disponible."""
+    if CACHE_REDIS_URL:
+        return {
+            'BACKEND': 'blog.cache_backends.FailOpenRedisCache',
+            'LOCATION': CACHE_REDIS_URL,
+            'KEY_PREFIX': f'{CACHE_KEY_PREFIX}:{alias}',
+            'TIMEOUT': timeout,
+            'OPTIONS': {
+                'socket_connect_timeout': 2,
+                'socket_timeout': 1,
+                'health_check_interval': 30,
+            },
+        }
+    if CACHE_FALLBACK == 'file':
+        return {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': os.path.join(CACHE_FILE_DIR, alias),
+            'KEY_PREFIX': CACHE_KEY_PREFIX,
+            'TIMEOUT': timeout,
+        }
+    return {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': alias,
+        'KEY_PREFIX': CACHE_KEY_PREFIX,
+        'TIMEOUT': timeout,
     }
 
+
+CACHES = {
+    'default': build_cache('default'),
+    'throttle': build_cache('throttle', timeout=86400),
+    'responses': build_cache('responses', timeout=RESPONSE_CACHE_TIMEOUT),
+}
+
+PERMISSIONS_CACHE_ALIAS = 'default'
+PAGINATION_COUNT_CACHE_ALIAS = 'default'
+RESPONSE_CACHE_ALIAS = 'responses'
+THROTTLE_CACHE_ALIAS = 'throttle'
+
+if CACHE_REDIS_URL:
+    # Sesiones en Redis con respaldo en la base de datos
+    CACHES['sessions'] = build_cache('sessions')
+    SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
+    SESSION_CACHE_ALIAS = 'sessions'
+
 # Cloud storage settings
 DEFAULT_FILE_STORAGE = 'cloudinary_storage.storage.MediaCloudinaryStorage'
 
@@ -352,6 +570,9 @@ if IS_PRODUCTION:
                 'format': '{"level": "%(levelname)s", "time": "%(asctime)s", "module": "%(module)s", "message": "%(message)s"}',
                 'style': '%',
             },
+            'api_usage': {
+                '()': 'blog.services.api_usage_log.ApiUsageFormatter',
+            },
         },        'handlers': {
             'null': {
                 'class': 'logging.NullHandler',
@@ -366,6 +587,11 @@ if IS_PRODUCTION:
                 'class': 'logging.StreamHandler',
                 'formatter': 'json',
             },
+            'api_usage_console': {
+                'level': 'INFO',
+                'class': 'logging.StreamHandler',
+                'formatter': 'api_usage',
+            },
         },
         'root': {
             'handlers': ['console'],
@@ -382,7 +608,7 @@ if IS_PRODUCTION:
                 'propagate': False,
             },
             'api_usage': {
-                'handlers': ['console_json'],
+                'handlers': ['api_usage_console'],
                 'level': 'INFO',
                 'propagate': False,
             },
@@ -415,6 +641,9 @@ else:
                 'format': '{"level": "%(levelname)s", "time": "%(asctime)s", "module": "%(module)s", "message": "%(message)s"}',
                 'style': '%',
             },
+            'api_usage': {
+                '()': 'blog.services.api_usage_log.ApiUsageFormatter',
+            },
         },        'handlers': {
             'null': {
                 'class': 'logging.NullHandler',
@@ -433,7 +662,7 @@ else:
                 'filename': os.path.join(BASE_DIR, 'logs', 'api_usage.log'),
                 'maxBytes': 1024*1024*5,  # 5 MB
                 'backupCount': 3,
-                'formatter': 'json',
+                'formatter': 'api_usage',
             },
             'error_file': {
                 'level': 'ERROR',
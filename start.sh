@@ -23,4 +23,4 @@ python manage.py collectstatic --noinput
 
 # Iniciar Gunicorn
 echo "🌐 Iniciando servidor Gunicorn..."
-exec gunicorn mysite.wsgi --bind 0.0.0.0:$PORT --workers 2 --timeout 60 --max-requests 1000
+exec gunicorn mysite.wsgi --bind 0.0.0.0:$PORT --workers ${WEB_CONCURRENCY:-2} --threads ${GUNICORN_THREADS:-1} --timeout 60 --max-requests 1000
@@ -1,3 +1,11 @@
+"""
+OBSOLETO: los triggers de auditoría se generan a partir de los modelos
+(blog.services.audit_triggers) y se instalan con la migración
+0011_install_audit_triggers o con ``python manage.py audit_triggers
+--instalar``, que además elimina los triggers por fila creados por este
+script. Ejecutarlo ahora duplicaría los logs de auditoría.
+"""
+
 import os
 import django
 